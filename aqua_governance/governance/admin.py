@@ -1,8 +1,14 @@
+import json
+import time
+
 from django import forms
-from django.contrib import admin
+from django.conf import settings
+from django.contrib import admin, messages
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.db import transaction
 from django.db.models import Count
+from django.http import HttpResponse
+from django.utils import timezone
 
 from aqua_governance.governance.asset_tokens import (
     derive_asset_contract_address,
@@ -10,7 +16,17 @@ from aqua_governance.governance.asset_tokens import (
     upsert_asset_token_from_proposal,
 )
 from aqua_governance.governance.forms import ProposalAdminForm
-from aqua_governance.governance.models import AssetToken, LogVote, Proposal
+from aqua_governance.governance.models import (
+    AssetToken,
+    IndexingRun,
+    LogVote,
+    Proposal,
+    ProposalIndexingState,
+    VoteUpdateSweep,
+)
+from aqua_governance.governance.parser import make_vote_key_digest
+from aqua_governance.governance.task_logic.vote_diff import diff_proposal_votes_snapshot
+from aqua_governance.utils.horizon import get_horizon_server
 
 
 @admin.register(Proposal)
@@ -53,6 +69,7 @@ class ProposalAdmin(admin.ModelAdmin):
     ]
     list_filter = ('proposal_type', 'proposal_status', 'payment_status', 'draft', 'hide', 'action', 'start_at', 'end_at')
     form = ProposalAdminForm
+    actions = ['dry_run_vote_reindex']
 
     class Media:
         css = {
@@ -142,8 +159,36 @@ class ProposalAdmin(admin.ModelAdmin):
         actions = super().get_actions(request)
         if not request.user.is_superuser:
             actions.pop('delete_selected', None)
+            actions.pop('dry_run_vote_reindex', None)
         return actions
 
+    def dry_run_vote_reindex(self, request, queryset):
+        # Each diff crawls Horizon inside the request: stop starting new ones past the deadline.
+        horizon_server = get_horizon_server()
+        deadline = time.monotonic() + settings.VOTE_DIFF_ADMIN_DEADLINE_SECONDS
+        diffs = []
+        skipped_ids = []
+        for proposal in queryset.order_by('id'):
+            if diffs and time.monotonic() >= deadline:
+                skipped_ids.append(proposal.id)
+                continue
+            diffs.append(diff_proposal_votes_snapshot(proposal, horizon_server, limit=settings.VOTE_DIFF_ADMIN_LIMIT))
+        for diff in diffs:
+            self.message_user(request, f'Proposal {diff["proposal_id"]}: {diff["summary"]}', messages.INFO)
+        if skipped_ids:
+            self.message_user(
+                request,
+                f'Time limit reached, proposals {skipped_ids} were not diffed. '
+                f'Select fewer proposals or run "manage.py diff_proposal_votes".',
+                messages.WARNING,
+            )
+
+        response = HttpResponse(json.dumps(diffs, indent=2), content_type='application/json')
+        response['Content-Disposition'] = 'attachment; filename="vote-reindex-dry-run.json"'
+        return response
+
+    dry_run_vote_reindex.short_description = 'Dry-run vote re-index (download diff)'
+
     def save_model(self, request, obj, form, change):
         if not request.user.is_superuser and not obj.is_asset_proposal:
             raise PermissionDenied('Managers can manage only asset proposals.')
@@ -187,6 +232,7 @@ class LogVoteAdmin(admin.ModelAdmin):
         'vote_choice',
         'created_at',
         'key',
+        'key_digest',
         'group_index',
         'amount',
         'original_amount',
@@ -198,7 +244,7 @@ class LogVoteAdmin(admin.ModelAdmin):
         '=id',
         'claimable_balance_id',
         'account_issuer',
-        'key',
+        '=key_digest',
         '=proposal__id',
         'proposal__vote_for_issuer',
         'proposal__vote_against_issuer',
@@ -209,6 +255,110 @@ class LogVoteAdmin(admin.ModelAdmin):
     ordering = ('-created_at',)
     list_select_related = ('proposal',)
 
+    def get_search_results(self, request, queryset, search_term):
+        # A pasted vote key is looked up through its indexed digest.
+        search_term = search_term.strip()
+        if '|' in search_term:
+            return queryset.filter(key_digest=make_vote_key_digest(search_term)), False
+        return super().get_search_results(request, queryset, search_term)
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(IndexingRun)
+class IndexingRunAdmin(admin.ModelAdmin):
+    list_display = [
+        'id',
+        'proposal',
+        'started_at',
+        'status',
+        'freezing_amount',
+        'total_seconds',
+        'horizon_request_count',
+        'created_count',
+        'updated_count',
+        'unchanged_count',
+        'stale_count',
+    ]
+    readonly_fields = [
+        'id',
+        'proposal',
+        'started_at',
+        'finished_at',
+        'status',
+        'error',
+        'freezing_amount',
+        'total_seconds',
+        'fetch_seconds',
+        'trace_seconds',
+        'metadata_seconds',
+        'reconcile_seconds',
+        'apply_seconds',
+        'horizon_request_count',
+        'horizon_requests',
+        'cache_stats',
+        'group_counts',
+        'created_count',
+        'updated_count',
+        'unchanged_count',
+        'stale_count',
+    ]
+    fields = readonly_fields
+    search_fields = ['=proposal__id']
+    list_filter = ('status', 'freezing_amount', 'started_at')
+    ordering = ('-started_at',)
+    list_select_related = ('proposal',)
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ProposalIndexingState)
+class ProposalIndexingStateAdmin(admin.ModelAdmin):
+    list_display = ['proposal', 'last_indexed_at', 'last_changed_at', 'unclaimed_count', 'next_index_at']
+    readonly_fields = list_display
+    fields = readonly_fields
+    search_fields = ['=proposal__id']
+    ordering = ('-last_changed_at',)
+    list_select_related = ('proposal',)
+    actions = ['schedule_reindex']
+
+    def schedule_reindex(self, request, queryset):
+        updated = queryset.update(next_index_at=timezone.now())
+        self.message_user(request, f'{updated} proposals will be re-indexed by the next sweep.', messages.INFO)
+
+    schedule_reindex.short_description = 'Re-index on the next scheduled sweep'
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(VoteUpdateSweep)
+class VoteUpdateSweepAdmin(admin.ModelAdmin):
+    list_display = [
+        'id',
+        'started_at',
+        'finished_at',
+        'lane_count',
+        'pending_count',
+        'succeeded_count',
+        'failed_count',
+        'coalesced_count',
+    ]
+    readonly_fields = [*list_display, 'proposal_ids', 'summary']
+    fields = readonly_fields
+    ordering = ('-started_at',)
+
     def has_change_permission(self, request, obj=None):
         return False
 
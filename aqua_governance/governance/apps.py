@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class MainConfig(AppConfig):
     name = 'aqua_governance.governance'
+
+    def ready(self):
+        from aqua_governance.governance import checks  # noqa: F401
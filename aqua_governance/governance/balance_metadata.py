@@ -0,0 +1,88 @@
+import logging
+import sys
+from typing import Union
+
+from dateutil.parser import parse as date_parse
+from django.conf import settings
+from stellar_sdk.exceptions import NotFoundError
+
+from aqua_governance.governance.models import ClaimableBalanceMetadata
+from aqua_governance.utils.concurrency import map_in_threads
+
+
+logger = logging.getLogger()
+
+# Horizon does not know the balance at all.
+BALANCE_NOT_FOUND = 'not_found'
+# Horizon answered without a create_claimable_balance operation, or the request failed.
+METADATA_UNAVAILABLE = 'unavailable'
+
+CreationMetadata = Union[tuple[str, str], str]
+
+
+def load_creation_metadata(
+    horizon_server,
+    balance_ids: list[str],
+    metadata_cache: dict[str, CreationMetadata],
+) -> dict[str, int]:
+    """
+    Fill *metadata_cache* with ``(created_at, original_amount)`` for every uncached balance id.
+
+    Creation metadata never changes, so resolved values are persisted in
+    ``ClaimableBalanceMetadata`` and Horizon is asked only for balances seen
+    for the first time, ``CREATION_METADATA_WORKERS`` at a time.  Ids Horizon
+    cannot answer for are cached as ``BALANCE_NOT_FOUND`` or
+    ``METADATA_UNAVAILABLE`` for this run only.
+
+    Returns how many ids were found stored (``hits``) and fetched (``misses``).
+    """
+    pending_balance_ids = list(
+        dict.fromkeys(balance_id for balance_id in balance_ids if balance_id and balance_id not in metadata_cache),
+    )
+    if not pending_balance_ids:
+        return {'hits': 0, 'misses': 0}
+
+    for stored in ClaimableBalanceMetadata.objects.filter(balance_id__in=pending_balance_ids):
+        metadata_cache[stored.balance_id] = (str(stored.created_at), str(stored.original_amount))
+
+    missing_balance_ids = [balance_id for balance_id in pending_balance_ids if balance_id not in metadata_cache]
+    fetched = map_in_threads(
+        lambda balance_id: _fetch_creation_metadata(horizon_server, balance_id),
+        missing_balance_ids,
+        settings.CREATION_METADATA_WORKERS,
+    )
+    metadata_cache.update(zip(missing_balance_ids, fetched))
+
+    ClaimableBalanceMetadata.objects.bulk_create(
+        [
+            ClaimableBalanceMetadata(
+                balance_id=balance_id,
+                created_at=metadata[0],
+                original_amount=metadata[1],
+            )
+            for balance_id, metadata in zip(missing_balance_ids, fetched)
+            if isinstance(metadata, tuple)
+        ],
+        ignore_conflicts=True,
+    )
+    return {'hits': len(pending_balance_ids) - len(missing_balance_ids), 'misses': len(missing_balance_ids)}
+
+
+def _fetch_creation_metadata(horizon_server, balance_id: str) -> CreationMetadata:
+    try:
+        ops = horizon_server.operations().for_claimable_balance(balance_id).order(desc=False).limit(50).call()
+    except NotFoundError:
+        return BALANCE_NOT_FOUND
+    except Exception:
+        logger.warning(
+            "Error loading create_claimable_balance metadata for balance %s",
+            balance_id,
+            exc_info=sys.exc_info(),
+        )
+        return METADATA_UNAVAILABLE
+
+    metadata = METADATA_UNAVAILABLE
+    for record in ops["_embedded"]["records"]:
+        if record['type'] == 'create_claimable_balance':
+            metadata = (str(date_parse(record["created_at"])), str(record["amount"]))
+    return metadata
@@ -0,0 +1,8 @@
+from aqua_governance.governance.benchmarks import balance_records, claimant_fetch, unlock_validation, vote_indexing
+
+BENCHMARKS = {
+    'balance_records': balance_records.run,
+    'claimant_fetch': claimant_fetch.run,
+    'unlock_validation': unlock_validation.run,
+    'vote_indexing': vote_indexing.run,
+}
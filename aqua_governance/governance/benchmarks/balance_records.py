@@ -0,0 +1,138 @@
+import gc
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Optional
+
+from aqua_governance.governance.benchmarks.synthetic import (
+    DEFAULT_UNLOCK_TIMESTAMP,
+    make_raw_claimable_balances,
+    make_voter_account,
+)
+from aqua_governance.governance.models import LogVote, Proposal
+from aqua_governance.governance.parser import generate_vote_key, generate_vote_key_by_raw_data
+from aqua_governance.governance.task_logic.balance_records import (
+    ClaimableBalanceRecord,
+    decode_claimable_balance,
+    is_self_sponsored_claimable_balance,
+)
+from aqua_governance.governance.task_logic.unlock_rules import (
+    UNLOCK_TIMESTAMP_TOLERANCE_SECONDS,
+    has_valid_unlock_date,
+    parse_unlock_timestamp,
+)
+
+
+def run(count: int = 100_000) -> dict[str, Any]:
+    """
+    Compare raw Horizon records with decoded ``ClaimableBalanceRecord`` s: retained size, wall and CPU time.
+
+    The timed work is the per-run downstream pass (unlock validation, vote
+    key, sponsorship check), done once straight on the raw dicts and once as
+    one decoding pass followed by the same checks on the records.  Both paths
+    use the same unlock timestamp parser and memo, so the difference comes from
+    the representation alone.
+    """
+    issuer = make_voter_account(0)
+    payload = json.dumps({'_embedded': {'records': make_raw_claimable_balances(count, issuer)}})
+
+    gc.collect()
+    tracemalloc.start()
+    raw_records = json.loads(payload)['_embedded']['records']
+    raw_bytes = tracemalloc.get_traced_memory()[0]
+    records = [decode_claimable_balance(raw_record) for raw_record in raw_records]
+    del raw_records
+    gc.collect()
+    record_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+
+    # Timings are taken untraced, tracemalloc slows allocation-heavy code down a lot.
+    proposal = Proposal(id=0)
+    raw_records = json.loads(payload)['_embedded']['records']
+    raw_dict_seconds, raw_dict_cpu_seconds = _timed(_raw_dict_pass, raw_records, proposal, {})
+
+    abs_before_memo: dict[str, Optional[int]] = {}
+    (decode_seconds, decode_cpu_seconds), records = _timed_result(
+        lambda: [decode_claimable_balance(raw_record, abs_before_memo) for raw_record in raw_records],
+    )
+    del raw_records
+    record_pass_seconds, record_pass_cpu_seconds = _timed(_record_pass, records, proposal)
+
+    record_seconds = decode_seconds + record_pass_seconds
+    return {
+        'benchmark': 'balance_records',
+        'count': count,
+        'raw_bytes': raw_bytes,
+        'record_bytes': record_bytes,
+        'memory_ratio': round(record_bytes / raw_bytes, 3) if raw_bytes else None,
+        'raw_dict_seconds': round(raw_dict_seconds, 4),
+        'raw_dict_cpu_seconds': round(raw_dict_cpu_seconds, 4),
+        'decode_seconds': round(decode_seconds, 4),
+        'record_pass_seconds': round(record_pass_seconds, 4),
+        'record_seconds': round(record_seconds, 4),
+        'record_cpu_seconds': round(decode_cpu_seconds + record_pass_cpu_seconds, 4),
+        'time_ratio': round(record_seconds / raw_dict_seconds, 3) if raw_dict_seconds else None,
+        'balances_per_second': round(count / record_seconds) if record_seconds else None,
+        'raw_dict_balances_per_second': round(count / raw_dict_seconds) if raw_dict_seconds else None,
+    }
+
+
+def _record_pass(records: list[ClaimableBalanceRecord], proposal: Proposal) -> None:
+    for record in records:
+        if has_valid_unlock_date(record, DEFAULT_UNLOCK_TIMESTAMP) and record.self_sponsored:
+            generate_vote_key(record, proposal, LogVote.VOTE_FOR)
+
+
+def _raw_dict_pass(
+    raw_records: list[dict[str, Any]],
+    proposal: Proposal,
+    abs_before_memo: dict[str, Optional[int]],
+) -> None:
+    """The checks of ``_record_pass``, each walking the raw claimants again, as before records were decoded."""
+    for raw_record in raw_records:
+        if (
+            _raw_has_valid_unlock_date(raw_record, abs_before_memo)
+            and is_self_sponsored_claimable_balance(raw_record)
+        ):
+            _raw_vote_key(raw_record, proposal, LogVote.VOTE_FOR)
+
+
+def _raw_has_valid_unlock_date(raw_record: dict[str, Any], abs_before_memo: dict[str, Optional[int]]) -> bool:
+    unlock_timestamps = [
+        parse_unlock_timestamp(claimant['predicate']['not'], abs_before_memo)
+        for claimant in raw_record.get('claimants', [])
+        if claimant.get('predicate', {}).get('not', {}).get('abs_before') is not None
+    ]
+    return bool(unlock_timestamps) and all(
+        unlock_timestamp is not None
+        and abs(unlock_timestamp - DEFAULT_UNLOCK_TIMESTAMP) <= UNLOCK_TIMESTAMP_TOLERANCE_SECONDS
+        for unlock_timestamp in unlock_timestamps
+    )
+
+
+def _raw_vote_key(raw_record: dict[str, Any], proposal: Proposal, vote_choice: str) -> str:
+    account_issuer = raw_record['sponsor']
+    time_list = []
+    for claimant in raw_record['claimants']:
+        abs_before = claimant.get('predicate', {}).get('not', {}).get('abs_before')
+        destination = claimant.get('destination')
+        if abs_before is not None and destination is not None:
+            account_issuer = destination
+            time_list.append(abs_before)
+    return generate_vote_key_by_raw_data(
+        proposal.id, vote_choice, account_issuer, raw_record['asset'].split(':')[0], time_list,
+    )
+
+
+def _timed(function: Callable[..., Any], *args: Any) -> tuple[float, float]:
+    return _timed_result(lambda: function(*args))[0]
+
+
+def _timed_result(function: Callable[[], Any]) -> tuple[tuple[float, float], Any]:
+    """Return ``((wall_seconds, cpu_seconds), result)`` of calling *function*."""
+    gc.collect()
+    started_at = time.perf_counter()
+    cpu_started_at = time.process_time()
+    result = function()
+    return (time.perf_counter() - started_at, time.process_time() - cpu_started_at), result
@@ -0,0 +1,60 @@
+import time
+from functools import partial
+from typing import Any
+
+from django.conf import settings
+
+from aqua_governance.governance.benchmarks.stub_horizon import StubHorizonServer
+from aqua_governance.governance.benchmarks.synthetic import make_raw_claimable_balances, make_voter_account
+from aqua_governance.governance.task_logic.vote_checkpoints import _fetch_claimant_records
+from aqua_governance.governance.task_logic.vote_indexing import _make_claimant_request_builder
+from aqua_governance.utils.concurrency import map_in_threads
+
+
+# One claimant per vote choice, like a proposal with an abstain option.
+CLAIMANTS = tuple(make_voter_account(2 ** 32 + index) for index in range(1, 4))
+LATENCY_SECONDS = 0.02
+
+
+def run(count: int = 100_000, latency_seconds: float = LATENCY_SECONDS) -> dict[str, Any]:
+    """
+    Wall time of the full claimable balance crawl of every claimant, one claimant at a time and concurrently.
+
+    *count* balances are spread over the claimants of a stub Horizon that
+    answers every page request after *latency_seconds*.  The concurrent run
+    uses ``VOTE_INGESTION_FETCH_WORKERS`` workers.
+    """
+    horizon = StubHorizonServer(latency_seconds=latency_seconds)
+    for index, claimant in enumerate(CLAIMANTS):
+        claimant_count = count // len(CLAIMANTS) + (index < count % len(CLAIMANTS))
+        for claimable_balance in make_raw_claimable_balances(claimant_count, claimant):
+            horizon.add_claimable_balance(claimant, claimable_balance)
+    fetch_requests = [(partial(_make_claimant_request_builder, horizon, claimant), None) for claimant in CLAIMANTS]
+
+    workers = max(settings.VOTE_INGESTION_FETCH_WORKERS, 1)
+    seconds_by_workers = {}
+    fetched_by_workers = {}
+    for worker_count in dict.fromkeys((1, workers)):
+        first_call = len(horizon.calls)
+        started_at = time.perf_counter()
+        fetched = map_in_threads(_fetch_claimant_records, fetch_requests, worker_count)
+        seconds_by_workers[worker_count] = round(time.perf_counter() - started_at, 4)
+        fetched_by_workers[worker_count] = {
+            'balances': sum(len(balances) for balances, _ in fetched),
+            'horizon_requests': len(horizon.calls) - first_call,
+        }
+
+    sequential_seconds = seconds_by_workers[1]
+    concurrent_seconds = seconds_by_workers[workers]
+    return {
+        'benchmark': 'claimant_fetch',
+        'count': count,
+        'claimants': len(CLAIMANTS),
+        'latency_seconds': latency_seconds,
+        'workers': workers,
+        'balances': fetched_by_workers[1]['balances'],
+        'horizon_requests': fetched_by_workers[1]['horizon_requests'],
+        'sequential_seconds': sequential_seconds,
+        'concurrent_seconds': concurrent_seconds,
+        'speedup': round(sequential_seconds / concurrent_seconds, 2) if concurrent_seconds else None,
+    }
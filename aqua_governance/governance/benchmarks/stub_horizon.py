@@ -0,0 +1,233 @@
+import json
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from copy import deepcopy
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+
+from stellar_sdk import Asset
+from stellar_sdk.client.base_sync_client import BaseSyncClient
+from stellar_sdk.client.response import Response
+
+from aqua_governance.utils.stellar.asset import get_asset_string
+
+
+def make_create_operation(claimable_balance: dict[str, Any], operation_id: str, transaction_hash: str) -> dict:
+    return {
+        'id': operation_id,
+        'paging_token': operation_id,
+        'type': 'create_claimable_balance',
+        'created_at': '2026-01-01T00:00:00Z',
+        'transaction_hash': transaction_hash,
+        'sponsor': claimable_balance['sponsor'],
+        'asset': claimable_balance['asset'],
+        'amount': claimable_balance['amount'],
+        'claimants': deepcopy(claimable_balance['claimants']),
+    }
+
+
+def add_balance_creation(
+    server: 'StubHorizonServer',
+    claimable_balance: dict[str, Any],
+    transaction_hash: str,
+    clawed_back_balance_id: Optional[str] = None,
+) -> None:
+    """Register the operations that created *claimable_balance*, optionally as a clawback/re-create replacement."""
+    transaction_operations = server.operations_by_transaction.setdefault(transaction_hash, [])
+    if clawed_back_balance_id is not None:
+        clawback_operation = {
+            'id': server.next_operation_id(),
+            'type': 'clawback_claimable_balance',
+            'transaction_hash': transaction_hash,
+            'balance_id': clawed_back_balance_id,
+        }
+        clawback_operation['paging_token'] = clawback_operation['id']
+        transaction_operations.append(clawback_operation)
+        server.operations_by_balance_id.setdefault(clawed_back_balance_id, []).append(clawback_operation)
+
+    create_operation = make_create_operation(claimable_balance, server.next_operation_id(), transaction_hash)
+    transaction_operations.append(create_operation)
+    server.operations_by_balance_id.setdefault(claimable_balance['id'], []).append(create_operation)
+
+
+class _StubCallBuilder:
+    def __init__(self, server: 'StubHorizonServer', endpoint: str, key: Optional[str] = None):
+        self._server = server
+        self._endpoint = endpoint
+        self._key = key
+        self._limit = 10
+        self._cursor: Optional[str] = None
+        self._desc = False
+
+    def _set(self, **changes) -> '_StubCallBuilder':
+        # Like the SDK call builders: modify the builder in place and return it.
+        for name, value in changes.items():
+            setattr(self, name, value)
+        return self
+
+    def for_claimant(self, claimant: str) -> '_StubCallBuilder':
+        return self._set(_endpoint='claimable_balances', _key=claimant)
+
+    def for_asset(self, asset: Asset) -> '_StubCallBuilder':
+        return self._set(_endpoint='asset_claimable_balances', _key=get_asset_string(asset))
+
+    def for_claimable_balance(self, balance_id: str) -> '_StubCallBuilder':
+        return self._set(_endpoint='balance_operations', _key=balance_id)
+
+    def for_transaction(self, transaction_hash: str) -> '_StubCallBuilder':
+        return self._set(_endpoint='transaction_operations', _key=transaction_hash)
+
+    def order(self, desc: bool = True) -> '_StubCallBuilder':
+        return self._set(_desc=desc)
+
+    def limit(self, limit: int) -> '_StubCallBuilder':
+        return self._set(_limit=limit)
+
+    def cursor(self, cursor: str) -> '_StubCallBuilder':
+        return self._set(_cursor=cursor)
+
+    def call(self) -> dict[str, Any]:
+        return self._server.page(self._endpoint, self._key, self._cursor, self._limit, self._desc)
+
+
+class StubHorizonServer:
+    """In-memory stand-in for ``stellar_sdk.Server`` covering the endpoints used by vote indexing."""
+
+    def __init__(self, latency_seconds: float = 0):
+        self.latency_seconds = latency_seconds
+        self.claimable_balances_by_claimant: dict[str, list[dict[str, Any]]] = {}
+        self.operations_by_balance_id: dict[str, list[dict[str, Any]]] = {}
+        self.operations_by_transaction: dict[str, list[dict[str, Any]]] = {}
+        self.calls: list[tuple[str, Optional[str], Optional[str]]] = []
+        # Called while a page request is in flight; lets tests hold requests open.
+        self.request_hook: Optional[Callable[[], None]] = None
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self._operation_sequence = 0
+        self._sorted_pages: dict[tuple[str, Optional[str]], tuple[list, int, list[str], list[dict[str, Any]]]] = {}
+
+    def next_operation_id(self) -> str:
+        self._operation_sequence += 1
+        return f'{self._operation_sequence:019d}'
+
+    def add_claimable_balance(self, claimant: str, claimable_balance: dict[str, Any]) -> None:
+        self.claimable_balances_by_claimant.setdefault(claimant, []).append(claimable_balance)
+
+    def remove_claimable_balance(self, claimant: str, balance_id: str) -> None:
+        self.claimable_balances_by_claimant[claimant] = [
+            claimable_balance
+            for claimable_balance in self.claimable_balances_by_claimant.get(claimant, [])
+            if claimable_balance['id'] != balance_id
+        ]
+
+    def count_calls(self, endpoint: str) -> int:
+        return sum(1 for called_endpoint, _, _ in self.calls if called_endpoint == endpoint)
+
+    def page(
+        self,
+        endpoint: str,
+        key: Optional[str],
+        cursor: Optional[str],
+        limit: int,
+        desc: bool = False,
+    ) -> dict[str, Any]:
+        self.calls.append((endpoint, key, cursor))
+        with self._in_flight_lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            if self.latency_seconds:
+                time.sleep(self.latency_seconds)
+            if self.request_hook is not None:
+                self.request_hook()
+        finally:
+            with self._in_flight_lock:
+                self._in_flight -= 1
+        paging_tokens, records = self._sorted_records(endpoint, key)
+        if desc:
+            end = len(records) if cursor is None else bisect_left(paging_tokens, cursor)
+            page = records[max(end - limit, 0):end][::-1]
+        else:
+            start = 0 if cursor is None else bisect_right(paging_tokens, cursor)
+            page = records[start:start + limit]
+        return {'_embedded': {'records': deepcopy(page)}}
+
+    def _sorted_records(self, endpoint: str, key: Optional[str]) -> tuple[list[str], list[dict[str, Any]]]:
+        # Re-sorted only when the underlying list is replaced or grows, so paging large listings stays cheap.
+        records = self.records_for(endpoint, key)
+        cached = self._sorted_pages.get((endpoint, key))
+        if cached is None or cached[0] is not records or cached[1] != len(records):
+            sorted_records = sorted(records, key=lambda record: record.get('paging_token') or '')
+            paging_tokens = [record.get('paging_token') or '' for record in sorted_records]
+            cached = (records, len(records), paging_tokens, sorted_records)
+            self._sorted_pages[(endpoint, key)] = cached
+        return cached[2], cached[3]
+
+    def records_for(self, endpoint: str, key: Optional[str]) -> list[dict[str, Any]]:
+        if endpoint == 'claimable_balances':
+            return self.claimable_balances_by_claimant.get(key, [])
+        if endpoint == 'asset_claimable_balances':
+            records_by_id = {
+                claimable_balance['id']: claimable_balance
+                for claimable_balances in self.claimable_balances_by_claimant.values()
+                for claimable_balance in claimable_balances
+                if claimable_balance['asset'] == key
+            }
+            return list(records_by_id.values())
+        if endpoint == 'balance_operations':
+            return self.operations_by_balance_id.get(key, [])
+        if endpoint == 'transaction_operations':
+            return self.operations_by_transaction.get(key, [])
+        return []
+
+    def claimable_balances(self) -> _StubCallBuilder:
+        return _StubCallBuilder(self, 'claimable_balances')
+
+    def operations(self) -> _StubCallBuilder:
+        return _StubCallBuilder(self, 'operations')
+
+
+class StubHorizonClient(BaseSyncClient):
+    """
+    HTTP client for a real ``stellar_sdk.Server`` that serves a ``StubHorizonServer``'s data.
+
+    Lets tests exercise the SDK call builders and anything that hooks in at the
+    HTTP client level (recording, replay).
+    """
+
+    def __init__(self, server: StubHorizonServer):
+        self.server = server
+
+    def get(self, url: str, params: Optional[dict[str, str]] = None) -> Response:
+        params = params or {}
+        path = urlsplit(url).path.strip('/').split('/')
+        if path == ['claimable_balances'] and 'asset' in params:
+            endpoint, key = 'asset_claimable_balances', params['asset']
+        elif path == ['claimable_balances']:
+            endpoint, key = 'claimable_balances', params.get('claimant')
+        elif len(path) == 3 and path[0] == 'claimable_balances' and path[2] == 'operations':
+            endpoint, key = 'balance_operations', path[1]
+        elif len(path) == 3 and path[0] == 'transactions' and path[2] == 'operations':
+            endpoint, key = 'transaction_operations', path[1]
+        else:
+            return Response(404, json.dumps({'status': 404}), {}, url)
+
+        page = self.server.page(
+            endpoint,
+            key,
+            params.get('cursor'),
+            int(params.get('limit', 10)),
+            params.get('order') == 'desc',
+        )
+        return Response(200, json.dumps(page), {}, url)
+
+    def post(self, url: str, data=None, json_data=None) -> Response:
+        raise NotImplementedError
+
+    def stream(self, url: str, params=None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
@@ -0,0 +1,186 @@
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Optional
+
+from django.conf import settings
+from stellar_sdk import Keypair
+
+from aqua_governance.governance.benchmarks.stub_horizon import StubHorizonServer, add_balance_creation
+
+
+GOVERNANCE_ICE_ASSET = f'{settings.GOVERNANCE_ICE_ASSET_CODE}:{settings.GOVERNANCE_ICE_ASSET_ISSUER}'
+DEFAULT_UNLOCK_TIMESTAMP = 1_800_000_000
+# Balances created or melted per transaction; keeps a transaction's operations within one Horizon page.
+TRANSACTION_BATCH_SIZE = 50
+
+
+def make_voter_account(index: int) -> str:
+    return Keypair.from_raw_ed25519_seed(index.to_bytes(32, 'big')).public_key
+
+
+def make_balance_id(index: int) -> str:
+    return '00000000' + f'{index:064x}'
+
+
+def make_claimable_balance(
+    *,
+    balance_id: str,
+    voter: str,
+    issuer: str,
+    unlock_timestamp: int,
+    amount: str = '100.0000000',
+    asset: str = GOVERNANCE_ICE_ASSET,
+    sponsor: Optional[str] = None,
+    paging_token: Optional[str] = None,
+    last_modified_ledger: int = 50_000_000,
+) -> dict[str, Any]:
+    """Build a claimable balance shaped like a Horizon ``/claimable_balances`` record."""
+    abs_before = datetime.fromtimestamp(unlock_timestamp, tz=dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    return {
+        '_links': {
+            'self': {'href': f'https://horizon.example/claimable_balances/{balance_id}'},
+            'transactions': {
+                'href': f'https://horizon.example/claimable_balances/{balance_id}/transactions{{?cursor,limit,order}}',
+                'templated': True,
+            },
+            'operations': {
+                'href': f'https://horizon.example/claimable_balances/{balance_id}/operations{{?cursor,limit,order}}',
+                'templated': True,
+            },
+        },
+        'id': balance_id,
+        'asset': asset,
+        'amount': amount,
+        'sponsor': sponsor or voter,
+        'last_modified_ledger': last_modified_ledger,
+        'last_modified_time': '2026-01-01T00:00:00Z',
+        'claimants': [
+            {
+                'destination': voter,
+                'predicate': {'not': {'abs_before': abs_before, 'abs_before_epoch': str(unlock_timestamp)}},
+            },
+            {
+                'destination': issuer,
+                'predicate': {'unconditional': True},
+            },
+        ],
+        'flags': {'clawback_enabled': True},
+        'paging_token': paging_token or balance_id,
+    }
+
+
+def make_raw_claimable_balance(
+    index: int,
+    voter: str,
+    issuer: str,
+    unlock_timestamp: int = DEFAULT_UNLOCK_TIMESTAMP,
+    sponsor: Optional[str] = None,
+    amount: str = '100.0000000',
+) -> dict[str, Any]:
+    """Build the *index*-th synthetic balance, with a ledger and paging token that grow with *index*."""
+    balance_id = make_balance_id(index)
+    return make_claimable_balance(
+        balance_id=balance_id,
+        voter=voter,
+        issuer=issuer,
+        unlock_timestamp=unlock_timestamp,
+        amount=amount,
+        sponsor=sponsor,
+        paging_token=f'{50_000_000 + index}-{balance_id}',
+        last_modified_ledger=50_000_000 + index,
+    )
+
+
+def make_raw_claimable_balances(
+    count: int,
+    issuer: str,
+    voter_pool_size: int = 1000,
+    service_sponsor: Optional[str] = None,
+    service_sponsored_every: int = 0,
+) -> list[dict[str, Any]]:
+    """
+    Build *count* vote balances for *issuer*, cycling through a pool of voter accounts.
+
+    Every ``service_sponsored_every``-th balance is sponsored by *service_sponsor*,
+    like a melting replacement.
+    """
+    voters = [make_voter_account(index) for index in range(1, min(count, voter_pool_size) + 1)]
+    return [
+        make_raw_claimable_balance(
+            index,
+            voter=voters[index % len(voters)],
+            issuer=issuer,
+            sponsor=(
+                service_sponsor
+                if service_sponsor and service_sponsored_every and index % service_sponsored_every == 0
+                else None
+            ),
+        )
+        for index in range(count)
+    ]
+
+
+def add_vote_balances(
+    horizon: StubHorizonServer,
+    issuer: str,
+    count: int,
+    voter_pool_size: int,
+    unlock_timestamp: int = DEFAULT_UNLOCK_TIMESTAMP,
+) -> list[dict[str, Any]]:
+    """Add *count* self-sponsored vote balances for *issuer*, created in batches like wallet submissions."""
+    voters = [make_voter_account(index) for index in range(1, min(count, voter_pool_size) + 1)]
+    claimable_balances = []
+    for index in range(count):
+        claimable_balance = make_raw_claimable_balance(
+            index,
+            voter=voters[index % len(voters)],
+            issuer=issuer,
+            unlock_timestamp=unlock_timestamp,
+        )
+        horizon.add_claimable_balance(issuer, claimable_balance)
+        add_balance_creation(horizon, claimable_balance, f'tx-vote-{index // TRANSACTION_BATCH_SIZE}')
+        claimable_balances.append(claimable_balance)
+    return claimable_balances
+
+
+def melt_vote_balances(
+    horizon: StubHorizonServer,
+    issuer: str,
+    claimable_balances: list[dict[str, Any]],
+    service_sponsor: str,
+    hops: int = 1,
+    unlock_timestamp: int = DEFAULT_UNLOCK_TIMESTAMP,
+) -> list[dict[str, Any]]:
+    """
+    Replace every balance by a service-sponsored one through *hops* clawback/re-create transactions.
+
+    One hop is a melting event; more hops build the multi-step chains the origin
+    trace has to walk back.  Only the last replacement stays listed for *issuer*.
+    """
+    next_index = max(int(claimable_balance['id'], 16) for claimable_balance in claimable_balances) + 1
+    replacements = list(claimable_balances)
+    for hop in range(hops):
+        for position, previous in enumerate(replacements):
+            replacement = make_raw_claimable_balance(
+                next_index,
+                voter=previous['claimants'][0]['destination'],
+                issuer=issuer,
+                unlock_timestamp=unlock_timestamp,
+                sponsor=service_sponsor,
+                amount='90.0000000',
+            )
+            next_index += 1
+            add_balance_creation(
+                horizon,
+                replacement,
+                f'tx-melting-{hop}-{position // TRANSACTION_BATCH_SIZE}',
+                clawed_back_balance_id=previous['id'],
+            )
+            replacements[position] = replacement
+
+    replaced_ids = {claimable_balance['id'] for claimable_balance in claimable_balances}
+    horizon.claimable_balances_by_claimant[issuer] = [
+        claimable_balance
+        for claimable_balance in horizon.claimable_balances_by_claimant.get(issuer, [])
+        if claimable_balance['id'] not in replaced_ids
+    ] + replacements
+    return replacements
@@ -0,0 +1,42 @@
+import time
+from typing import Any, Optional
+
+from aqua_governance.governance.benchmarks.synthetic import make_voter_account, make_raw_claimable_balances
+from aqua_governance.governance.task_logic.unlock_rules import (
+    _parse_timestamp_with_dateutil,
+    parse_unlock_timestamp,
+)
+
+
+def run(count: int = 100_000) -> dict[str, Any]:
+    """Validation throughput of ``abs_before`` predicates: memoized fast path, fast path alone, dateutil alone."""
+    predicates = [
+        claimant['predicate']['not']
+        for claimable_balance in make_raw_claimable_balances(count, make_voter_account(0))
+        for claimant in claimable_balance['claimants']
+        if 'not' in claimant['predicate']
+    ]
+
+    memo: dict[str, Optional[int]] = {}
+    memoized_seconds = _time(lambda predicate: parse_unlock_timestamp(predicate, memo), predicates)
+    fast_path_seconds = _time(parse_unlock_timestamp, predicates)
+    dateutil_seconds = _time(lambda predicate: _parse_timestamp_with_dateutil(predicate['abs_before']), predicates)
+
+    return {
+        'benchmark': 'unlock_validation',
+        'count': count,
+        'memoized_balances_per_second': _rate(count, memoized_seconds),
+        'fast_path_balances_per_second': _rate(count, fast_path_seconds),
+        'dateutil_balances_per_second': _rate(count, dateutil_seconds),
+    }
+
+
+def _time(parse, predicates: list[dict[str, Any]]) -> float:
+    started_at = time.perf_counter()
+    for predicate in predicates:
+        parse(predicate)
+    return time.perf_counter() - started_at
+
+
+def _rate(count: int, seconds: float) -> Optional[int]:
+    return round(count / seconds) if seconds else None
@@ -0,0 +1,192 @@
+import gc
+import json
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Any, Callable, NamedTuple, Optional
+
+from django.db import connection, transaction
+
+from aqua_governance.governance.benchmarks.stub_horizon import StubHorizonServer
+from aqua_governance.governance.benchmarks.synthetic import (
+    DEFAULT_UNLOCK_TIMESTAMP,
+    add_vote_balances,
+    make_voter_account,
+    melt_vote_balances,
+)
+from aqua_governance.governance.models import Proposal
+from aqua_governance.governance.operations_cache import count_run_stats, get_operations_cache
+from aqua_governance.governance.task_logic.vote_indexing import (
+    apply_vote_snapshot_plan,
+    plan_proposal_votes_snapshot,
+)
+
+
+SERVICE_SPONSOR = make_voter_account(2 ** 32)
+CHAIN_HOPS = 3
+
+
+class Scenario(NamedTuple):
+    horizon: StubHorizonServer
+    # Applied to the Horizon state between the initial and the update snapshot.
+    change: Optional[Callable[[], None]]
+
+
+def run(count: int = 100_000) -> dict[str, Any]:
+    """
+    Run the vote indexer end to end against a stub Horizon for every scenario at *count* balances.
+
+    Each scenario indexes a fresh proposal (``initial``), applies its Horizon
+    change and re-indexes with a full reconcile (``update``), then runs again
+    without changes (``steady``).  Every phase reports wall time, SQL queries
+    on the indexing connection, Horizon calls per endpoint, operations cache
+    stats, the applied counts and the peak traced memory.  Memory comes from
+    a second, traced pass so it does not skew the timings.  All database
+    changes are rolled back.
+    """
+    return {
+        'benchmark': 'vote_indexing',
+        'count': count,
+        'scenarios': {
+            name: _run_scenario(build_scenario, count)
+            for name, build_scenario in SCENARIOS.items()
+        },
+    }
+
+
+def build_self_sponsored(proposal: Proposal, count: int) -> Scenario:
+    horizon = StubHorizonServer()
+    _add_votes(horizon, proposal, count)
+    return Scenario(horizon, None)
+
+
+def build_melting(proposal: Proposal, count: int) -> Scenario:
+    horizon = StubHorizonServer()
+    claimable_balances = _add_votes(horizon, proposal, count)
+    return Scenario(
+        horizon,
+        lambda: melt_vote_balances(horizon, proposal.vote_for_issuer, claimable_balances, SERVICE_SPONSOR),
+    )
+
+
+def build_clawback_chains(proposal: Proposal, count: int) -> Scenario:
+    horizon = StubHorizonServer()
+    claimable_balances = _add_votes(horizon, proposal, count)
+    return Scenario(
+        horizon,
+        lambda: melt_vote_balances(
+            horizon, proposal.vote_for_issuer, claimable_balances, SERVICE_SPONSOR, hops=CHAIN_HOPS,
+        ),
+    )
+
+
+SCENARIOS = {
+    'self_sponsored': build_self_sponsored,
+    'melting': build_melting,
+    'clawback_chains': build_clawback_chains,
+}
+
+
+def _add_votes(horizon: StubHorizonServer, proposal: Proposal, count: int) -> list[dict[str, Any]]:
+    # About two balances per voter, so vote groups are not all singletons.
+    return add_vote_balances(horizon, proposal.vote_for_issuer, count, voter_pool_size=max(count // 2, 1))
+
+
+def _run_scenario(build_scenario: Callable[[Proposal, int], Scenario], count: int) -> dict[str, Any]:
+    phases = _run_phases(build_scenario, count, trace_memory=False)
+    traced_phases = _run_phases(build_scenario, count, trace_memory=True)
+    for phase, traced_phase in zip(phases, traced_phases):
+        phase['peak_memory_bytes'] = traced_phase['peak_memory_bytes']
+    return {phase.pop('phase'): phase for phase in phases}
+
+
+def _run_phases(
+    build_scenario: Callable[[Proposal, int], Scenario],
+    count: int,
+    trace_memory: bool,
+) -> list[dict[str, Any]]:
+    phases = []
+    with transaction.atomic():
+        proposal = _make_proposal()
+        scenario = build_scenario(proposal, count)
+        get_operations_cache().clear()
+
+        phases.append(_run_phase('initial', proposal, scenario.horizon, False, trace_memory))
+        if scenario.change is not None:
+            scenario.change()
+            phases.append(_run_phase('update', proposal, scenario.horizon, True, trace_memory))
+        phases.append(_run_phase('steady', proposal, scenario.horizon, False, trace_memory))
+
+        transaction.set_rollback(True)
+    get_operations_cache().clear()
+    return phases
+
+
+def _run_phase(
+    name: str,
+    proposal: Proposal,
+    horizon: StubHorizonServer,
+    force_full_reconcile: bool,
+    trace_memory: bool,
+) -> dict[str, Any]:
+    query_counter = _QueryCounter()
+    first_call = len(horizon.calls)
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+
+    started_at = time.perf_counter()
+    with connection.execute_wrapper(query_counter), count_run_stats() as operations_cache_stats:
+        plan = plan_proposal_votes_snapshot(proposal, horizon, force_full_reconcile=force_full_reconcile)
+        stats = apply_vote_snapshot_plan(plan)
+    seconds = time.perf_counter() - started_at
+
+    peak_memory_bytes = None
+    if trace_memory:
+        peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    horizon_calls = Counter(endpoint for endpoint, _, _ in horizon.calls[first_call:])
+    return {
+        'phase': name,
+        'full_reconcile': force_full_reconcile,
+        'seconds': round(seconds, 4),
+        'sql_queries': query_counter.count,
+        'horizon_calls': sum(horizon_calls.values()),
+        'horizon_calls_by_endpoint': dict(sorted(horizon_calls.items())),
+        'operations_cache': operations_cache_stats.as_dict(),
+        'created': stats['created'],
+        'updated': stats['updated'],
+        'unchanged': stats['unchanged'],
+        'stale': stats['stale'],
+        'peak_memory_bytes': peak_memory_bytes,
+    }
+
+
+def _make_proposal() -> Proposal:
+    # bulk_create skips Proposal.save, which fetches the ICE supply over the network.
+    end_at = datetime.fromtimestamp(DEFAULT_UNLOCK_TIMESTAMP, tz=dt_timezone.utc) - timedelta(hours=1)
+    proposal = Proposal(
+        proposed_by=make_voter_account(0),
+        title='Vote indexing benchmark',
+        text=json.dumps({'delta': {'ops': []}, 'html': ''}),
+        proposal_type=Proposal.PROPOSAL_TYPE_GENERAL,
+        proposal_status=Proposal.VOTING,
+        start_at=end_at - timedelta(days=7),
+        end_at=end_at,
+        vote_for_issuer=make_voter_account(2 ** 32 + 1),
+        vote_against_issuer=make_voter_account(2 ** 32 + 2),
+        abstain_issuer=make_voter_account(2 ** 32 + 3),
+    )
+    Proposal.objects.bulk_create([proposal])
+    return proposal
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
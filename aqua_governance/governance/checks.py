@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+# Built-in backends whose counters are not shared between processes, or whose incr is not atomic.
+UNSHARED_CACHE_BACKENDS = (
+    'django.core.cache.backends.dummy.DummyCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.filebased.FileBasedCache',
+    'django.core.cache.backends.db.DatabaseCache',
+)
+
+
+@register()
+def check_horizon_rate_limit_cache(app_configs, **kwargs):
+    if settings.HORIZON_RATE_LIMIT_PER_SECOND <= 0:
+        return []
+    backend = settings.CACHES.get(settings.HORIZON_RATE_LIMIT_CACHE, {}).get('BACKEND')
+    if backend not in UNSHARED_CACHE_BACKENDS:
+        return []
+    return [
+        Warning(
+            f'HORIZON_RATE_LIMIT_CACHE "{settings.HORIZON_RATE_LIMIT_CACHE}" uses {backend}, so the Horizon '
+            f'rate limit of {settings.HORIZON_RATE_LIMIT_PER_SECOND} requests per second applies per process.',
+            hint='Set CACHE_URL to a cache shared by every worker with an atomic incr, such as Memcached.',
+            id='governance.W001',
+        ),
+    ]
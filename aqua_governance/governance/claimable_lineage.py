@@ -0,0 +1,81 @@
+import threading
+from typing import Optional
+
+from aqua_governance.governance.models import ClaimableBalanceLineage
+
+
+class DatabaseLineageStore:
+    """
+    Persistent lineage for ``find_origin_claimable_balance_id``.
+
+    Replacement chains are immutable once written on-chain, so every resolved
+    step (balance -> clawed-back parent) and every traced origin is stored and
+    reused by later traces, including traces that join an already-known chain.
+    """
+
+    def lookup(self, balance_id: str) -> Optional[tuple[Optional[str], Optional[str]]]:
+        return (
+            ClaimableBalanceLineage.objects
+            .filter(balance_id=balance_id)
+            .values_list('parent_balance_id', 'origin_balance_id')
+            .first()
+        )
+
+    def save_parent(self, balance_id: str, parent_balance_id: str) -> None:
+        ClaimableBalanceLineage.objects.update_or_create(
+            balance_id=balance_id,
+            defaults={'parent_balance_id': parent_balance_id},
+        )
+
+    def save_origin(self, balance_ids: list[str], origin_balance_id: str) -> None:
+        ClaimableBalanceLineage.objects.get_or_create(balance_id=origin_balance_id)
+        ClaimableBalanceLineage.objects.filter(
+            balance_id__in=[*balance_ids, origin_balance_id],
+        ).update(origin_balance_id=origin_balance_id)
+
+
+class BufferedLineageStore:
+    """
+    Lineage store for concurrent traces.
+
+    Lookups fall through to the database and are memoized; writes are kept in
+    memory until ``flush`` is called on the caller's thread, so they land in the
+    caller's transaction rather than in a worker thread's connection.
+    """
+
+    def __init__(self):
+        self._database_store = DatabaseLineageStore()
+        self._known: dict[str, Optional[tuple[Optional[str], Optional[str]]]] = {}
+        self._pending_parents: list[tuple[str, str]] = []
+        self._pending_origins: list[tuple[list[str], str]] = []
+        self._lock = threading.Lock()
+
+    def lookup(self, balance_id: str) -> Optional[tuple[Optional[str], Optional[str]]]:
+        with self._lock:
+            if balance_id in self._known:
+                return self._known[balance_id]
+        known_lineage = self._database_store.lookup(balance_id)
+        with self._lock:
+            return self._known.setdefault(balance_id, known_lineage)
+
+    def save_parent(self, balance_id: str, parent_balance_id: str) -> None:
+        with self._lock:
+            self._known[balance_id] = (parent_balance_id, None)
+            self._pending_parents.append((balance_id, parent_balance_id))
+
+    def save_origin(self, balance_ids: list[str], origin_balance_id: str) -> None:
+        with self._lock:
+            for balance_id in [*balance_ids, origin_balance_id]:
+                known_lineage = self._known.get(balance_id)
+                parent_balance_id = known_lineage[0] if known_lineage else None
+                self._known[balance_id] = (parent_balance_id, origin_balance_id)
+            self._pending_origins.append((list(balance_ids), origin_balance_id))
+
+    def flush(self) -> None:
+        with self._lock:
+            pending_parents, self._pending_parents = self._pending_parents, []
+            pending_origins, self._pending_origins = self._pending_origins, []
+        for balance_id, parent_balance_id in pending_parents:
+            self._database_store.save_parent(balance_id, parent_balance_id)
+        for balance_ids, origin_balance_id in pending_origins:
+            self._database_store.save_origin(balance_ids, origin_balance_id)
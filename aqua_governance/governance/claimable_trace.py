@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any, Optional
 
 from stellar_sdk import Server
@@ -14,11 +15,20 @@ def find_origin_claimable_balance_id(
     *,
     max_depth: int = 120,
     per_call_limit: int = 200,
+    lineage_store=None,
+    operations_cache=None,
+    deadline: Optional[float] = None,
 ) -> Optional[str]:
     """
     Trace claimable-balance replacement chain backwards until first create operation
     where sponsor is among claimant destinations.
 
+    ``lineage_store`` (see ``claimable_lineage.DatabaseLineageStore``) is consulted
+    before every Horizon lookup and receives every resolved step and origin.
+    ``operations_cache`` (see ``operations_cache.OperationsCache``) serves repeated
+    balance and transaction operations lookups, e.g. within one melting batch.
+    ``deadline`` is a ``time.monotonic()`` value; the trace gives up once it passes.
+
     Returns origin balance id on success, otherwise None.
     """
     if not start_balance_id:
@@ -41,19 +51,50 @@ def find_origin_claimable_balance_id(
     )
 
     current_balance_id = start_balance_id
+    visited_balance_ids: list[str] = []
     for depth in range(max_depth):
+        if deadline is not None and time.monotonic() >= deadline:
+            logger.warning(
+                "Origin trace stopped for start=%s at depth=%s: deadline exceeded (balance_id=%s)",
+                start_balance_id,
+                depth,
+                current_balance_id,
+            )
+            return None
+
+        known_lineage = lineage_store.lookup(current_balance_id) if lineage_store is not None else None
+        if known_lineage is not None:
+            known_parent_balance_id, known_origin_balance_id = known_lineage
+            if known_origin_balance_id:
+                logger.info(
+                    "Origin trace found stored origin for start=%s: origin=%s depth=%s",
+                    start_balance_id,
+                    known_origin_balance_id,
+                    depth,
+                )
+                if visited_balance_ids:
+                    lineage_store.save_origin(visited_balance_ids, known_origin_balance_id)
+                return known_origin_balance_id
+            if known_parent_balance_id:
+                visited_balance_ids.append(current_balance_id)
+                current_balance_id = known_parent_balance_id
+                continue
+
         logger.debug(
             "Origin trace depth=%s balance_id=%s: loading claimable-balance operations",
             depth,
             current_balance_id,
         )
-        balance_ops = (
-            horizon_server.operations()
-            .for_claimable_balance(current_balance_id)
-            .limit(per_call_limit)
-            .order(False)
-            .call()
-        )
+        if operations_cache is not None:
+            balance_ops = operations_cache.balance_operations(horizon_server, current_balance_id, per_call_limit)
+        else:
+            balance_ops = (
+                horizon_server.operations()
+                .for_claimable_balance(current_balance_id)
+                .limit(per_call_limit)
+                .order(False)
+                .call()
+            )
         records = _extract_records(balance_ops)
         logger.debug(
             "Origin trace depth=%s balance_id=%s: loaded operations=%s",
@@ -89,6 +130,8 @@ def find_origin_claimable_balance_id(
                 current_balance_id,
                 depth,
             )
+            if lineage_store is not None:
+                lineage_store.save_origin(visited_balance_ids, current_balance_id)
             return current_balance_id
 
         transaction_hash = create_op.get("transaction_hash")
@@ -111,13 +154,16 @@ def find_origin_claimable_balance_id(
             current_balance_id,
             transaction_hash,
         )
-        tx_ops = (
-            horizon_server.operations()
-            .for_transaction(str(transaction_hash))
-            .limit(per_call_limit)
-            .order(False)
-            .call()
-        )
+        if operations_cache is not None:
+            tx_ops = operations_cache.transaction_operations(horizon_server, str(transaction_hash), per_call_limit)
+        else:
+            tx_ops = (
+                horizon_server.operations()
+                .for_transaction(str(transaction_hash))
+                .limit(per_call_limit)
+                .order(False)
+                .call()
+            )
         tx_records = _extract_records(tx_ops)
         logger.debug(
             "Origin trace depth=%s balance_id=%s: loaded tx operations=%s",
@@ -145,6 +191,9 @@ def find_origin_claimable_balance_id(
             current_balance_id,
             previous_balance_id,
         )
+        if lineage_store is not None:
+            lineage_store.save_parent(current_balance_id, previous_balance_id)
+        visited_balance_ids.append(current_balance_id)
         current_balance_id = previous_balance_id
 
     logger.warning(
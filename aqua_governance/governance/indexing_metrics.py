@@ -0,0 +1,147 @@
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Iterator, Optional
+
+from django.utils import timezone
+
+from aqua_governance.governance.models import IndexingRun, Proposal
+
+
+logger = logging.getLogger()
+
+PHASE_FETCH = 'fetch'
+PHASE_TRACE = 'trace'
+PHASE_METADATA = 'metadata'
+PHASE_RECONCILE = 'reconcile'
+PHASE_APPLY = 'apply'
+
+CLAIMABLE_BALANCES = 'claimable_balances'
+BALANCE_OPERATIONS = 'balance_operations'
+TRANSACTION_OPERATIONS = 'transaction_operations'
+ENDPOINT_BY_BUILDER_METHOD = {
+    'for_claimant': CLAIMABLE_BALANCES,
+    'for_asset': CLAIMABLE_BALANCES,
+    'for_claimable_balance': BALANCE_OPERATIONS,
+    'for_transaction': TRANSACTION_OPERATIONS,
+}
+
+
+class IndexingRunMetrics:
+    """Timings and counters of one vote snapshot run, stored as an ``IndexingRun`` when the run ends."""
+
+    def __init__(self):
+        self.phase_seconds: dict[str, float] = {}
+        self.horizon_requests: Counter = Counter()
+        self.group_counts: Counter = Counter()
+        self.cache_stats: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self.phase_seconds[name] = self.phase_seconds.get(name, 0) + time.monotonic() - started_at
+
+    def count_horizon_request(self, endpoint: str) -> None:
+        # Called from the origin and metadata worker threads.
+        with self._lock:
+            self.horizon_requests[endpoint] += 1
+
+    def add_cache_stats(self, cache: str, **counters: int) -> None:
+        cache_stats = self.cache_stats.setdefault(cache, {})
+        for counter, value in counters.items():
+            cache_stats[counter] = cache_stats.get(counter, 0) + value
+
+
+class _CountingCallBuilder:
+    def __init__(self, call_builder, endpoint: str, metrics: IndexingRunMetrics):
+        self._call_builder = call_builder
+        self._endpoint = endpoint
+        self._metrics = metrics
+
+    def call(self) -> dict[str, Any]:
+        self._metrics.count_horizon_request(self._endpoint)
+        return self._call_builder.call()
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._call_builder, name)
+        if not callable(attribute):
+            return attribute
+
+        def chained(*args, **kwargs):
+            result = attribute(*args, **kwargs)
+            if not hasattr(result, 'call'):
+                return result
+            return _CountingCallBuilder(result, ENDPOINT_BY_BUILDER_METHOD.get(name, self._endpoint), self._metrics)
+
+        return chained
+
+
+class CountingHorizonServer:
+    """Wraps a Horizon server so every request the indexer sends is counted by endpoint in *metrics*."""
+
+    def __init__(self, horizon_server, metrics: IndexingRunMetrics):
+        self._horizon_server = horizon_server
+        self._metrics = metrics
+
+    def claimable_balances(self) -> _CountingCallBuilder:
+        return _CountingCallBuilder(self._horizon_server.claimable_balances(), CLAIMABLE_BALANCES, self._metrics)
+
+    def operations(self) -> _CountingCallBuilder:
+        return _CountingCallBuilder(self._horizon_server.operations(), 'operations', self._metrics)
+
+    def __getattr__(self, name: str):
+        return getattr(self._horizon_server, name)
+
+
+def record_indexing_run(
+    proposal: Proposal,
+    metrics: IndexingRunMetrics,
+    started_at: datetime,
+    freezing_amount: bool,
+    stats: Optional[dict[str, Any]] = None,
+    error: Optional[BaseException] = None,
+) -> Optional[IndexingRun]:
+    """Store *metrics* of a finished run; a failure here is logged and never fails the run itself."""
+    finished_at = timezone.now()
+    stats = stats or {}
+    try:
+        return IndexingRun.objects.create(
+            proposal=proposal,
+            started_at=started_at,
+            finished_at=finished_at,
+            status=IndexingRun.STATUS_FAILED if error is not None else IndexingRun.STATUS_SUCCEEDED,
+            error=repr(error) if error is not None else None,
+            freezing_amount=freezing_amount,
+            total_seconds=(finished_at - started_at).total_seconds(),
+            fetch_seconds=metrics.phase_seconds.get(PHASE_FETCH),
+            trace_seconds=metrics.phase_seconds.get(PHASE_TRACE),
+            metadata_seconds=metrics.phase_seconds.get(PHASE_METADATA),
+            reconcile_seconds=metrics.phase_seconds.get(PHASE_RECONCILE),
+            apply_seconds=metrics.phase_seconds.get(PHASE_APPLY),
+            horizon_request_count=sum(metrics.horizon_requests.values()),
+            horizon_requests=dict(sorted(metrics.horizon_requests.items())),
+            cache_stats=_with_hit_rates(metrics.cache_stats),
+            group_counts=dict(sorted(metrics.group_counts.items())),
+            created_count=stats.get('created', 0),
+            updated_count=stats.get('updated', 0),
+            unchanged_count=stats.get('unchanged', 0),
+            stale_count=stats.get('stale', 0),
+        )
+    except Exception:
+        logger.warning('Failed to record indexing run of proposal %s', proposal.id, exc_info=True)
+        return None
+
+
+def _with_hit_rates(cache_stats: dict[str, dict[str, int]]) -> dict[str, dict[str, Any]]:
+    result = {}
+    for cache, counters in sorted(cache_stats.items()):
+        lookups = counters.get('hits', 0) + counters.get('misses', 0)
+        result[cache] = {**counters, 'hit_rate': round(counters.get('hits', 0) / lookups, 4) if lookups else None}
+    return result
@@ -0,0 +1,39 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from aqua_governance.governance.models import Proposal
+from aqua_governance.governance.task_logic.vote_diff import diff_proposal_votes_snapshot
+from aqua_governance.utils.horizon import get_horizon_server
+
+
+class Command(BaseCommand):
+    help = (
+        'Dry-run a vote snapshot of a proposal and print, as JSON, the votes it would create, update and mark '
+        'claimed and the resulting tally deltas. No votes are written.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('proposal_id', type=int)
+        parser.add_argument('--freezing-amount', action='store_true', help='Plan a freezing run, like at voting end.')
+        parser.add_argument(
+            '--full-reconcile',
+            action='store_true',
+            help='Walk the full claimant listing instead of resuming from the ingestion checkpoint.',
+        )
+        parser.add_argument('--limit', type=int, default=None, help='List at most this many votes per section.')
+
+    def handle(self, *args, **options):
+        try:
+            proposal = Proposal.objects.get(id=options['proposal_id'])
+        except Proposal.DoesNotExist:
+            raise CommandError(f'Proposal {options["proposal_id"]} does not exist.')
+
+        diff = diff_proposal_votes_snapshot(
+            proposal,
+            get_horizon_server(),
+            freezing_amount=options['freezing_amount'],
+            force_full_reconcile=options['full_reconcile'],
+            limit=options['limit'],
+        )
+        self.stdout.write(json.dumps(diff, indent=2))
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from aqua_governance.governance.models import Proposal
+from aqua_governance.governance.task_logic.vote_indexing import plan_proposal_votes_snapshot
+from aqua_governance.utils.horizon_replay import make_recording_server
+
+
+class Command(BaseCommand):
+    help = (
+        'Plan a vote snapshot of a proposal against Horizon and save every Horizon response it used '
+        'as a gzip fixture for replay_horizon_fixture. No votes are written. Stored lineage and creation '
+        'metadata let the indexer skip Horizon calls, so record against a scratch database for a complete fixture.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('proposal_id', type=int)
+        parser.add_argument('output', help='Fixture path, e.g. proposal-123.json.gz')
+        parser.add_argument('--horizon-url', default=settings.HORIZON_URL)
+
+    def handle(self, *args, **options):
+        try:
+            proposal = Proposal.objects.get(id=options['proposal_id'])
+        except Proposal.DoesNotExist:
+            raise CommandError(f'Proposal {options["proposal_id"]} does not exist.')
+
+        horizon_server, recording_client = make_recording_server(options['horizon_url'])
+        plan = plan_proposal_votes_snapshot(proposal, horizon_server, force_full_reconcile=True)
+        recording_client.save(
+            options['output'],
+            metadata={
+                'proposal_id': proposal.id,
+                'vote_for_issuer': proposal.vote_for_issuer,
+                'vote_against_issuer': proposal.vote_against_issuer,
+                'abstain_issuer': proposal.abstain_issuer,
+                'horizon_url': options['horizon_url'],
+                'recorded_at': timezone.now().isoformat(),
+            },
+        )
+        self.stdout.write(
+            f'Recorded {recording_client.request_count} Horizon responses for proposal {proposal.id} '
+            f'({len(plan.new_votes)} new, {len(plan.updated_votes)} updated votes) to {options["output"]}',
+        )
@@ -0,0 +1,48 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from aqua_governance.governance.models import Proposal
+from aqua_governance.governance.task_logic.vote_indexing import plan_proposal_votes_snapshot
+from aqua_governance.utils.horizon_replay import make_replay_server
+
+
+PROPOSAL_ISSUER_FIELDS = ('vote_for_issuer', 'vote_against_issuer', 'abstain_issuer')
+
+
+class Command(BaseCommand):
+    help = (
+        'Plan a vote snapshot against a fixture from record_horizon_fixture and print timings and plan counts '
+        'as JSON. No votes are written.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixture')
+        parser.add_argument('--proposal-id', type=int, help='Local proposal to plan; defaults to the recorded one.')
+
+    def handle(self, *args, **options):
+        horizon_server, replay_client = make_replay_server(options['fixture'])
+        proposal_id = options['proposal_id'] or replay_client.metadata.get('proposal_id')
+        try:
+            proposal = Proposal.objects.get(id=proposal_id)
+        except Proposal.DoesNotExist:
+            raise CommandError(f'Proposal {proposal_id} does not exist.')
+        for field_name in PROPOSAL_ISSUER_FIELDS:
+            if getattr(proposal, field_name) != replay_client.metadata.get(field_name):
+                raise CommandError(f'Proposal {proposal.id} {field_name} does not match the fixture.')
+
+        started_at = time.perf_counter()
+        plan = plan_proposal_votes_snapshot(proposal, horizon_server, force_full_reconcile=True)
+        seconds = time.perf_counter() - started_at
+
+        self.stdout.write(json.dumps({
+            'proposal_id': proposal.id,
+            'seconds': round(seconds, 4),
+            'horizon_requests': replay_client.served,
+            'missed_requests': len(replay_client.missed),
+            'new_votes': len(plan.new_votes),
+            'updated_votes': len(plan.updated_votes),
+            'unchanged_votes': plan.unchanged_count,
+            'processed_votes': len(plan.processed_vote_ids),
+        }))
@@ -0,0 +1,30 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from aqua_governance.governance.benchmarks import BENCHMARKS
+
+
+class Command(BaseCommand):
+    help = 'Run a vote indexing benchmark and print its results as JSON, one line per count.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+        parser.add_argument(
+            '--count',
+            type=int,
+            nargs='+',
+            default=[100_000],
+            help=(
+                'Number of synthetic claimable balances; '
+                'several counts run one after another, e.g. 1000 10000 100000.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if any(count < 0 for count in options['count']):
+            raise CommandError('--count must not be negative.')
+        # One JSON object per line, so results of several scales and commits can be collected and compared.
+        for count in options['count']:
+            result = BENCHMARKS[options['benchmark']](count=count)
+            self.stdout.write(json.dumps(result))
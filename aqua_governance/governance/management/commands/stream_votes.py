@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from aqua_governance.governance.tasks import task_update_proposal_results
+from aqua_governance.governance.vote_stream import run_vote_stream
+from aqua_governance.utils.horizon import get_horizon_server
+
+
+class Command(BaseCommand):
+    help = (
+        'Follow Horizon effects of the voting proposals\' issuer accounts and update their votes and results '
+        'within seconds of a change. Runs until interrupted; the periodic snapshot remains the reconciliation path.'
+    )
+
+    def handle(self, *args, **options):
+        # Enqueue the re-index: running it here would stall the streams while it runs.
+        run_vote_stream(get_horizon_server(), update_proposal=task_update_proposal_results.delay)
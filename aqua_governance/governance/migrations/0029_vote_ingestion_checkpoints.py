@@ -0,0 +1,40 @@
+# Generated by Django 3.2.25 on 2026-10-17 21:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('governance', '0028_asset_token_and_proposal_fk'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VoteIngestionCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('claimant', models.CharField(max_length=56)),
+                ('paging_token', models.CharField(blank=True, help_text='Paging token of the last claimable balance loaded for this claimant.', max_length=128, null=True)),
+                ('last_full_reconcile_at', models.DateTimeField(blank=True, help_text='Time of the last full claimable-balance crawl; incremental loads start from paging_token.', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('proposal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vote_ingestion_checkpoints', to='governance.proposal')),
+            ],
+            options={
+                'unique_together': {('proposal', 'claimant')},
+            },
+        ),
+        migrations.CreateModel(
+            name='IndexedClaimableBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('claimable_balance_id', models.CharField(max_length=72)),
+                ('record', models.JSONField()),
+                ('checkpoint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balances', to='governance.voteingestioncheckpoint')),
+            ],
+            options={
+                'unique_together': {('checkpoint', 'claimable_balance_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.2.25 on 2026-10-17 21:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('governance', '0029_vote_ingestion_checkpoints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClaimableBalanceLineage',
+            fields=[
+                ('balance_id', models.CharField(max_length=72, primary_key=True, serialize=False)),
+                ('parent_balance_id', models.CharField(blank=True, help_text='Balance clawed back in the transaction that created this balance.', max_length=72, null=True)),
+                ('origin_balance_id', models.CharField(blank=True, db_index=True, help_text='First self-sponsored balance of the replacement chain, once traced.', max_length=72, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.25 on 2026-10-17 21:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('governance', '0030_claimable_balance_lineage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClaimableBalanceMetadata',
+            fields=[
+                ('balance_id', models.CharField(max_length=72, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(help_text='Time of the create_claimable_balance operation.')),
+                ('original_amount', models.DecimalField(decimal_places=7, help_text='Amount of the create_claimable_balance operation.', max_digits=20)),
+            ],
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2.25 on 2026-10-17 21:52
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('governance', '0031_claimable_balance_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='logvote',
+            name='key_digest',
+            field=models.CharField(help_text='Fixed-width digest of key, indexed together with the proposal for group lookups and search.', max_length=32, null=True),
+        ),
+        AddIndexConcurrently(
+            model_name='logvote',
+            index=models.Index(fields=['proposal', 'key_digest'], name='logvote_proposal_key_digest'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+import hashlib
+
+from django.db import migrations
+
+
+BACKFILL_CHUNK_SIZE = 2000
+
+
+def backfill_logvote_key_digest(apps, schema_editor):
+    LogVote = apps.get_model('governance', 'LogVote')
+
+    last_id = 0
+    while True:
+        votes = list(
+            LogVote.objects
+            .filter(id__gt=last_id, key__isnull=False, key_digest__isnull=True)
+            .order_by('id')
+            .only('id', 'key')[:BACKFILL_CHUNK_SIZE]
+        )
+        if not votes:
+            break
+        for vote in votes:
+            vote.key_digest = hashlib.blake2b(vote.key.encode(), digest_size=16).hexdigest()
+        LogVote.objects.bulk_update(votes, ['key_digest'])
+        last_id = votes[-1].id
+
+
+class Migration(migrations.Migration):
+    # Every chunk commits on its own, so the backfill never holds one long transaction.
+    atomic = False
+
+    dependencies = [
+        ('governance', '0032_logvote_key_digest'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_logvote_key_digest, reverse_code=migrations.RunPython.noop),
+    ]
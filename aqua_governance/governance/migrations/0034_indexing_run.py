@@ -0,0 +1,44 @@
+# Generated by Django 3.2.25 on 2026-10-17 22:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('governance', '0033_backfill_logvote_key_digest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexingRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField()),
+                ('status', models.CharField(choices=[('succeeded', 'Succeeded'), ('failed', 'Failed')], max_length=16)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('freezing_amount', models.BooleanField(default=False)),
+                ('total_seconds', models.FloatField()),
+                ('fetch_seconds', models.FloatField(blank=True, help_text='Loading claimable balances from Horizon.', null=True)),
+                ('trace_seconds', models.FloatField(blank=True, help_text='Resolving origins of melted balances.', null=True)),
+                ('metadata_seconds', models.FloatField(blank=True, help_text='Loading balance creation metadata.', null=True)),
+                ('reconcile_seconds', models.FloatField(blank=True, help_text='Matching vote groups to stored votes.', null=True)),
+                ('apply_seconds', models.FloatField(blank=True, help_text='Writing the snapshot.', null=True)),
+                ('horizon_request_count', models.PositiveIntegerField(default=0)),
+                ('horizon_requests', models.JSONField(blank=True, default=dict, help_text='Horizon requests by endpoint.')),
+                ('cache_stats', models.JSONField(blank=True, default=dict, help_text='Cache hits, misses and hit rates.')),
+                ('group_counts', models.JSONField(blank=True, default=dict, help_text='Vote groups by classification.')),
+                ('created_count', models.PositiveIntegerField(default=0)),
+                ('updated_count', models.PositiveIntegerField(default=0)),
+                ('unchanged_count', models.PositiveIntegerField(default=0)),
+                ('stale_count', models.PositiveIntegerField(default=0)),
+                ('proposal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='indexing_runs', to='governance.proposal')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='indexingrun',
+            index=models.Index(fields=['proposal', '-started_at'], name='indexingrun_proposal_started'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2.25 on 2026-10-17 22:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('governance', '0034_indexing_run'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProposalIndexingState',
+            fields=[
+                ('proposal', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='indexing_state', serialize=False, to='governance.proposal')),
+                ('last_indexed_at', models.DateTimeField()),
+                ('last_changed_at', models.DateTimeField(help_text='Last snapshot that created, updated or claimed a vote.')),
+                ('unclaimed_count', models.PositiveIntegerField(default=0, help_text='Visible votes not claimed yet.')),
+                ('next_index_at', models.DateTimeField(blank=True, db_index=True, help_text='When the scheduled sweep re-indexes the proposal next; empty once it is settled.', null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 3.2.25 on 2026-10-17 22:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('governance', '0035_proposal_indexing_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VoteUpdateSweep',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('proposal_ids', models.JSONField(default=list)),
+                ('lane_count', models.PositiveSmallIntegerField(help_text='Proposal tasks allowed to run at the same time.')),
+                ('pending_count', models.PositiveIntegerField()),
+                ('succeeded_count', models.PositiveIntegerField(default=0)),
+                ('failed_count', models.PositiveIntegerField(default=0)),
+                ('summary', models.JSONField(blank=True, default=dict)),
+            ],
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2.25 on 2026-10-17 22:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('governance', '0036_vote_update_sweep'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProposalSnapshotLease',
+            fields=[
+                ('proposal', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='snapshot_lease', serialize=False, to='governance.proposal')),
+                ('holder', models.CharField(blank=True, default='', help_text='Token of the run holding the lease.', max_length=32)),
+                ('freezing_amount', models.BooleanField(default=False)),
+                ('acquired_at', models.DateTimeField(blank=True, null=True)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('freezing_requested', models.BooleanField(default=False, help_text='A freezing snapshot arrived while the lease was held and runs once it is released.')),
+            ],
+        ),
+    ]
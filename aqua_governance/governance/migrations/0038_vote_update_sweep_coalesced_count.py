@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-17 22:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('governance', '0037_proposal_snapshot_lease'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='voteupdatesweep',
+            name='coalesced_count',
+            field=models.PositiveIntegerField(default=0, help_text='Proposals skipped because another snapshot of them was already running.'),
+        ),
+    ]
@@ -0,0 +1,80 @@
+from django.db import migrations, models
+
+
+def reset_checkpoints(apps, schema_editor):
+    # Stored raw records are dropped; the next snapshot of every proposal runs a full crawl.
+    apps.get_model('governance', 'IndexedClaimableBalance').objects.all().delete()
+    apps.get_model('governance', 'VoteIngestionCheckpoint').objects.update(
+        paging_token=None,
+        last_full_reconcile_at=None,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('governance', '0038_vote_update_sweep_coalesced_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(reset_checkpoints, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='indexedclaimablebalance',
+            name='record',
+        ),
+        migrations.AddField(
+            model_name='indexedclaimablebalance',
+            name='paging_token',
+            field=models.CharField(default='', max_length=128),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='indexedclaimablebalance',
+            name='amount',
+            field=models.BigIntegerField(default=0, help_text='Balance amount in stroops.'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='indexedclaimablebalance',
+            name='asset',
+            field=models.CharField(default='', max_length=128),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='indexedclaimablebalance',
+            name='sponsor',
+            field=models.CharField(blank=True, max_length=56, null=True),
+        ),
+        migrations.AddField(
+            model_name='indexedclaimablebalance',
+            name='account_issuer',
+            field=models.CharField(blank=True, max_length=56, null=True),
+        ),
+        migrations.AddField(
+            model_name='indexedclaimablebalance',
+            name='abs_before',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AddField(
+            model_name='indexedclaimablebalance',
+            name='unlock_timestamps',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AddField(
+            model_name='indexedclaimablebalance',
+            name='self_sponsored',
+            field=models.BooleanField(default=False),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='indexedclaimablebalance',
+            name='transaction_link',
+            field=models.TextField(default=''),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='indexedclaimablebalance',
+            name='last_modified_time',
+            field=models.CharField(blank=True, max_length=32, null=True),
+        ),
+    ]
@@ -485,6 +485,11 @@ class LogVote(models.Model):
             ""
         )
     )
+    key_digest = models.CharField(
+        max_length=32,
+        null=True,
+        help_text="Fixed-width digest of key, indexed together with the proposal for group lookups and search.",
+    )
     group_index = models.IntegerField(
         default=0,
         help_text=(
@@ -538,11 +543,194 @@ class LogVote(models.Model):
 
     class Meta:
         unique_together = [['hide', 'claimable_balance_id']]
+        indexes = [
+            models.Index(fields=['proposal', 'key_digest'], name='logvote_proposal_key_digest'),
+        ]
 
     def __str__(self):
         return str(self.id)
 
 
+class VoteIngestionCheckpoint(models.Model):
+    proposal = models.ForeignKey(Proposal, on_delete=models.CASCADE, related_name='vote_ingestion_checkpoints')
+    claimant = models.CharField(max_length=56)
+    paging_token = models.CharField(
+        max_length=128,
+        null=True,
+        blank=True,
+        help_text='Paging token of the last claimable balance loaded for this claimant.',
+    )
+    last_full_reconcile_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='Time of the last full claimable-balance crawl; incremental loads start from paging_token.',
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [['proposal', 'claimant']]
+
+    def __str__(self):
+        return f'{self.proposal_id}:{self.claimant}'
+
+
+class IndexedClaimableBalance(models.Model):
+    """The decoded fields of a claimable balance (see ``ClaimableBalanceRecord``) kept for incremental loads."""
+
+    checkpoint = models.ForeignKey(VoteIngestionCheckpoint, on_delete=models.CASCADE, related_name='balances')
+    claimable_balance_id = models.CharField(max_length=72)
+    paging_token = models.CharField(max_length=128)
+    amount = models.BigIntegerField(help_text='Balance amount in stroops.')
+    asset = models.CharField(max_length=128)
+    sponsor = models.CharField(max_length=56, null=True, blank=True)
+    account_issuer = models.CharField(max_length=56, null=True, blank=True)
+    abs_before = models.JSONField(default=list)
+    unlock_timestamps = models.JSONField(default=list)
+    self_sponsored = models.BooleanField()
+    transaction_link = models.TextField()
+    last_modified_time = models.CharField(max_length=32, null=True, blank=True)
+
+    class Meta:
+        unique_together = [['checkpoint', 'claimable_balance_id']]
+
+    def __str__(self):
+        return self.claimable_balance_id
+
+
+class ClaimableBalanceLineage(models.Model):
+    balance_id = models.CharField(max_length=72, primary_key=True)
+    parent_balance_id = models.CharField(
+        max_length=72,
+        null=True,
+        blank=True,
+        help_text='Balance clawed back in the transaction that created this balance.',
+    )
+    origin_balance_id = models.CharField(
+        max_length=72,
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text='First self-sponsored balance of the replacement chain, once traced.',
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.balance_id
+
+
+class ClaimableBalanceMetadata(models.Model):
+    balance_id = models.CharField(max_length=72, primary_key=True)
+    created_at = models.DateTimeField(help_text='Time of the create_claimable_balance operation.')
+    original_amount = models.DecimalField(
+        decimal_places=7,
+        max_digits=20,
+        help_text='Amount of the create_claimable_balance operation.',
+    )
+
+    def __str__(self):
+        return self.balance_id
+
+
+class ProposalIndexingState(models.Model):
+    proposal = models.OneToOneField(
+        Proposal,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='indexing_state',
+    )
+    last_indexed_at = models.DateTimeField()
+    last_changed_at = models.DateTimeField(help_text='Last snapshot that created, updated or claimed a vote.')
+    unclaimed_count = models.PositiveIntegerField(default=0, help_text='Visible votes not claimed yet.')
+    next_index_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text='When the scheduled sweep re-indexes the proposal next; empty once it is settled.',
+    )
+
+    def __str__(self):
+        return str(self.proposal_id)
+
+
+class ProposalSnapshotLease(models.Model):
+    proposal = models.OneToOneField(
+        Proposal,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='snapshot_lease',
+    )
+    holder = models.CharField(max_length=32, blank=True, default='', help_text='Token of the run holding the lease.')
+    freezing_amount = models.BooleanField(default=False)
+    acquired_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+    freezing_requested = models.BooleanField(
+        default=False,
+        help_text='A freezing snapshot arrived while the lease was held and runs once it is released.',
+    )
+
+    def __str__(self):
+        return f'{self.proposal_id}:{self.holder or "free"}'
+
+
+class IndexingRun(models.Model):
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = (
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    )
+
+    proposal = models.ForeignKey(Proposal, on_delete=models.CASCADE, related_name='indexing_runs')
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+    status = models.CharField(choices=STATUS_CHOICES, max_length=16)
+    error = models.TextField(null=True, blank=True)
+    freezing_amount = models.BooleanField(default=False)
+
+    total_seconds = models.FloatField()
+    fetch_seconds = models.FloatField(null=True, blank=True, help_text='Loading claimable balances from Horizon.')
+    trace_seconds = models.FloatField(null=True, blank=True, help_text='Resolving origins of melted balances.')
+    metadata_seconds = models.FloatField(null=True, blank=True, help_text='Loading balance creation metadata.')
+    reconcile_seconds = models.FloatField(null=True, blank=True, help_text='Matching vote groups to stored votes.')
+    apply_seconds = models.FloatField(null=True, blank=True, help_text='Writing the snapshot.')
+
+    horizon_request_count = models.PositiveIntegerField(default=0)
+    horizon_requests = models.JSONField(default=dict, blank=True, help_text='Horizon requests by endpoint.')
+    cache_stats = models.JSONField(default=dict, blank=True, help_text='Cache hits, misses and hit rates.')
+    group_counts = models.JSONField(default=dict, blank=True, help_text='Vote groups by classification.')
+
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    unchanged_count = models.PositiveIntegerField(default=0)
+    stale_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['proposal', '-started_at'], name='indexingrun_proposal_started'),
+        ]
+
+    def __str__(self):
+        return f'{self.proposal_id}:{self.started_at.isoformat()}'
+
+
+class VoteUpdateSweep(models.Model):
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    proposal_ids = models.JSONField(default=list)
+    lane_count = models.PositiveSmallIntegerField(help_text='Proposal tasks allowed to run at the same time.')
+    pending_count = models.PositiveIntegerField()
+    succeeded_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    coalesced_count = models.PositiveIntegerField(
+        default=0,
+        help_text='Proposals skipped because another snapshot of them was already running.',
+    )
+    summary = models.JSONField(default=dict, blank=True)
+
+    def __str__(self):
+        return f'{self.id}:{self.started_at.isoformat()}'
+
+
 class HistoryProposal(models.Model):
     version = models.PositiveSmallIntegerField()
     hide = models.BooleanField(default=False)
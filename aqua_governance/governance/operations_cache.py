@@ -0,0 +1,118 @@
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional
+
+from django.conf import settings
+
+
+BALANCE_OPERATIONS = 'balance_operations'
+TRANSACTION_OPERATIONS = 'transaction_operations'
+
+
+class OperationsCacheStats:
+    """Hit and miss counters per operations endpoint; safe to update from worker threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {kind: {'hits': 0, 'misses': 0} for kind in (BALANCE_OPERATIONS, TRANSACTION_OPERATIONS)}
+
+    def count(self, kind: str, hit: bool) -> None:
+        with self._lock:
+            self._counters[kind]['hits' if hit else 'misses'] += 1
+
+    def as_dict(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {kind: dict(counters) for kind, counters in self._counters.items()}
+
+
+# Counters of the run in progress in this context, see ``count_run_stats``.
+_run_stats: ContextVar[Optional[OperationsCacheStats]] = ContextVar('operations_cache_run_stats', default=None)
+
+
+class OperationsCache:
+    """
+    Bounded LRU cache of Horizon operations responses used by the claimable trace walker.
+
+    Melting batches re-create many balances in one transaction, so the same
+    transaction operations are requested once per balance in the batch.  Only
+    non-empty responses are cached: an empty page usually means Horizon has not
+    ingested the balance yet, and that answer must not stick.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple[str, str, int], dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = OperationsCacheStats()
+
+    def balance_operations(self, horizon_server, balance_id: str, limit: int) -> dict[str, Any]:
+        return self._get_or_load(
+            (BALANCE_OPERATIONS, balance_id, limit),
+            lambda: horizon_server.operations().for_claimable_balance(balance_id).limit(limit).order(False).call(),
+        )
+
+    def transaction_operations(self, horizon_server, transaction_hash: str, limit: int) -> dict[str, Any]:
+        return self._get_or_load(
+            (TRANSACTION_OPERATIONS, transaction_hash, limit),
+            lambda: horizon_server.operations().for_transaction(transaction_hash).limit(limit).order(False).call(),
+        )
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Process-wide counters, including lookups of every run sharing this cache."""
+        return self._stats.as_dict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats = OperationsCacheStats()
+
+    def _get_or_load(self, key: tuple[str, str, int], load: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+            self._stats.count(key[0], response is not None)
+        run_stats = _run_stats.get()
+        if run_stats is not None:
+            run_stats.count(key[0], response is not None)
+        if response is not None:
+            return response
+
+        response = load()
+        if response.get('_embedded', {}).get('records') and self.max_size > 0:
+            with self._lock:
+                self._entries[key] = response
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return response
+
+
+_operations_cache: Optional[OperationsCache] = None
+
+
+def get_operations_cache() -> OperationsCache:
+    """Return the worker-process operations cache."""
+    global _operations_cache
+    if _operations_cache is None:
+        _operations_cache = OperationsCache(settings.HORIZON_OPERATIONS_CACHE_SIZE)
+    return _operations_cache
+
+
+@contextmanager
+def count_run_stats() -> Iterator[OperationsCacheStats]:
+    """
+    Count the operations cache lookups made in this context, and in worker
+    threads started from it with ``map_in_threads``, into a new stats object.
+
+    Runs in other threads or contexts keep their own counters, so overlapping
+    runs in one worker process do not count each other's hits.
+    """
+    stats = OperationsCacheStats()
+    token = _run_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _run_stats.reset(token)
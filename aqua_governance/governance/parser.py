@@ -1,34 +1,33 @@
+import hashlib
 from decimal import Decimal
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from django.conf import settings
 from stellar_sdk import Asset
 
 from aqua_governance.governance.exceptions import GenerateGrouKeyException
 from aqua_governance.governance.models import LogVote, Proposal
-from aqua_governance.utils.stellar.asset import parse_asset_string
+from aqua_governance.utils.stellar.asset import get_asset_string
+
+if TYPE_CHECKING:
+    from aqua_governance.governance.task_logic.balance_records import ClaimableBalanceRecord
 
 AQUA_ASSET = Asset(settings.AQUA_ASSET_CODE, settings.AQUA_ASSET_ISSUER)
 ICE_ASSET = Asset(settings.GOVERNANCE_ICE_ASSET_CODE, settings.GOVERNANCE_ICE_ASSET_ISSUER)
 GDICE_ASSET = Asset(settings.GDICE_ASSET_CODE, settings.GDICE_ASSET_ISSUER)
+VOTE_ASSETS = frozenset(get_asset_string(asset) for asset in (AQUA_ASSET, ICE_ASSET, GDICE_ASSET))
 
 
-def parse_vote(vote_key: str, vote_group_index: int, claimable_balance: dict, proposal: Proposal, vote_choice: str,
-               created_at: str, original_amount: str, vote_id: Optional[int], freezing_amount: bool = False,
-               original_voted_amount: Optional[Decimal] = None) -> Optional[LogVote]:
-    balance_id = claimable_balance['id']
-    asset = parse_asset_string(claimable_balance['asset'])
-    asset_code = claimable_balance['asset'].split(':')[0]
-    amount = claimable_balance['amount']
-    transaction_link = claimable_balance['_links']['transactions']['href'].replace('{?cursor,limit,order}', '')
-
-    if asset not in [AQUA_ASSET, ICE_ASSET, GDICE_ASSET]:
+def parse_vote(vote_key: str, vote_group_index: int, claimable_balance: 'ClaimableBalanceRecord', proposal: Proposal,
+               vote_choice: str, created_at: str, original_amount: str, vote_id: Optional[int],
+               freezing_amount: bool = False, original_voted_amount: Optional[Decimal] = None) -> Optional[LogVote]:
+    if claimable_balance.asset not in VOTE_ASSETS:
         return None
 
-    time_list, account_issuer = _make_time_list_and_account_issuer_for_vote(claimable_balance, proposal)
-    if not time_list:
+    if not claimable_balance.abs_before:
         return None
 
+    amount = claimable_balance.decimal_amount
     if freezing_amount:
         voted_amount = amount
     else:
@@ -37,49 +36,40 @@ def parse_vote(vote_key: str, vote_group_index: int, claimable_balance: dict, pr
     return LogVote(
         id=vote_id,
         key=vote_key,
+        key_digest=make_vote_key_digest(vote_key),
         group_index=vote_group_index,
-        claimable_balance_id=balance_id,
+        claimable_balance_id=claimable_balance.id,
         proposal=proposal,
         vote_choice=vote_choice,
         amount=amount,
         original_amount=original_amount,
         voted_amount=voted_amount,
-        account_issuer=account_issuer,
+        account_issuer=claimable_balance.account_issuer,
         created_at=created_at,
-        transaction_link=transaction_link,
-        asset_code=asset_code,
+        transaction_link=claimable_balance.transaction_link,
+        asset_code=claimable_balance.asset_code,
         hide=False,
         claimed=False
     )
 
 
-def generate_vote_key(claimable_balance: dict, proposal: Proposal, vote_choice: str) -> str:
-    asset = parse_asset_string(claimable_balance['asset'])
+def generate_vote_key(claimable_balance: 'ClaimableBalanceRecord', proposal: Proposal, vote_choice: str) -> str:
+    if not claimable_balance.abs_before:
+        raise GenerateGrouKeyException("Invalid claimable_balance: time_list is empty")
 
-    time_list, account_issuer = _make_time_list_and_account_issuer_for_vote(claimable_balance, proposal)
-    proposal_id = proposal.id
+    return generate_vote_key_by_raw_data(
+        proposal.id,
+        vote_choice,
+        claimable_balance.account_issuer,
+        claimable_balance.asset_code,
+        list(claimable_balance.abs_before),
+    )
 
-    if not time_list:
-        raise GenerateGrouKeyException("Invalid claimable_balance: time_list is empty")
 
-    return generate_vote_key_by_raw_data(proposal_id, vote_choice, account_issuer, asset.code, time_list)
+def make_vote_key_digest(vote_key: str) -> str:
+    return hashlib.blake2b(vote_key.encode(), digest_size=16).hexdigest()
 
 
 def generate_vote_key_by_raw_data(proposal_id: int, vote_choice: str, account_issuer: str, asset: str,
                                   time_list: list[str]) -> str:
     return f"{proposal_id}|{vote_choice}|{account_issuer}|{asset}|{sorted(time_list)}"
-
-
-def _make_time_list_and_account_issuer_for_vote(claimable_balance: dict, proposal: Proposal) -> tuple[list[str], str]:
-    account_issuer = claimable_balance['sponsor']
-    claimants: list = claimable_balance['claimants']
-    time_list: list[str] = []
-
-    for claimant in claimants:
-        abs_before: Optional[str] = claimant.get('predicate', {}).get('not', {}).get('abs_before', None)
-        destination = claimant.get('destination', None)
-        if abs_before is not None and destination is not None:
-            account_issuer = destination
-            time_list.append(abs_before)
-
-    return time_list, account_issuer
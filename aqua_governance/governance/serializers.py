@@ -2,16 +2,15 @@ import base64
 import hashlib
 import json
 
-from django.conf import settings
-
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
 from django_quill.quill import Quill
-from stellar_sdk import HashMemo, Server, TransactionEnvelope
+from stellar_sdk import HashMemo, TransactionEnvelope
 
 from aqua_governance.governance.models import LogVote, Proposal, HistoryProposal
 from aqua_governance.governance.serializer_fields import QuillField
+from aqua_governance.utils.horizon import get_horizon_server
 from aqua_governance.utils.payments import (
     check_payment,
     check_xdr_payment,
@@ -98,7 +97,7 @@ class ProposalCreateSerializer(serializers.ModelSerializer):
         data['hide'] = True
 
         tx_hash = data.get('transaction_hash', None)
-        horizon_server = Server(settings.HORIZON_URL)
+        horizon_server = get_horizon_server()
         try:
             transaction_info = horizon_server.transactions().transaction(tx_hash).call()
         except Exception:
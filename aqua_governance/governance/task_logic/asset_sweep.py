@@ -0,0 +1,62 @@
+import logging
+from typing import Any, Iterable
+
+from stellar_sdk import Server
+
+from aqua_governance.governance.models import LogVote, Proposal
+from aqua_governance.governance.parser import AQUA_ASSET, GDICE_ASSET, ICE_ASSET
+from aqua_governance.utils.requests import prefetch_all_records
+
+
+logger = logging.getLogger()
+
+
+def build_issuer_routes(proposals: Iterable[Proposal]) -> dict[str, tuple[int, str]]:
+    """Map every vote issuer account of *proposals* to ``(proposal_id, vote_choice)``."""
+    routes = {}
+    for proposal in proposals:
+        for issuer, vote_choice in (
+            (proposal.vote_for_issuer, LogVote.VOTE_FOR),
+            (proposal.vote_against_issuer, LogVote.VOTE_AGAINST),
+            (proposal.abstain_issuer, LogVote.VOTE_ABSTAIN),
+        ):
+            if issuer:
+                routes[issuer] = (proposal.id, vote_choice)
+    return routes
+
+
+def crawl_vote_asset_balances(
+    horizon_server: Server,
+    routes: dict[str, tuple[int, str]],
+) -> dict[int, dict[str, list[dict[str, Any]]]]:
+    """
+    Crawl the claimable balances of every vote asset once and route them through *routes*.
+
+    Returns, per proposal id, the raw records of each of its vote issuers: the
+    ``prefetched_balances`` of ``update_proposal_votes_snapshot``.  The number
+    of Horizon requests depends on how many balances the vote assets have, not
+    on how many proposals are indexed.  Balances with no routed claimant are
+    dropped page by page.
+    """
+    balances_by_issuer: dict[str, list[dict[str, Any]]] = {}
+    balances_by_proposal: dict[int, dict[str, list[dict[str, Any]]]] = {}
+    for issuer, (proposal_id, _) in routes.items():
+        balances_by_issuer[issuer] = balances_by_proposal.setdefault(proposal_id, {}).setdefault(issuer, [])
+
+    crawled_count = 0
+    for asset in (ICE_ASSET, GDICE_ASSET, AQUA_ASSET):
+        request_builder = horizon_server.claimable_balances().for_asset(asset).order(desc=False)
+        for record in prefetch_all_records(request_builder):
+            crawled_count += 1
+            for claimant in record['claimants']:
+                issuer_balances = balances_by_issuer.get(claimant['destination'])
+                if issuer_balances is not None:
+                    issuer_balances.append(record)
+
+    logger.info(
+        "Vote asset sweep crawled %s balances, routed %s to %s issuers",
+        crawled_count,
+        sum(len(balances) for balances in balances_by_issuer.values()),
+        len(routes),
+    )
+    return balances_by_proposal
@@ -0,0 +1,86 @@
+from decimal import Decimal, InvalidOperation
+from typing import Any, NamedTuple, Optional
+
+from aqua_governance.governance.exceptions import ClaimableBalanceParsingError
+from aqua_governance.governance.task_logic.unlock_rules import parse_unlock_timestamp
+
+
+STROOPS_PER_UNIT = 10 ** 7
+
+
+class ClaimableBalanceRecord(NamedTuple):
+    """
+    The fields of a Horizon claimable balance the vote indexer needs, decoded once per run.
+
+    ``abs_before`` keeps the raw predicate strings of the claimants that have a
+    destination, because vote keys are built from them.  ``unlock_timestamps``
+    holds one entry per ``not abs_before`` predicate: the unlock epoch, or
+    ``None`` when the predicate is malformed or its epoch disagrees.
+    """
+
+    id: str
+    amount: int
+    asset: str
+    sponsor: Optional[str]
+    account_issuer: Optional[str]
+    abs_before: tuple[str, ...]
+    unlock_timestamps: tuple[Optional[int], ...]
+    self_sponsored: bool
+    transaction_link: str
+    last_modified_time: Optional[str]
+
+    @property
+    def asset_code(self) -> str:
+        return self.asset.split(':')[0]
+
+    @property
+    def decimal_amount(self) -> Decimal:
+        return Decimal(self.amount).scaleb(-7)
+
+
+def is_self_sponsored_claimable_balance(claimable_balance: dict[str, Any]) -> bool:
+    sponsor = claimable_balance.get('sponsor')
+    if not sponsor:
+        return False
+
+    for claimant in claimable_balance.get('claimants', []):
+        if claimant.get('destination') == sponsor:
+            return True
+
+    return False
+
+
+def decode_claimable_balance(
+    claimable_balance: dict[str, Any],
+    abs_before_memo: Optional[dict[str, Optional[int]]] = None,
+) -> ClaimableBalanceRecord:
+    """Decode a Horizon claimable balance; pass the same *abs_before_memo* for all balances of a run."""
+    try:
+        account_issuer = claimable_balance.get('sponsor')
+        abs_before_values = []
+        unlock_timestamps = []
+        for claimant in claimable_balance.get('claimants', []):
+            predicate_not = claimant.get('predicate', {}).get('not', {})
+            abs_before = predicate_not.get('abs_before')
+            if abs_before is None:
+                continue
+            unlock_timestamps.append(parse_unlock_timestamp(predicate_not, abs_before_memo))
+            destination = claimant.get('destination')
+            if destination is not None:
+                account_issuer = destination
+                abs_before_values.append(abs_before)
+
+        return ClaimableBalanceRecord(
+            id=claimable_balance['id'],
+            amount=int(Decimal(claimable_balance['amount']) * STROOPS_PER_UNIT),
+            asset=claimable_balance['asset'],
+            sponsor=claimable_balance.get('sponsor'),
+            account_issuer=account_issuer,
+            abs_before=tuple(abs_before_values),
+            unlock_timestamps=tuple(unlock_timestamps),
+            self_sponsored=is_self_sponsored_claimable_balance(claimable_balance),
+            transaction_link=claimable_balance['_links']['transactions']['href'].replace('{?cursor,limit,order}', ''),
+            last_modified_time=claimable_balance.get('last_modified_time'),
+        )
+    except (KeyError, TypeError, AttributeError, InvalidOperation) as exc:
+        raise ClaimableBalanceParsingError(f"Invalid claimable balance {claimable_balance.get('id')}") from exc
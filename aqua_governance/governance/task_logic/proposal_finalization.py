@@ -1,10 +1,11 @@
 import logging
 from decimal import Decimal
-from typing import Any
+from typing import Any, Iterable
 
 import requests
 from django.conf import settings
 from django.db import transaction
+from django.db.models import Q
 
 from aqua_governance.governance.asset_tokens import apply_asset_proposal_result_to_token
 from aqua_governance.governance.models import LogVote, Proposal
@@ -13,42 +14,72 @@ from aqua_governance.governance.models import LogVote, Proposal
 logger = logging.getLogger()
 
 
-def _sum_votes_for_proposal(proposal: Proposal, vote_choice: str) -> Decimal:
-    """Sum LogVote amounts for *proposal* and *vote_choice*, respecting status.
-
-    For ``Proposal.VOTED`` proposals the frozen ``voted_amount`` is used and
-    votes that have already been *claimed* are still counted (the snapshot was
-    taken at the moment voting ended, before claims).  For every other status
-    the current ``amount`` is used and *claimed* rows are excluded.
-
-    For VOTED proposals, ``voted_amount`` is preferred.  When ``voted_amount``
-    is ``None`` (which happens for rows that were first indexed after the
-    voting window closed, e.g. during a periodic reindex without freezing),
-    the current ``amount`` is used as a fallback.  This covers legacy /
-    late-discovered rows that missed the freeze.  Non-freezing updates to rows
-    that already have a snapshot preserve the existing ``voted_amount``.
+def counted_vote_lookups(proposal: Proposal) -> dict[str, Any]:
+    """Return the ``LogVote`` field lookups a vote must match to count towards the results of *proposal*.
+
+    Hidden votes and votes in assets other than governance ICE and GDICE never
+    count.  For ``Proposal.VOTED`` proposals votes that have already been
+    *claimed* are still counted (the snapshot was taken at the moment voting
+    ended, before claims); for every other status *claimed* rows are excluded.
+
+    ``counted_votes_q`` turns them into a database filter; ``tally_votes``
+    applies the same lookups to votes held in memory.
     """
-    supported_vote_assets = [settings.GOVERNANCE_ICE_ASSET_CODE, settings.GDICE_ASSET_CODE]
-
-    if proposal.proposal_status == Proposal.VOTED:
-        rows = proposal.logvote_set.filter(
-            vote_choice=vote_choice,
-            hide=False,
-            asset_code__in=supported_vote_assets,
-        ).values_list('voted_amount', 'amount')
-        total = sum(
-            (voted_amount if voted_amount is not None else amount)
-            for voted_amount, amount in rows
-        )
-        return _as_decimal(total)
-
-    amounts = proposal.logvote_set.filter(
-        vote_choice=vote_choice,
-        hide=False,
-        claimed=False,
-        asset_code__in=supported_vote_assets,
-    ).values_list('amount', flat=True)
-    return _as_decimal(sum(amounts))
+    lookups = {
+        'hide': False,
+        'asset_code__in': (settings.GOVERNANCE_ICE_ASSET_CODE, settings.GDICE_ASSET_CODE),
+    }
+    if proposal.proposal_status != Proposal.VOTED:
+        lookups['claimed'] = False
+    return lookups
+
+
+def counted_votes_q(proposal: Proposal) -> Q:
+    return Q(**counted_vote_lookups(proposal))
+
+
+def _counted_amount(proposal: Proposal, amount: Any, voted_amount: Any) -> Decimal:
+    """Return the amount a counted vote adds to its vote choice.
+
+    For VOTED proposals the frozen ``voted_amount`` is preferred.  When
+    ``voted_amount`` is ``None`` (which happens for rows that were first
+    indexed after the voting window closed, e.g. during a periodic reindex
+    without freezing), the current ``amount`` is used as a fallback.  This
+    covers legacy / late-discovered rows that missed the freeze.  Non-freezing
+    updates to rows that already have a snapshot preserve the existing
+    ``voted_amount``.  For every other status the current ``amount`` is used.
+    """
+    if proposal.proposal_status == Proposal.VOTED and voted_amount is not None:
+        return _as_decimal(voted_amount)
+    return _as_decimal(amount)
+
+
+def _matches_lookups(vote: LogVote, lookups: dict[str, Any]) -> bool:
+    for lookup, value in lookups.items():
+        field_name, _, lookup_type = lookup.partition('__')
+        vote_value = getattr(vote, field_name)
+        if not (vote_value in value if lookup_type == 'in' else vote_value == value):
+            return False
+    return True
+
+
+def _sum_votes_for_proposal(proposal: Proposal, vote_choice: str) -> Decimal:
+    """Sum the counted amounts of the votes for *proposal* and *vote_choice*, filtered in the database."""
+    rows = proposal.logvote_set.filter(counted_votes_q(proposal), vote_choice=vote_choice).values_list(
+        'amount',
+        'voted_amount',
+    )
+    return sum((_counted_amount(proposal, amount, voted_amount) for amount, voted_amount in rows), Decimal('0'))
+
+
+def tally_votes(proposal: Proposal, votes: Iterable[LogVote]) -> dict[str, Decimal]:
+    """Sum the counted amounts of in-memory *votes* per vote choice, with the rules of ``counted_vote_lookups``."""
+    lookups = counted_vote_lookups(proposal)
+    totals = {vote_choice: Decimal('0') for vote_choice, _ in LogVote.VOTE_TYPES}
+    for vote in votes:
+        if vote.vote_choice in totals and _matches_lookups(vote, lookups):
+            totals[vote.vote_choice] += _counted_amount(proposal, vote.amount, vote.voted_amount)
+    return totals
 
 
 def update_proposal_final_results(proposal_id: int) -> None:
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from aqua_governance.governance.models import Proposal, ProposalIndexingState
+
+
+# Beat ticks and task start-up drift by a few seconds; a proposal due within this
+# margin is taken by the current sweep rather than left for the next tick.
+DUE_SLACK = timedelta(minutes=1)
+
+
+def next_reindex_at(state: ProposalIndexingState, now: datetime) -> Optional[datetime]:
+    """
+    Return when the scheduled sweep should re-index a proposal in *state* next, or ``None`` for never.
+
+    The interval grows with the time since a snapshot last changed a vote:
+    ``VOTE_REINDEX_ACTIVE_INTERVAL_SECONDS`` at first, then
+    ``VOTE_REINDEX_STABLE_INTERVAL_SECONDS`` after ``VOTE_REINDEX_STABLE_AFTER_SECONDS``
+    and never after ``VOTE_REINDEX_SETTLED_AFTER_SECONDS``.  A proposal whose
+    votes are all claimed is settled right away.
+    """
+    if state.unclaimed_count == 0:
+        return None
+    quiet = now - state.last_changed_at
+    if quiet >= timedelta(seconds=settings.VOTE_REINDEX_SETTLED_AFTER_SECONDS):
+        return None
+    if quiet >= timedelta(seconds=settings.VOTE_REINDEX_STABLE_AFTER_SECONDS):
+        return now + timedelta(seconds=settings.VOTE_REINDEX_STABLE_INTERVAL_SECONDS)
+    return now + timedelta(seconds=settings.VOTE_REINDEX_ACTIVE_INTERVAL_SECONDS)
+
+
+def record_snapshot_activity(proposal: Proposal, stats: dict[str, Any]) -> ProposalIndexingState:
+    """Update the settlement state of *proposal* after a snapshot applied *stats*."""
+    now = timezone.now()
+    changed = bool(stats.get('created') or stats.get('updated') or stats.get('stale'))
+    state = ProposalIndexingState.objects.filter(proposal=proposal).first()
+    if state is None:
+        # The first snapshot starts the proposal in the active tier.
+        state = ProposalIndexingState(proposal=proposal, last_changed_at=now)
+    elif changed:
+        state.last_changed_at = now
+    state.last_indexed_at = now
+    state.unclaimed_count = proposal.logvote_set.filter(hide=False, claimed=False).count()
+    state.next_index_at = next_reindex_at(state, now)
+    state.save()
+    return state
+
+
+def due_voted_proposals(now: datetime) -> QuerySet:
+    """VOTED proposals the scheduled sweep should re-index at *now*: never indexed yet, or due."""
+    return Proposal.objects.filter(proposal_status=Proposal.VOTED).filter(
+        Q(indexing_state__isnull=True) | Q(indexing_state__next_index_at__lte=now + DUE_SLACK),
+    )
@@ -0,0 +1,62 @@
+import uuid
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from aqua_governance.governance.models import ProposalSnapshotLease
+
+
+def acquire_snapshot_lease(proposal_id: int, freezing_amount: bool) -> Optional[str]:
+    """
+    Take the snapshot lease of a proposal and return its token, or ``None`` if another run holds it.
+
+    Only one snapshot of a proposal runs at a time; a duplicate request is
+    dropped because the running snapshot already covers it.  A freezing request
+    that finds a non-freezing run is not dropped: it is recorded on the lease and
+    handed back by ``release_snapshot_lease``.  A lease older than
+    ``VOTE_SNAPSHOT_LEASE_SECONDS`` belongs to a lost run and is taken over.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        # ON CONFLICT DO NOTHING: when two workers create the first lease at once, both reach the locked get.
+        ProposalSnapshotLease.objects.bulk_create(
+            [ProposalSnapshotLease(proposal_id=proposal_id)],
+            ignore_conflicts=True,
+        )
+        lease = ProposalSnapshotLease.objects.select_for_update().get(proposal_id=proposal_id)
+        if lease.holder and lease.expires_at > now:
+            if freezing_amount and not lease.freezing_amount and not lease.freezing_requested:
+                lease.freezing_requested = True
+                lease.save(update_fields=['freezing_requested'])
+            return None
+
+        lease.holder = uuid.uuid4().hex
+        lease.freezing_amount = freezing_amount
+        lease.acquired_at = now
+        lease.expires_at = now + timedelta(seconds=settings.VOTE_SNAPSHOT_LEASE_SECONDS)
+        if freezing_amount:
+            lease.freezing_requested = False
+        lease.save()
+    return lease.holder
+
+
+def release_snapshot_lease(proposal_id: int, token: str) -> bool:
+    """
+    Release a lease taken with *token*.
+
+    Return ``True`` if a freezing snapshot was requested while it was held; the
+    caller then owes that snapshot.  A lease taken over after expiry is left alone.
+    """
+    with transaction.atomic():
+        lease = ProposalSnapshotLease.objects.select_for_update().filter(proposal_id=proposal_id, holder=token).first()
+        if lease is None:
+            return False
+        freezing_requested = lease.freezing_requested
+        lease.holder = ''
+        lease.expires_at = None
+        lease.freezing_requested = False
+        lease.save(update_fields=['holder', 'expires_at', 'freezing_requested'])
+    return freezing_requested
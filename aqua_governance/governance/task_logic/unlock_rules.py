@@ -1,5 +1,6 @@
-from datetime import timedelta, timezone as dt_timezone
-from typing import Any, Optional
+import re
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import TYPE_CHECKING, Any, Optional
 
 from dateutil.parser import parse as date_parse
 from django.utils import timezone
@@ -7,16 +8,14 @@ from django.utils import timezone
 from aqua_governance.governance.models import Proposal
 
 
-UNLOCK_TIMESTAMP_TOLERANCE_SECONDS = 1
+if TYPE_CHECKING:
+    from aqua_governance.governance.task_logic.balance_records import ClaimableBalanceRecord
 
 
-def extract_abs_before_values(claimable_balance: dict[str, Any]) -> list[str]:
-    abs_before_values = []
-    for claimant in claimable_balance.get("claimants", []):
-        abs_before = claimant.get("predicate", {}).get("not", {}).get("abs_before")
-        if abs_before is not None:
-            abs_before_values.append(abs_before)
-    return abs_before_values
+UNLOCK_TIMESTAMP_TOLERANCE_SECONDS = 1
+ISO_8601_PATTERN = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})(\.\d+)?(Z|[+-]\d{2}:?\d{2})?$',
+)
 
 
 def get_expected_unlock_timestamp(proposal: Proposal) -> int:
@@ -26,16 +25,57 @@ def get_expected_unlock_timestamp(proposal: Proposal) -> int:
     return round(expected_unlock_date.timestamp())
 
 
-def _parse_abs_before_timestamp(abs_before: Any) -> Optional[int]:
+def _parse_abs_before_timestamp(abs_before: Any, memo: Optional[dict[str, Optional[int]]] = None) -> Optional[int]:
+    """
+    Parse an ``abs_before`` predicate value into an epoch.
+
+    Horizon renders it as strict ISO-8601 UTC, which is parsed without dateutil;
+    dateutil is only the fallback for other formats.  Balances of a proposal
+    share a handful of values, so callers pass a per-run *memo*.
+    """
     if abs_before is None:
         return None
 
     if isinstance(abs_before, str) and abs_before.isdigit():
         return int(abs_before)
 
+    abs_before = str(abs_before)
+    if memo is not None and abs_before in memo:
+        return memo[abs_before]
+
+    abs_before_timestamp = _parse_iso_8601_timestamp(abs_before)
+    if abs_before_timestamp is None:
+        abs_before_timestamp = _parse_timestamp_with_dateutil(abs_before)
+
+    if memo is not None:
+        memo[abs_before] = abs_before_timestamp
+    return abs_before_timestamp
+
+
+def _parse_iso_8601_timestamp(value: str) -> Optional[int]:
+    match = ISO_8601_PATTERN.match(value)
+    if match is None:
+        return None
+    year, month, day, hour, minute, second, fraction, utc_offset = match.groups()
+    try:
+        parsed = datetime(int(year), int(month), int(day), int(hour), int(minute), int(second), tzinfo=dt_timezone.utc)
+    except ValueError:
+        return None
+
+    timestamp = parsed.timestamp()
+    if fraction:
+        timestamp += float(fraction)
+    if utc_offset and utc_offset != 'Z':
+        sign = -1 if utc_offset[0] == '-' else 1
+        offset_digits = utc_offset[1:].replace(':', '')
+        timestamp -= sign * (int(offset_digits[:2]) * 3600 + int(offset_digits[2:]) * 60)
+    return round(timestamp)
+
+
+def _parse_timestamp_with_dateutil(value: str) -> Optional[int]:
     try:
-        abs_before_date = date_parse(str(abs_before))
-    except (TypeError, ValueError):
+        abs_before_date = date_parse(value)
+    except (TypeError, ValueError, OverflowError):
         return None
 
     if abs_before_date is None:
@@ -65,26 +105,29 @@ def _parse_epoch_timestamp(epoch_value: Any) -> Optional[int]:
     return None
 
 
-def has_valid_unlock_date(claimable_balance: dict[str, Any], expected_unlock_timestamp: int) -> bool:
-    has_abs_before = False
-    for claimant in claimable_balance.get("claimants", []):
-        predicate_not = claimant.get("predicate", {}).get("not", {})
-        abs_before = predicate_not.get("abs_before")
-        if abs_before is None:
-            continue
-
-        has_abs_before = True
-        abs_before_timestamp = _parse_abs_before_timestamp(abs_before)
-        if abs_before_timestamp is None:
-            return False
-        abs_before_epoch = predicate_not.get("abs_before_epoch")
-        if abs_before_epoch is not None:
-            abs_before_epoch_timestamp = _parse_epoch_timestamp(abs_before_epoch)
-            if abs_before_epoch_timestamp is None:
-                return False
-            if abs(abs_before_timestamp - abs_before_epoch_timestamp) > UNLOCK_TIMESTAMP_TOLERANCE_SECONDS:
-                return False
-        if abs(abs_before_timestamp - expected_unlock_timestamp) > UNLOCK_TIMESTAMP_TOLERANCE_SECONDS:
-            return False
-
-    return has_abs_before
+def parse_unlock_timestamp(
+    predicate_not: dict[str, Any],
+    abs_before_memo: Optional[dict[str, Optional[int]]] = None,
+) -> Optional[int]:
+    """Return the unlock epoch of a ``not abs_before`` predicate, or None if it is malformed or its epoch disagrees."""
+    abs_before_timestamp = _parse_abs_before_timestamp(predicate_not.get("abs_before"), abs_before_memo)
+    if abs_before_timestamp is None:
+        return None
+    abs_before_epoch = predicate_not.get("abs_before_epoch")
+    if abs_before_epoch is not None:
+        abs_before_epoch_timestamp = _parse_epoch_timestamp(abs_before_epoch)
+        if abs_before_epoch_timestamp is None:
+            return None
+        if abs(abs_before_timestamp - abs_before_epoch_timestamp) > UNLOCK_TIMESTAMP_TOLERANCE_SECONDS:
+            return None
+    return abs_before_timestamp
+
+
+def has_valid_unlock_date(claimable_balance: 'ClaimableBalanceRecord', expected_unlock_timestamp: int) -> bool:
+    if not claimable_balance.unlock_timestamps:
+        return False
+    return all(
+        unlock_timestamp is not None
+        and abs(unlock_timestamp - expected_unlock_timestamp) <= UNLOCK_TIMESTAMP_TOLERANCE_SECONDS
+        for unlock_timestamp in claimable_balance.unlock_timestamps
+    )
@@ -0,0 +1,190 @@
+import logging
+import sys
+from datetime import timedelta
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from aqua_governance.governance.exceptions import ClaimableBalanceParsingError
+from aqua_governance.governance.models import IndexedClaimableBalance, Proposal, VoteIngestionCheckpoint
+from aqua_governance.governance.task_logic.balance_records import ClaimableBalanceRecord, decode_claimable_balance
+from aqua_governance.utils.concurrency import map_in_threads
+from aqua_governance.utils.requests import load_all_records
+
+
+logger = logging.getLogger()
+
+# ClaimableBalanceRecord fields stored in IndexedClaimableBalance columns of the same name, after the id.
+STORED_RECORD_FIELDS = ClaimableBalanceRecord._fields[1:]
+# Crawled balances are kept as ``(paging_token, record)``; only the token is needed beyond the record.
+CrawledBalance = tuple[str, ClaimableBalanceRecord]
+
+
+def load_claimant_balances(
+    proposal: Proposal,
+    claimant_request_factories: list[tuple[str, Callable[[], Any]]],
+    force_full_reconcile: bool = False,
+) -> list[Iterable[ClaimableBalanceRecord]]:
+    """Return every known claimable balance per ``(claimant, make_request_builder)``, in Horizon paging order.
+
+    SDK call builders are modified in place by ``limit`` and ``cursor``, so
+    every crawl starts from a new builder made by ``make_request_builder``.
+
+    Records are decoded as each Horizon page arrives and only their decoded
+    fields are stored, so no raw page outlives its crawl.  Stored records of an
+    incremental load are streamed from the database as they are consumed.
+
+    Routine loads of a proposal under voting only ask Horizon for balances
+    created or modified after the stored paging token and merge them into the
+    stored state.  Claimed or clawed-back balances disappear from Horizon
+    without leaving a trace after the cursor, so a full crawl is still done
+    when forced (freezing), once voting has ended (votes become claimable),
+    when the reconcile interval has passed, or when an incremental page
+    contains a service-sponsored balance (a melting replacement of an existing
+    vote).
+
+    With ``VOTE_INGESTION_CONCURRENT_FETCH`` the Horizon crawls of all claimants
+    run in parallel; checkpoint reads and writes always stay on the calling
+    thread.  Each checkpoint is stored in its own short transaction, so callers
+    do not need to hold one across the Horizon crawl.
+    """
+    if not settings.VOTE_INGESTION_CHECKPOINTS_ENABLED:
+        fetched = _fetch_all([(make_request_builder, None) for _, make_request_builder in claimant_request_factories])
+        return [[record for _, record in balances] for balances, _ in fetched]
+
+    now = timezone.now()
+    force_full_reconcile = force_full_reconcile or not _is_under_voting(proposal, now)
+    checkpoints = [
+        VoteIngestionCheckpoint.objects.get_or_create(proposal=proposal, claimant=claimant)[0]
+        for claimant, _ in claimant_request_factories
+    ]
+    start_cursors = [
+        None if force_full_reconcile or _is_full_reconcile_due(checkpoint, now) else checkpoint.paging_token
+        for checkpoint in checkpoints
+    ]
+    fetched = _fetch_all(
+        [
+            (make_request_builder, start_cursor)
+            for (_, make_request_builder), start_cursor in zip(claimant_request_factories, start_cursors)
+        ],
+    )
+
+    claimant_balances = []
+    for checkpoint, start_cursor, (balances, is_full_crawl) in zip(checkpoints, start_cursors, fetched):
+        if is_full_crawl:
+            if start_cursor is not None:
+                logger.info(
+                    "Proposal %s claimant %s: service-sponsored balances after cursor %s, ran full reconcile",
+                    proposal.id,
+                    checkpoint.claimant,
+                    start_cursor,
+                )
+            _store_full_crawl(checkpoint, balances, now)
+            claimant_balances.append([record for _, record in balances])
+            continue
+
+        if balances:
+            with transaction.atomic():
+                _store_records(checkpoint, balances)
+                checkpoint.paging_token = balances[-1][0]
+                checkpoint.save(update_fields=['paging_token', 'updated_at'])
+        logger.info(
+            "Proposal %s claimant %s: incremental load fetched %s balances",
+            proposal.id,
+            checkpoint.claimant,
+            len(balances),
+        )
+        claimant_balances.append(_load_stored_records(checkpoint))
+
+    return claimant_balances
+
+
+def _fetch_all(
+    fetch_requests: list[tuple[Callable[[], Any], Optional[str]]],
+) -> list[tuple[list[CrawledBalance], bool]]:
+    if not settings.VOTE_INGESTION_CONCURRENT_FETCH:
+        return [_fetch_claimant_records(request) for request in fetch_requests]
+    return map_in_threads(_fetch_claimant_records, fetch_requests, settings.VOTE_INGESTION_FETCH_WORKERS)
+
+
+def _fetch_claimant_records(request: tuple[Callable[[], Any], Optional[str]]) -> tuple[list[CrawledBalance], bool]:
+    """Load balances after the start cursor; returns ``(balances, is_full_crawl)``. Must not touch the database."""
+    make_request_builder, start_cursor = request
+    balances = _decode_records(load_all_records(make_request_builder(), start_cursor=start_cursor))
+    if start_cursor is None:
+        return balances, True
+    if any(not record.self_sponsored for _, record in balances):
+        return _decode_records(load_all_records(make_request_builder())), True
+    return balances, False
+
+
+def _decode_records(raw_records: Iterable[dict[str, Any]]) -> list[CrawledBalance]:
+    # load_all_records holds one page at a time; each raw record is dropped once decoded.
+    abs_before_memo: dict[str, Optional[int]] = {}
+    balances = []
+    for raw_record in raw_records:
+        try:
+            balances.append((raw_record['paging_token'], decode_claimable_balance(raw_record, abs_before_memo)))
+        except ClaimableBalanceParsingError:
+            logger.warning('Balance info skipped.', exc_info=sys.exc_info())
+    return balances
+
+
+def _is_under_voting(proposal: Proposal, now) -> bool:
+    return proposal.proposal_status == Proposal.VOTING and (proposal.end_at is None or proposal.end_at > now)
+
+
+def _is_full_reconcile_due(checkpoint: VoteIngestionCheckpoint, now) -> bool:
+    if checkpoint.last_full_reconcile_at is None:
+        return True
+    interval = timedelta(seconds=settings.VOTE_INGESTION_FULL_RECONCILE_SECONDS)
+    return checkpoint.last_full_reconcile_at + interval <= now
+
+
+@transaction.atomic
+def _store_full_crawl(checkpoint: VoteIngestionCheckpoint, balances: list[CrawledBalance], now) -> None:
+    # Horizon moves a modified balance to a new paging token, so rows whose id and
+    # token are both unchanged are left as they are; only the difference is written.
+    stored_tokens = dict(checkpoint.balances.values_list('claimable_balance_id', 'paging_token'))
+    crawled_ids = {record.id for _, record in balances}
+    removed_ids = [balance_id for balance_id in stored_tokens if balance_id not in crawled_ids]
+    if removed_ids:
+        checkpoint.balances.filter(claimable_balance_id__in=removed_ids).delete()
+    _store_records(
+        checkpoint,
+        [(paging_token, record) for paging_token, record in balances if stored_tokens.get(record.id) != paging_token],
+    )
+    checkpoint.paging_token = balances[-1][0] if balances else None
+    checkpoint.last_full_reconcile_at = now
+    checkpoint.save(update_fields=['paging_token', 'last_full_reconcile_at', 'updated_at'])
+
+
+def _store_records(checkpoint: VoteIngestionCheckpoint, balances: list[CrawledBalance]) -> None:
+    # A modified balance comes back after the cursor; re-inserting it keeps the
+    # stored order (by id) identical to the Horizon paging order of a full crawl.
+    balances_by_id = {record.id: (paging_token, record) for paging_token, record in balances}
+    if not balances_by_id:
+        return
+    checkpoint.balances.filter(claimable_balance_id__in=list(balances_by_id)).delete()
+    IndexedClaimableBalance.objects.bulk_create(
+        IndexedClaimableBalance(
+            checkpoint=checkpoint,
+            claimable_balance_id=record.id,
+            paging_token=paging_token,
+            **{field_name: getattr(record, field_name) for field_name in STORED_RECORD_FIELDS},
+        )
+        for paging_token, record in balances_by_id.values()
+    )
+
+
+def _load_stored_records(checkpoint: VoteIngestionCheckpoint) -> Iterator[ClaimableBalanceRecord]:
+    rows = checkpoint.balances.order_by('id').values_list('claimable_balance_id', *STORED_RECORD_FIELDS)
+    return map(_record_from_row, rows.iterator())
+
+
+def _record_from_row(row: tuple) -> ClaimableBalanceRecord:
+    record = ClaimableBalanceRecord._make(row)
+    # JSON columns come back as lists; records keep tuples.
+    return record._replace(abs_before=tuple(record.abs_before), unlock_timestamps=tuple(record.unlock_timestamps))
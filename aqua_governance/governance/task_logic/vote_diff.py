@@ -0,0 +1,125 @@
+import copy
+from decimal import Decimal
+from typing import Any, Optional
+
+from stellar_sdk import Server
+
+from aqua_governance.governance.models import LogVote, Proposal
+from aqua_governance.governance.task_logic.proposal_finalization import tally_votes
+from aqua_governance.governance.task_logic.vote_indexing import (
+    VoteSnapshotPlan,
+    changed_vote_fields,
+    plan_proposal_votes_snapshot,
+)
+
+
+NEW_VOTE_FIELDS = (
+    'claimable_balance_id',
+    'account_issuer',
+    'vote_choice',
+    'asset_code',
+    'amount',
+    'voted_amount',
+    'group_index',
+    'key',
+)
+
+
+def diff_proposal_votes_snapshot(
+    proposal: Proposal,
+    horizon_server: Server,
+    freezing_amount: bool = False,
+    force_full_reconcile: bool = False,
+    limit: Optional[int] = None,
+) -> dict[str, Any]:
+    """
+    Plan a snapshot of *proposal* and describe what applying it would change, without writing any vote.
+
+    Planning goes through the same checkpoints, lineage, creation metadata and
+    operations cache as a real run, so a dry run right after a snapshot costs
+    few Horizon requests.  ``LogVote`` rows and proposal results are untouched.
+    """
+    plan = plan_proposal_votes_snapshot(
+        proposal,
+        horizon_server,
+        freezing_amount=freezing_amount,
+        force_full_reconcile=force_full_reconcile,
+    )
+    return build_vote_snapshot_diff(proposal, plan, limit=limit)
+
+
+def build_vote_snapshot_diff(proposal: Proposal, plan: VoteSnapshotPlan, limit: Optional[int] = None) -> dict[str, Any]:
+    """
+    Compare *plan* with the current votes of *proposal*, the way ``apply_vote_snapshot_plan`` would apply it.
+
+    Lists of votes are cut to *limit* entries; the summary always counts all of them.
+    """
+    current_votes = {vote.id: vote for vote in proposal.logvote_set.filter(hide=False)}
+    visible_balance_ids = {vote.claimable_balance_id for vote in current_votes.values()}
+    new_votes = [vote for vote in plan.new_votes if vote.claimable_balance_id not in visible_balance_ids]
+
+    projected_votes = dict(current_votes)
+    updates = []
+    for vote in plan.updated_votes:
+        loaded_vote = current_votes.get(vote.id)
+        if loaded_vote is None:
+            continue
+        field_names = changed_vote_fields(loaded_vote, vote)
+        if not field_names:
+            continue
+        projected_votes[vote.id] = vote
+        updates.append({
+            'id': vote.id,
+            'changes': {
+                field_name: [_json_value(getattr(loaded_vote, field_name)), _json_value(getattr(vote, field_name))]
+                for field_name in field_names
+            },
+        })
+
+    stale_vote_ids = sorted(
+        vote_id
+        for vote_id, vote in current_votes.items()
+        if not vote.claimed
+        and plan.max_vote_id is not None
+        and vote_id <= plan.max_vote_id
+        and vote_id not in plan.processed_vote_ids
+    )
+    for vote_id in stale_vote_ids:
+        claimed_vote = copy.copy(projected_votes[vote_id])
+        claimed_vote.claimed = True
+        projected_votes[vote_id] = claimed_vote
+
+    current_tally = tally_votes(proposal, current_votes.values())
+    projected_tally = tally_votes(proposal, [*projected_votes.values(), *new_votes])
+
+    return {
+        'proposal_id': proposal.id,
+        'summary': {
+            'create': len(new_votes),
+            'update': len(updates),
+            'mark_claimed': len(stale_vote_ids),
+            'unchanged': plan.unchanged_count,
+        },
+        'create': [
+            {field_name: _json_value(getattr(vote, field_name)) for field_name in NEW_VOTE_FIELDS}
+            for vote in new_votes[:limit]
+        ],
+        'update': updates[:limit],
+        'mark_claimed': stale_vote_ids[:limit],
+        'tallies': {
+            vote_choice: {
+                'current': str(current_tally[vote_choice]),
+                'projected': str(projected_tally[vote_choice]),
+                'delta': str(projected_tally[vote_choice] - current_tally[vote_choice]),
+            }
+            for vote_choice, _ in LogVote.VOTE_TYPES
+        },
+        'horizon_requests': dict(sorted(plan.metrics.horizon_requests.items())),
+        'phase_seconds': {phase: round(seconds, 4) for phase, seconds in plan.metrics.phase_seconds.items()},
+    }
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
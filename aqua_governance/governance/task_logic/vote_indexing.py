@@ -1,24 +1,45 @@
 import logging
+import pickle
 import sys
-from decimal import Decimal
-from typing import Any, Optional
+import tempfile
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Iterator, Optional
 
-from dateutil.parser import parse as date_parse
 from django.conf import settings
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
 from stellar_sdk import Server
-from stellar_sdk.exceptions import NotFoundError
 
+from aqua_governance.governance.balance_metadata import (
+    BALANCE_NOT_FOUND,
+    CreationMetadata,
+    load_creation_metadata,
+)
+from aqua_governance.governance.claimable_lineage import BufferedLineageStore
 from aqua_governance.governance.claimable_trace import find_origin_claimable_balance_id
 from aqua_governance.governance.exceptions import ClaimableBalanceParsingError, GenerateGrouKeyException
+from aqua_governance.governance.indexing_metrics import (
+    PHASE_APPLY,
+    PHASE_FETCH,
+    PHASE_METADATA,
+    PHASE_RECONCILE,
+    PHASE_TRACE,
+    CountingHorizonServer,
+    IndexingRunMetrics,
+    record_indexing_run,
+)
 from aqua_governance.governance.models import LogVote, Proposal
+from aqua_governance.governance.operations_cache import count_run_stats, get_operations_cache
 from aqua_governance.governance.parser import generate_vote_key, parse_vote
-from aqua_governance.governance.task_logic.unlock_rules import (
-    extract_abs_before_values,
-    get_expected_unlock_timestamp,
-    has_valid_unlock_date,
-)
-from aqua_governance.utils.requests import load_all_records
+from aqua_governance.governance.task_logic.balance_records import ClaimableBalanceRecord, decode_claimable_balance
+from aqua_governance.governance.task_logic.reindex_schedule import record_snapshot_activity
+from aqua_governance.governance.task_logic.unlock_rules import get_expected_unlock_timestamp, has_valid_unlock_date
+from aqua_governance.governance.task_logic.vote_checkpoints import load_claimant_balances
+from aqua_governance.utils.concurrency import map_in_threads
+from aqua_governance.utils.horizon import get_horizon_server
 
 
 logger = logging.getLogger()
@@ -28,104 +49,545 @@ GROUP_UPDATE_MELTING = "melting"
 GROUP_UPDATE_UNCHANGED = "unchanged"
 GROUP_UPDATE_AMBIGUOUS = "ambiguous"
 
+VOTE_UPDATE_FIELDS = [
+    "group_index",
+    "claimable_balance_id",
+    "amount",
+    "voted_amount",
+    "transaction_link",
+    "claimed",
+    "key_digest",
+]
+
+
+class VoteChangeSpool:
+    """
+    Batches of planned ``(new_votes, updated_votes)`` pickled to a temporary file.
+
+    A streamed snapshot spools every reconciled batch, so the plan holds at
+    most one batch of changed votes while the rest of the proposal is planned;
+    ``apply_vote_snapshot_plan`` reads them back inside its single transaction.
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+        self.batch_count = 0
+
+    def write(self, new_votes: list[LogVote], updated_votes: list[LogVote]) -> None:
+        pickle.dump((new_votes, updated_votes), self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.batch_count += 1
+
+    def read(self) -> Iterator[tuple[list[LogVote], list[LogVote]]]:
+        self._file.seek(0)
+        for _ in range(self.batch_count):
+            yield pickle.load(self._file)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+@dataclass
+class VoteSnapshotPlan:
+    """
+    Changes computed by ``plan_proposal_votes_snapshot`` for one proposal.
+
+    Stale votes are not listed: every visible, unclaimed vote up to
+    ``max_vote_id`` that is not in ``processed_vote_ids`` is stale, and is
+    marked claimed set-based at apply time.
+
+    Changes moved to ``spool`` by ``spool_changes`` are no longer in
+    ``new_votes`` and ``updated_votes``; ``iter_changes`` yields both.
+    """
+
+    proposal_id: int
+    new_votes: list[LogVote] = field(default_factory=list)
+    updated_votes: list[LogVote] = field(default_factory=list)
+    processed_vote_ids: set[int] = field(default_factory=set)
+    max_vote_id: Optional[int] = None
+    unchanged_count: int = 0
+    metrics: IndexingRunMetrics = field(default_factory=IndexingRunMetrics)
+    spool: Optional[VoteChangeSpool] = None
+
+    def spool_changes(self) -> None:
+        """Move the planned new and updated votes to ``spool``."""
+        if not self.new_votes and not self.updated_votes:
+            return
+        if self.spool is None:
+            self.spool = VoteChangeSpool()
+        self.spool.write(self.new_votes, self.updated_votes)
+        self.new_votes = []
+        self.updated_votes = []
+
+    def iter_changes(self) -> Iterator[tuple[list[LogVote], list[LogVote]]]:
+        """Yield ``(new_votes, updated_votes)`` per spooled batch, then the ones still held."""
+        if self.spool is not None:
+            yield from self.spool.read()
+        yield self.new_votes, self.updated_votes
+
 
 def update_proposal_votes_snapshot(
     proposal: Proposal,
     horizon_server: Server,
     freezing_amount: bool = False,
-) -> None:
-    with transaction.atomic():
-        expected_unlock_timestamp = get_expected_unlock_timestamp(proposal)
-        request_builders = _build_request_builders(proposal, horizon_server)
-
-        all_votes = proposal.logvote_set.filter(hide=False)
-        raw_vote_groups = _build_raw_vote_groups(
-            proposal=proposal,
-            request_builders=request_builders,
-            expected_unlock_timestamp=expected_unlock_timestamp,
+    prefetched_balances: Optional[dict[str, list[dict[str, Any]]]] = None,
+) -> dict[str, Any]:
+    """
+    Plan the snapshot from Horizon outside of any transaction, then apply it in one short transaction.
+
+    Streamed plans spool their changes to disk batch by batch (see
+    ``VoteChangeSpool``); they are still applied in the one transaction, so
+    tallies never show part of a snapshot.
+
+    Every call is recorded as an ``IndexingRun``, failed ones included, and
+    successful ones update the proposal's re-index schedule.
+    """
+    metrics = IndexingRunMetrics()
+    started_at = timezone.now()
+    try:
+        plan = plan_proposal_votes_snapshot(
+            proposal,
+            horizon_server,
+            freezing_amount,
+            metrics=metrics,
+            prefetched_balances=prefetched_balances,
+            spool_changes=True,
         )
-        new_log_vote: list[LogVote] = []
-        update_log_vote: list[LogVote] = []
-        processed_vote_ids: set[int] = set()
-        origin_cache: dict[str, Optional[str]] = {}
-
-        logger.info("Proposal %s has %s vote groups", proposal.id, len(raw_vote_groups))
-
-        for vote_key, raw_vote_group in raw_vote_groups.items():
-            votes = list(all_votes.filter(key=vote_key))
-            group_update_type = classify_vote_group_update(votes, raw_vote_group)
-            logger.info(
-                "Proposal %s vote_key %s classified as %s (active_votes=%s, current_group_size=%s)",
-                proposal.id,
-                vote_key,
-                group_update_type,
-                len(votes),
-                len(raw_vote_group),
+        with metrics.phase(PHASE_APPLY):
+            stats = apply_vote_snapshot_plan(plan)
+    except Exception as error:
+        record_indexing_run(proposal, metrics, started_at, freezing_amount, error=error)
+        raise
+    record_indexing_run(proposal, metrics, started_at, freezing_amount, stats=stats)
+    record_snapshot_activity(proposal, stats)
+    return stats
+
+
+def plan_proposal_votes_snapshot(
+    proposal: Proposal,
+    horizon_server: Server,
+    freezing_amount: bool = False,
+    force_full_reconcile: bool = False,
+    metrics: Optional[IndexingRunMetrics] = None,
+    prefetched_balances: Optional[dict[str, list[dict[str, Any]]]] = None,
+    spool_changes: bool = False,
+) -> VoteSnapshotPlan:
+    """
+    Fetch the current claimable balances of *proposal* and compute the vote changes.
+
+    Matched votes whose fields are identical to the loaded rows are left out of
+    ``updated_votes`` and only counted, so a steady-state run writes nothing.
+
+    All Horizon traffic (balance pages, origin traces, creation metadata) happens
+    here.  Nothing is written to ``LogVote``; only the immutable caches
+    (checkpoints, lineage, creation metadata) are persisted along the way.
+
+    Phase timings, Horizon requests and cache counters go to *metrics*, also
+    available as ``plan.metrics``.
+
+    *prefetched_balances* maps claimant accounts to raw claimable balance
+    records already crawled by the caller (see ``task_logic.asset_sweep``); the
+    claimable balances endpoint is then not queried at all.
+
+    With ``VOTE_SNAPSHOT_STREAMING`` and *spool_changes*, the changes of every
+    batch of vote groups are moved to ``plan.spool``; read them with
+    ``plan.iter_changes()``.  Otherwise the returned plan holds every change.
+    """
+    metrics = metrics if metrics is not None else IndexingRunMetrics()
+    horizon_server = CountingHorizonServer(horizon_server, metrics)
+    expected_unlock_timestamp = get_expected_unlock_timestamp(proposal)
+    request_factories = _build_request_factories(proposal, horizon_server)
+    plan = VoteSnapshotPlan(proposal_id=proposal.id, metrics=metrics)
+
+    with count_run_stats() as run_cache_stats:
+        if settings.VOTE_SNAPSHOT_STREAMING:
+            _plan_vote_groups_streaming(
+                plan=plan,
+                proposal=proposal,
+                request_factories=request_factories,
+                expected_unlock_timestamp=expected_unlock_timestamp,
+                force_full_reconcile=freezing_amount or force_full_reconcile,
+                freezing_amount=freezing_amount,
+                horizon_server=horizon_server,
+                prefetched_balances=prefetched_balances,
+                spool_changes=spool_changes,
             )
-            group_new_votes, group_updated_votes, group_processed_vote_ids = reconcile_vote_group(
-                vote_key=vote_key,
-                raw_vote_group=raw_vote_group,
-                existing_votes=votes,
-                all_votes=all_votes,
+        else:
+            with metrics.phase(PHASE_FETCH):
+                all_votes = list(proposal.logvote_set.filter(hide=False).order_by('id'))
+                plan.max_vote_id = max((vote.id for vote in all_votes), default=None)
+                raw_vote_groups = _build_raw_vote_groups(
+                    proposal=proposal,
+                    request_factories=request_factories,
+                    expected_unlock_timestamp=expected_unlock_timestamp,
+                    force_full_reconcile=freezing_amount or force_full_reconcile,
+                    prefetched_balances=prefetched_balances,
+                )
+            logger.info("Proposal %s has %s vote groups", proposal.id, len(raw_vote_groups))
+            votes_by_key, votes_by_balance_id = _build_vote_index(all_votes)
+            _plan_vote_groups(
+                plan=plan,
                 proposal=proposal,
+                raw_vote_groups=raw_vote_groups,
+                votes_by_key=votes_by_key,
+                votes_by_balance_id=votes_by_balance_id,
+                loaded_votes_by_id={vote.id: vote for vote in all_votes},
                 freezing_amount=freezing_amount,
                 horizon_server=horizon_server,
-                origin_cache=origin_cache,
             )
-            new_log_vote.extend(group_new_votes)
-            update_log_vote.extend(group_updated_votes)
-            processed_vote_ids.update(group_processed_vote_ids)
 
-        stale_vote_ids = [
-            vote.id for vote in all_votes
-            if vote.id is not None and vote.id not in processed_vote_ids and not vote.claimed
-        ]
-        if stale_vote_ids:
-            LogVote.objects.filter(id__in=stale_vote_ids).update(claimed=True)
+    operations_cache_stats = run_cache_stats.as_dict()
+    for kind, counters in operations_cache_stats.items():
+        metrics.add_cache_stats(kind, **counters)
+    logger.info("Proposal %s origin trace operations cache: %s", proposal.id, operations_cache_stats)
+    return plan
 
-        LogVote.objects.bulk_create(new_log_vote)
-        LogVote.objects.bulk_update(
-            update_log_vote,
-            ["group_index", "claimable_balance_id", "amount", "voted_amount", "transaction_link", "claimed"],
+
+def _plan_vote_groups_streaming(
+    plan: VoteSnapshotPlan,
+    proposal: Proposal,
+    request_factories,
+    expected_unlock_timestamp: int,
+    force_full_reconcile: bool,
+    freezing_amount: bool,
+    horizon_server: Server,
+    prefetched_balances: Optional[dict[str, list[dict[str, Any]]]] = None,
+    spool_changes: bool = False,
+) -> None:
+    """
+    Plan the snapshot one claimant at a time, reconciling its vote groups in batches of
+    ``VOTE_SNAPSHOT_GROUP_BATCH_SIZE``.
+
+    A vote key contains the vote choice, so a group never spans claimants, but
+    its balances can be spread over any page of the claimant's crawl: a group
+    is complete once that crawl ends.  Each Horizon page is decoded and
+    bucketed by vote key as it arrives (stored checkpoint rows are streamed
+    the same way), so what is held per claimant is its decoded
+    ``ClaimableBalanceRecord``s and its loaded votes, never the raw pages.
+    The batch size bounds the traced and reconciled work in flight: each batch
+    gets its own origin and metadata caches, unchanged votes are dropped as
+    soon as their batch is reconciled, and with *spool_changes* the changed
+    votes go to ``plan.spool``.  ``processed_vote_ids`` grows with the proposal.
+    """
+    metrics = plan.metrics
+    with metrics.phase(PHASE_FETCH):
+        plan.max_vote_id = proposal.logvote_set.filter(hide=False).aggregate(max_id=Max('id'))['max_id']
+
+    batch_size = settings.VOTE_SNAPSHOT_GROUP_BATCH_SIZE
+    group_count = 0
+    for make_request_builder, vote_choice, claimant in request_factories:
+        with metrics.phase(PHASE_FETCH):
+            claimant_votes = []
+            if plan.max_vote_id is not None:
+                # Votes created after max_vote_id are left to the next run, like stale marking does.
+                claimant_votes = list(
+                    proposal.logvote_set.filter(
+                        hide=False,
+                        vote_choice=vote_choice,
+                        id__lte=plan.max_vote_id,
+                    ).order_by('id'),
+                )
+            raw_vote_groups = _build_raw_vote_groups(
+                proposal=proposal,
+                request_factories=((make_request_builder, vote_choice, claimant),),
+                expected_unlock_timestamp=expected_unlock_timestamp,
+                force_full_reconcile=force_full_reconcile,
+                prefetched_balances=prefetched_balances,
+            )
+        group_count += len(raw_vote_groups)
+        votes_by_key, votes_by_balance_id = _build_vote_index(claimant_votes)
+        loaded_votes_by_id = {vote.id: vote for vote in claimant_votes}
+
+        vote_keys = list(raw_vote_groups)
+        for offset in range(0, len(vote_keys), batch_size):
+            batch = {vote_key: raw_vote_groups.pop(vote_key) for vote_key in vote_keys[offset:offset + batch_size]}
+            _plan_vote_groups(
+                plan=plan,
+                proposal=proposal,
+                raw_vote_groups=batch,
+                votes_by_key=votes_by_key,
+                votes_by_balance_id=votes_by_balance_id,
+                loaded_votes_by_id=loaded_votes_by_id,
+                freezing_amount=freezing_amount,
+                horizon_server=horizon_server,
+            )
+            if spool_changes:
+                plan.spool_changes()
+    logger.info("Proposal %s has %s vote groups (streamed)", proposal.id, group_count)
+
+
+def _plan_vote_groups(
+    plan: VoteSnapshotPlan,
+    proposal: Proposal,
+    raw_vote_groups: dict[str, list[tuple[str, ClaimableBalanceRecord]]],
+    votes_by_key: dict[str, list[LogVote]],
+    votes_by_balance_id: dict[str, LogVote],
+    loaded_votes_by_id: dict[int, LogVote],
+    freezing_amount: bool,
+    horizon_server: Server,
+) -> None:
+    """Trace, load creation metadata for and reconcile *raw_vote_groups*, adding their changes to *plan*."""
+    metrics = plan.metrics
+    origin_cache: dict[str, Optional[str]] = {}
+    metadata_cache: dict[str, CreationMetadata] = {}
+
+    with metrics.phase(PHASE_TRACE):
+        _prefetch_origin_balance_ids(
+            horizon_server=horizon_server,
+            raw_vote_groups=raw_vote_groups,
+            votes_by_key=votes_by_key,
+            origin_cache=origin_cache,
         )
+    with metrics.phase(PHASE_METADATA):
+        metadata_stats = _prefetch_creation_metadata(
+            horizon_server=horizon_server,
+            raw_vote_groups=raw_vote_groups,
+            votes_by_balance_id=votes_by_balance_id,
+            origin_cache=origin_cache,
+            metadata_cache=metadata_cache,
+        )
+    metrics.add_cache_stats('creation_metadata', **metadata_stats)
 
+    with metrics.phase(PHASE_RECONCILE):
+        _reconcile_vote_groups(
+            plan=plan,
+            proposal=proposal,
+            raw_vote_groups=raw_vote_groups,
+            votes_by_key=votes_by_key,
+            votes_by_balance_id=votes_by_balance_id,
+            loaded_votes_by_id=loaded_votes_by_id,
+            freezing_amount=freezing_amount,
+            horizon_server=horizon_server,
+            origin_cache=origin_cache,
+            metadata_cache=metadata_cache,
+        )
+
+
+def _reconcile_vote_groups(
+    plan: VoteSnapshotPlan,
+    proposal: Proposal,
+    raw_vote_groups: dict[str, list[tuple[str, ClaimableBalanceRecord]]],
+    votes_by_key: dict[str, list[LogVote]],
+    votes_by_balance_id: dict[str, LogVote],
+    loaded_votes_by_id: dict[int, LogVote],
+    freezing_amount: bool,
+    horizon_server: Server,
+    origin_cache: dict[str, Optional[str]],
+    metadata_cache: dict[str, CreationMetadata],
+) -> None:
+    updated_votes = []
+    for vote_key, raw_vote_group in raw_vote_groups.items():
+        votes = votes_by_key.get(vote_key, [])
+        group_update_type = classify_vote_group_update(votes, raw_vote_group)
+        plan.metrics.group_counts[group_update_type] += 1
+        logger.info(
+            "Proposal %s vote_key %s classified as %s (active_votes=%s, current_group_size=%s)",
+            proposal.id,
+            vote_key,
+            group_update_type,
+            len(votes),
+            len(raw_vote_group),
+        )
+        group_new_votes, group_updated_votes, group_processed_vote_ids = reconcile_vote_group(
+            vote_key=vote_key,
+            raw_vote_group=raw_vote_group,
+            existing_votes=votes,
+            votes_by_balance_id=votes_by_balance_id,
+            proposal=proposal,
+            freezing_amount=freezing_amount,
+            horizon_server=horizon_server,
+            origin_cache=origin_cache,
+            metadata_cache=metadata_cache,
+        )
+        plan.new_votes.extend(group_new_votes)
+        updated_votes.extend(group_updated_votes)
+        plan.processed_vote_ids.update(group_processed_vote_ids)
 
-def _build_request_builders(proposal: Proposal, horizon_server: Server):
-    request_builders = (
-        (
-            horizon_server.claimable_balances().for_claimant(proposal.vote_for_issuer).order(desc=False),
-            LogVote.VOTE_FOR,
-        ),
-        (
-            horizon_server.claimable_balances().for_claimant(proposal.vote_against_issuer).order(desc=False),
-            LogVote.VOTE_AGAINST,
-        ),
+    changed_votes = [
+        vote for vote in updated_votes
+        if _has_vote_changes(loaded_votes_by_id.get(vote.id), vote)
+    ]
+    plan.unchanged_count += len(updated_votes) - len(changed_votes)
+    plan.updated_votes.extend(changed_votes)
+
+
+def apply_vote_snapshot_plan(plan: VoteSnapshotPlan) -> dict[str, Any]:
+    """
+    Write *plan* in a single transaction and return the applied counts and the transaction duration.
+
+    The plan was computed without holding a transaction, so it is re-validated
+    against the current rows first: updates of votes that were deleted or hidden
+    in the meantime are dropped, stale marking only touches rows that are still
+    visible and unclaimed, and new votes whose balance was indexed by a
+    concurrent run are skipped.  Spooled changes are read back one batch at a
+    time inside the same transaction.
+    """
+    started_at = time.monotonic()
+    created_count = updated_count = planned_count = 0
+    try:
+        with transaction.atomic():
+            stale_count = _mark_unprocessed_votes_claimed(plan)
+            for planned_new_votes, planned_updated_votes in plan.iter_changes():
+                planned_count += len(planned_new_votes) + len(planned_updated_votes)
+                new_votes, updated_votes = _revalidate_vote_changes(planned_new_votes, planned_updated_votes)
+                LogVote.objects.bulk_create(new_votes)
+                LogVote.objects.bulk_update(updated_votes, VOTE_UPDATE_FIELDS)
+                created_count += len(new_votes)
+                updated_count += len(updated_votes)
+    finally:
+        if plan.spool is not None:
+            plan.spool.close()
+    transaction_seconds = time.monotonic() - started_at
+
+    stats = {
+        'created': created_count,
+        'updated': updated_count,
+        'unchanged': plan.unchanged_count,
+        'stale': stale_count,
+        'transaction_seconds': transaction_seconds,
+    }
+    skipped = planned_count - created_count - updated_count
+    if skipped:
+        logger.warning(
+            "Proposal %s snapshot apply skipped %s changes invalidated since planning",
+            plan.proposal_id,
+            skipped,
+        )
+    logger.info("Proposal %s snapshot applied: %s", plan.proposal_id, stats)
+    return stats
+
+
+def _revalidate_vote_changes(
+    new_votes: list[LogVote],
+    updated_votes: list[LogVote],
+) -> tuple[list[LogVote], list[LogVote]]:
+    visible_vote_ids = set(
+        LogVote.objects.filter(
+            id__in=[vote.id for vote in updated_votes],
+            hide=False,
+        ).values_list('id', flat=True),
     )
-    if proposal.abstain_issuer:
-        request_builders = request_builders + (
-            (
-                horizon_server.claimable_balances().for_claimant(proposal.abstain_issuer).order(desc=False),
-                LogVote.VOTE_ABSTAIN,
-            ),
+    indexed_balance_ids = set(
+        LogVote.objects.filter(
+            claimable_balance_id__in=[vote.claimable_balance_id for vote in new_votes],
+            hide=False,
+        ).values_list('claimable_balance_id', flat=True),
+    )
+    return (
+        [vote for vote in new_votes if vote.claimable_balance_id not in indexed_balance_ids],
+        [vote for vote in updated_votes if vote.id in visible_vote_ids],
+    )
+
+
+def _mark_unprocessed_votes_claimed(plan: VoteSnapshotPlan) -> int:
+    """
+    Mark every visible, unclaimed vote loaded for *plan* but not processed by it as claimed.
+
+    The processed ids are staged in a temporary table in chunks and joined in a
+    single UPDATE, so neither memory nor statement size grows with the number
+    of votes of the proposal.  Votes created after planning are above
+    ``max_vote_id`` and left alone.
+    """
+    if plan.max_vote_id is None:
+        return 0
+
+    log_vote_table = connection.ops.quote_name(LogVote._meta.db_table)
+    processed_vote_ids = sorted(plan.processed_vote_ids)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TEMPORARY TABLE IF NOT EXISTS snapshot_processed_vote_ids "
+            "(id bigint PRIMARY KEY) ON COMMIT DROP",
+        )
+        cursor.execute("DELETE FROM snapshot_processed_vote_ids")
+        for offset in range(0, len(processed_vote_ids), settings.VOTE_SNAPSHOT_STAGING_CHUNK_SIZE):
+            cursor.execute(
+                "INSERT INTO snapshot_processed_vote_ids (id) SELECT unnest(%s::bigint[])",
+                [processed_vote_ids[offset:offset + settings.VOTE_SNAPSHOT_STAGING_CHUNK_SIZE]],
+            )
+        cursor.execute(
+            f"UPDATE {log_vote_table} AS vote SET claimed = true "
+            "WHERE vote.proposal_id = %s AND vote.hide = false AND vote.claimed = false AND vote.id <= %s "
+            "AND NOT EXISTS (SELECT 1 FROM snapshot_processed_vote_ids processed WHERE processed.id = vote.id)",
+            [plan.proposal_id, plan.max_vote_id],
         )
-    return request_builders
+        return cursor.rowcount
+
+
+def _has_vote_changes(loaded_vote: Optional[LogVote], updated_vote: LogVote) -> bool:
+    if loaded_vote is None:
+        return True
+    return bool(changed_vote_fields(loaded_vote, updated_vote))
+
+
+def changed_vote_fields(loaded_vote: LogVote, updated_vote: LogVote) -> list[str]:
+    """Return the ``VOTE_UPDATE_FIELDS`` whose values differ between the two votes."""
+    changed_fields = []
+    for field_name in VOTE_UPDATE_FIELDS:
+        model_field = LogVote._meta.get_field(field_name)
+        loaded_value = model_field.to_python(getattr(loaded_vote, field_name))
+        if loaded_value != model_field.to_python(getattr(updated_vote, field_name)):
+            changed_fields.append(field_name)
+    return changed_fields
+
+
+def _build_vote_index(votes: list[LogVote]) -> tuple[dict[str, list[LogVote]], dict[str, LogVote]]:
+    votes_by_key: dict[str, list[LogVote]] = {}
+    votes_by_balance_id: dict[str, LogVote] = {}
+    for vote in votes:
+        votes_by_key.setdefault(vote.key, []).append(vote)
+        if vote.claimable_balance_id is not None:
+            votes_by_balance_id[vote.claimable_balance_id] = vote
+    return votes_by_key, votes_by_balance_id
+
+
+def _build_request_factories(proposal: Proposal, horizon_server: Server):
+    """Return ``(make_request_builder, vote_choice, claimant)`` per claimant of *proposal*."""
+    claimants = (
+        (proposal.vote_for_issuer, LogVote.VOTE_FOR),
+        (proposal.vote_against_issuer, LogVote.VOTE_AGAINST),
+    )
+    if proposal.abstain_issuer:
+        claimants = claimants + ((proposal.abstain_issuer, LogVote.VOTE_ABSTAIN),)
+    return tuple(
+        (partial(_make_claimant_request_builder, horizon_server, claimant), vote_choice, claimant)
+        for claimant, vote_choice in claimants
+    )
+
+
+def _make_claimant_request_builder(horizon_server: Server, claimant: str):
+    return horizon_server.claimable_balances().for_claimant(claimant).order(desc=False)
 
 
 def _build_raw_vote_groups(
     proposal: Proposal,
-    request_builders,
+    request_factories,
     expected_unlock_timestamp: int,
-) -> dict[str, list[tuple[str, dict[str, Any]]]]:
-    raw_vote_groups: dict[str, list[tuple[str, dict[str, Any]]]] = {}
-
-    for request_builder, vote_choice in request_builders:
-        for claimable_balance in load_all_records(request_builder):
+    force_full_reconcile: bool = False,
+    prefetched_balances: Optional[dict[str, list[dict[str, Any]]]] = None,
+) -> dict[str, list[tuple[str, ClaimableBalanceRecord]]]:
+    raw_vote_groups: dict[str, list[tuple[str, ClaimableBalanceRecord]]] = {}
+
+    if prefetched_balances is not None:
+        claimant_balances = [prefetched_balances.get(claimant, []) for _, _, claimant in request_factories]
+    else:
+        claimant_balances = load_claimant_balances(
+            proposal=proposal,
+            claimant_request_factories=[
+                (claimant, make_request_builder) for make_request_builder, _, claimant in request_factories
+            ],
+            force_full_reconcile=force_full_reconcile,
+        )
+    for index, (_, vote_choice, _) in enumerate(request_factories):
+        # Drop each claimant's balances as soon as they are grouped.
+        claimable_balances, claimant_balances[index] = claimant_balances[index], None
+        if prefetched_balances is not None:
+            claimable_balances = _decode_claimable_balances(claimable_balances)
+        for claimable_balance in claimable_balances:
             if not has_valid_unlock_date(claimable_balance, expected_unlock_timestamp):
                 logger.info(
                     "Skip claimable claimable_balance %s for proposal %s due to invalid abs_before values: %s",
-                    claimable_balance.get("id"),
+                    claimable_balance.id,
                     proposal.id,
-                    extract_abs_before_values(claimable_balance),
+                    list(claimable_balance.abs_before),
                 )
                 continue
             try:
@@ -137,29 +599,26 @@ def _build_raw_vote_groups(
     return raw_vote_groups
 
 
-def _is_self_sponsored_claimable_balance(claimable_balance: dict[str, Any]) -> bool:
-    sponsor = claimable_balance.get("sponsor")
-    if not sponsor:
-        return False
-
-    for claimant in claimable_balance.get("claimants", []):
-        if claimant.get("destination") == sponsor:
-            return True
-
-    return False
+def _decode_claimable_balances(raw_claimable_balances: list[dict[str, Any]]) -> Iterator[ClaimableBalanceRecord]:
+    abs_before_memo: dict[str, Optional[int]] = {}
+    for raw_claimable_balance in raw_claimable_balances:
+        try:
+            yield decode_claimable_balance(raw_claimable_balance, abs_before_memo)
+        except ClaimableBalanceParsingError:
+            logger.warning('Balance info skipped.', exc_info=sys.exc_info())
 
 
 def classify_vote_group_update(
     existing_votes: list[LogVote],
-    raw_vote_group: list[tuple[str, dict[str, Any]]],
+    raw_vote_group: list[tuple[str, ClaimableBalanceRecord]],
 ) -> str:
     existing_balance_ids = {
         vote.claimable_balance_id for vote in existing_votes if vote.claimable_balance_id
     }
     raw_votes_by_id = {
-        claimable_balance.get("id"): claimable_balance
+        claimable_balance.id: claimable_balance
         for _, claimable_balance in raw_vote_group
-        if claimable_balance.get("id")
+        if claimable_balance.id
     }
     current_balance_ids = set(raw_votes_by_id.keys())
     new_balance_ids = current_balance_ids - existing_balance_ids
@@ -171,10 +630,10 @@ def classify_vote_group_update(
         return GROUP_UPDATE_UNCHANGED
 
     has_self_sponsored_new_vote = any(
-        _is_self_sponsored_claimable_balance(raw_votes_by_id[balance_id]) for balance_id in new_balance_ids
+        raw_votes_by_id[balance_id].self_sponsored for balance_id in new_balance_ids
     )
     has_only_service_sponsored_new_balances = bool(new_balance_ids) and all(
-        not _is_self_sponsored_claimable_balance(raw_votes_by_id[balance_id]) for balance_id in new_balance_ids
+        not raw_votes_by_id[balance_id].self_sponsored for balance_id in new_balance_ids
     )
 
     if len(raw_vote_group) > len(existing_votes) and has_self_sponsored_new_vote:
@@ -188,18 +647,19 @@ def classify_vote_group_update(
 
 def reconcile_vote_group(
     vote_key: str,
-    raw_vote_group: list[tuple[str, dict[str, Any]]],
+    raw_vote_group: list[tuple[str, ClaimableBalanceRecord]],
     existing_votes: list[LogVote],
-    all_votes,
+    votes_by_balance_id: dict[str, LogVote],
     proposal: Proposal,
     freezing_amount: bool,
     horizon_server: Optional[Server] = None,
     origin_cache: Optional[dict[str, Optional[str]]] = None,
+    metadata_cache: Optional[dict[str, CreationMetadata]] = None,
 ) -> tuple[list[LogVote], list[LogVote], set[int]]:
     new_log_vote: list[LogVote] = []
     update_log_vote: list[LogVote] = []
     processed_vote_ids: set[int] = set()
-    sorted_raw_vote_group = sorted(raw_vote_group, key=lambda item: Decimal(item[1]['amount']), reverse=True)
+    sorted_raw_vote_group = sorted(raw_vote_group, key=lambda item: item[1].amount, reverse=True)
     if origin_cache is None:
         origin_cache = {}
 
@@ -210,8 +670,8 @@ def reconcile_vote_group(
                 "index": raw_index,
                 "vote_choice": vote_choice,
                 "vote": raw_vote,
-                "balance_id": raw_vote.get("id"),
-                "self_sponsored": _is_self_sponsored_claimable_balance(raw_vote),
+                "balance_id": raw_vote.id,
+                "self_sponsored": raw_vote.self_sponsored,
             }
         )
 
@@ -308,6 +768,20 @@ def reconcile_vote_group(
         _mark_votes_as_processed(existing_votes, processed_vote_ids)
         return new_log_vote, update_log_vote, processed_vote_ids
 
+    if horizon_server is not None:
+        _resolve_origin_balance_ids(
+            horizon_server=horizon_server,
+            balance_ids=[raw_item["balance_id"] for raw_item in remaining_raw if not raw_item["self_sponsored"]],
+            origin_cache=origin_cache,
+        )
+        if metadata_cache is None:
+            metadata_cache = {}
+        load_creation_metadata(
+            horizon_server,
+            [_metadata_balance_id(raw_item, origin_cache) for raw_item in remaining_raw],
+            metadata_cache,
+        )
+
     for raw_item in remaining_raw:
         try:
             new_vote = _make_new_vote(
@@ -320,12 +794,13 @@ def reconcile_vote_group(
                 horizon_server=horizon_server,
                 origin_cache=origin_cache,
                 restore_from_origin=not raw_item["self_sponsored"],
+                metadata_cache=metadata_cache,
             )
             if new_vote is None:
                 logger.warning("Error create vote for %s, %s", vote_key, raw_item["index"])
                 continue
 
-            old_vote = all_votes.filter(claimable_balance_id=new_vote.claimable_balance_id).first()
+            old_vote = votes_by_balance_id.get(new_vote.claimable_balance_id)
             if old_vote is not None:
                 update_vote = _make_updated_vote(old_vote, raw_item["index"], raw_item["vote"], freezing_amount)
                 if update_vote and update_vote.id is not None:
@@ -342,6 +817,70 @@ def reconcile_vote_group(
     return new_log_vote, update_log_vote, processed_vote_ids
 
 
+def _prefetch_origin_balance_ids(
+    horizon_server: Server,
+    raw_vote_groups: dict[str, list[tuple[str, ClaimableBalanceRecord]]],
+    votes_by_key: dict[str, list[LogVote]],
+    origin_cache: dict[str, Optional[str]],
+) -> None:
+    """Resolve, in one concurrent batch, the origins that group reconciliation will ask for.
+
+    Only groups with service-sponsored balances unknown to the index need
+    origin matching; after a melting event that is most groups, one or two
+    balances each, so batching across groups is what makes concurrency pay off.
+    """
+    balance_ids: list[Optional[str]] = []
+    for vote_key, raw_vote_group in raw_vote_groups.items():
+        existing_balance_ids = {vote.claimable_balance_id for vote in votes_by_key.get(vote_key, [])}
+        raw_balance_ids = {claimable_balance.id for _, claimable_balance in raw_vote_group}
+        unmatched_service_balance_ids = [
+            claimable_balance.id
+            for _, claimable_balance in raw_vote_group
+            if claimable_balance.id not in existing_balance_ids and not claimable_balance.self_sponsored
+        ]
+        if not unmatched_service_balance_ids:
+            continue
+        balance_ids.extend(unmatched_service_balance_ids)
+        balance_ids.extend(
+            vote.claimable_balance_id
+            for vote in votes_by_key.get(vote_key, [])
+            if vote.claimable_balance_id not in raw_balance_ids
+        )
+
+    _resolve_origin_balance_ids(horizon_server, balance_ids, origin_cache)
+
+
+def _prefetch_creation_metadata(
+    horizon_server: Server,
+    raw_vote_groups: dict[str, list[tuple[str, ClaimableBalanceRecord]]],
+    votes_by_balance_id: dict[str, LogVote],
+    origin_cache: dict[str, Optional[str]],
+    metadata_cache: dict[str, CreationMetadata],
+) -> dict[str, int]:
+    """Load creation metadata for every balance that may become a new vote, before any vote is parsed.
+
+    Service-sponsored balances take their metadata from the traced origin when
+    one is known.  Balances that end up matched to an existing vote only cost
+    a lookup that is persisted for later runs.
+    """
+    balance_ids = [
+        _metadata_balance_id(
+            {"balance_id": claimable_balance.id, "self_sponsored": claimable_balance.self_sponsored},
+            origin_cache,
+        )
+        for raw_vote_group in raw_vote_groups.values()
+        for _, claimable_balance in raw_vote_group
+        if claimable_balance.id not in votes_by_balance_id
+    ]
+    return load_creation_metadata(horizon_server, balance_ids, metadata_cache)
+
+
+def _metadata_balance_id(raw_item: dict[str, Any], origin_cache: dict[str, Optional[str]]) -> Optional[str]:
+    if raw_item["self_sponsored"]:
+        return raw_item["balance_id"]
+    return origin_cache.get(raw_item["balance_id"]) or raw_item["balance_id"]
+
+
 def _resolve_origin_balance_id(
     horizon_server: Server,
     balance_id: Optional[str],
@@ -349,14 +888,45 @@ def _resolve_origin_balance_id(
 ) -> Optional[str]:
     if not balance_id:
         return None
-    if balance_id in origin_cache:
-        return origin_cache[balance_id]
-    try:
-        origin_balance_id = find_origin_claimable_balance_id(horizon_server, balance_id)
-    except Exception:
-        origin_balance_id = None
-    origin_cache[balance_id] = origin_balance_id
-    return origin_balance_id
+    _resolve_origin_balance_ids(horizon_server, [balance_id], origin_cache)
+    return origin_cache[balance_id]
+
+
+def _resolve_origin_balance_ids(
+    horizon_server: Server,
+    balance_ids: list[Optional[str]],
+    origin_cache: dict[str, Optional[str]],
+) -> None:
+    """Trace origins for every uncached balance id, ``ORIGIN_RESOLUTION_WORKERS`` at a time, into *origin_cache*."""
+    pending_balance_ids = list(
+        dict.fromkeys(balance_id for balance_id in balance_ids if balance_id and balance_id not in origin_cache),
+    )
+    if not pending_balance_ids:
+        return
+
+    lineage_store = BufferedLineageStore()
+    operations_cache = get_operations_cache()
+
+    def _trace(balance_id: str) -> Optional[str]:
+        try:
+            return find_origin_claimable_balance_id(
+                horizon_server,
+                balance_id,
+                lineage_store=lineage_store,
+                operations_cache=operations_cache,
+                deadline=time.monotonic() + settings.ORIGIN_RESOLUTION_DEADLINE_SECONDS,
+            )
+        except Exception:
+            return None
+
+    origin_balance_ids = map_in_threads(
+        _trace,
+        pending_balance_ids,
+        settings.ORIGIN_RESOLUTION_WORKERS,
+        close_db_connections=True,
+    )
+    lineage_store.flush()
+    origin_cache.update(zip(pending_balance_ids, origin_balance_ids))
 
 
 def _match_unresolved_service_replacements_by_origin(
@@ -367,6 +937,15 @@ def _match_unresolved_service_replacements_by_origin(
     unresolved_service_raw: list[dict[str, Any]],
     origin_cache: dict[str, Optional[str]],
 ) -> list[tuple[LogVote, dict[str, Any]]]:
+    _resolve_origin_balance_ids(
+        horizon_server=horizon_server,
+        balance_ids=[
+            *(existing_vote.claimable_balance_id for existing_vote in remaining_existing),
+            *(raw_item.get("balance_id") for raw_item in unresolved_service_raw),
+        ],
+        origin_cache=origin_cache,
+    )
+
     existing_by_origin: dict[str, list[LogVote]] = {}
     for existing_vote in remaining_existing:
         origin_balance_id = _resolve_origin_balance_id(
@@ -426,19 +1005,22 @@ def _mark_votes_as_processed(votes: list[LogVote], processed_vote_ids: set[int])
 def _make_new_vote(
     vote_key: str,
     vote_group_index: int,
-    claimable_balance: dict,
+    claimable_balance: ClaimableBalanceRecord,
     proposal: Proposal,
     vote_choice: str,
     freezing_amount: bool,
     horizon_server: Optional[Server] = None,
     origin_cache: Optional[dict[str, Optional[str]]] = None,
     restore_from_origin: bool = False,
+    metadata_cache: Optional[dict[str, CreationMetadata]] = None,
 ):
-    balance_id = claimable_balance['id']
+    balance_id = claimable_balance.id
     original_amount = None
     created_at = None
     metadata_balance_id = balance_id
-    server = horizon_server if horizon_server is not None else Server(settings.HORIZON_URL)
+    server = horizon_server if horizon_server is not None else get_horizon_server()
+    if metadata_cache is None:
+        metadata_cache = {}
 
     if restore_from_origin and horizon_server is not None:
         if origin_cache is None:
@@ -451,45 +1033,28 @@ def _make_new_vote(
         if origin_balance_id:
             metadata_balance_id = origin_balance_id
 
-    try:
-        ops = server.operations().for_claimable_balance(metadata_balance_id).order(desc=False).limit(50).call()
-        for record in ops["_embedded"]["records"]:
-            if record['type'] == 'create_claimable_balance':
-                created_at = str(date_parse(record["created_at"]))
-                original_amount = str(record["amount"])
-    except NotFoundError:
-        if metadata_balance_id == balance_id:
-            created_at = claimable_balance['last_modified_time']
-    except Exception:
-        logger.warning(
-            "Error loading create_claimable_balance metadata for balance %s (metadata source %s)",
-            balance_id,
-            metadata_balance_id,
-            exc_info=sys.exc_info(),
-        )
+    load_creation_metadata(server, [metadata_balance_id], metadata_cache)
+    metadata = metadata_cache[metadata_balance_id]
+    if isinstance(metadata, tuple):
+        created_at, original_amount = metadata
+    elif metadata == BALANCE_NOT_FOUND and metadata_balance_id == balance_id:
+        created_at = claimable_balance.last_modified_time
 
     # Fallback to current balance metadata if origin lookup has no create op.
     if (created_at is None or original_amount is None) and metadata_balance_id != balance_id:
-        try:
-            ops = server.operations().for_claimable_balance(balance_id).order(desc=False).limit(50).call()
-            for record in ops["_embedded"]["records"]:
-                if record['type'] == 'create_claimable_balance':
-                    created_at = created_at or str(date_parse(record["created_at"]))
-                    original_amount = original_amount or str(record["amount"])
-        except NotFoundError:
-            created_at = created_at or claimable_balance['last_modified_time']
-        except Exception:
-            logger.warning(
-                "Error loading fallback create_claimable_balance metadata for balance %s",
-                balance_id,
-                exc_info=sys.exc_info(),
-            )
+        load_creation_metadata(server, [balance_id], metadata_cache)
+        metadata = metadata_cache[balance_id]
+        if isinstance(metadata, tuple):
+            created_at = created_at or metadata[0]
+            original_amount = original_amount or metadata[1]
+        elif metadata == BALANCE_NOT_FOUND:
+            created_at = created_at or claimable_balance.last_modified_time
 
     if created_at is None:
         created_at = str(proposal.created_at)
 
     if original_amount is None:
-        original_amount = claimable_balance['amount']
+        original_amount = str(claimable_balance.decimal_amount)
 
     return parse_vote(
         vote_key=vote_key,
@@ -504,7 +1069,12 @@ def _make_new_vote(
     )
 
 
-def _make_updated_vote(vote: LogVote, vote_group_index: int, claimable_balance: dict, freezing_amount: bool):
+def _make_updated_vote(
+    vote: LogVote,
+    vote_group_index: int,
+    claimable_balance: ClaimableBalanceRecord,
+    freezing_amount: bool,
+):
     created_at = str(vote.created_at)
     original_amount = str(vote.original_amount)
 
@@ -0,0 +1,127 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+
+from aqua_governance.governance.models import IndexingRun, VoteUpdateSweep
+
+logger = logging.getLogger(__name__)
+
+
+# Planning cost of a proposal that has no successful indexing run yet.
+DEFAULT_PROPOSAL_COST_SECONDS = 60.0
+
+# How a proposal of a sweep ended; "coalesced" means another snapshot of it held the lease.
+# A timed-out proposal is counted as failed.
+SWEEP_PROPOSAL_SUCCEEDED = 'succeeded'
+SWEEP_PROPOSAL_FAILED = 'failed'
+SWEEP_PROPOSAL_COALESCED = 'coalesced'
+SWEEP_PROPOSAL_TIMED_OUT = 'timed_out'
+
+
+def plan_sweep_lanes(proposal_ids: list[int], lane_count: int) -> list[list[int]]:
+    """
+    Split *proposal_ids* into at most *lane_count* lanes of similar total cost.
+
+    The cost of a proposal is the duration of its last successful indexing run.
+    Proposals are placed from the most expensive one onto the cheapest lane, so
+    one slow proposal does not hold a lane full of others behind it.  Lanes
+    keep the proposals in the order they will run.
+    """
+    lane_count = max(1, min(lane_count, len(proposal_ids)))
+    costs = _last_run_seconds(proposal_ids)
+    lanes = [[] for _ in range(lane_count)]
+    lane_costs = [0.0] * lane_count
+    proposal_costs = {
+        proposal_id: costs.get(proposal_id, DEFAULT_PROPOSAL_COST_SECONDS)
+        for proposal_id in proposal_ids
+    }
+    for proposal_id in sorted(proposal_ids, key=lambda proposal_id: -proposal_costs[proposal_id]):
+        lane_index = lane_costs.index(min(lane_costs))
+        lanes[lane_index].append(proposal_id)
+        lane_costs[lane_index] += proposal_costs[proposal_id]
+    return [lane for lane in lanes if lane]
+
+
+def active_vote_update_sweep(now: datetime) -> Optional[VoteUpdateSweep]:
+    """Return the unfinished sweep started within VOTE_UPDATE_SWEEP_TIMEOUT_SECONDS, if any."""
+    cutoff = now - timedelta(seconds=settings.VOTE_UPDATE_SWEEP_TIMEOUT_SECONDS)
+    return VoteUpdateSweep.objects.filter(finished_at__isnull=True, started_at__gte=cutoff).first()
+
+
+def start_vote_update_sweep(proposal_ids: list[int], lane_count: int) -> VoteUpdateSweep:
+    return VoteUpdateSweep.objects.create(
+        started_at=timezone.now(),
+        proposal_ids=proposal_ids,
+        lane_count=lane_count,
+        pending_count=len(proposal_ids),
+    )
+
+
+def finish_sweep_proposal(sweep_id: int, outcome: str) -> bool:
+    """
+    Count one proposal of sweep *sweep_id* as done with *outcome*, one of the ``SWEEP_PROPOSAL_*`` values.
+
+    Return ``True`` for the call that completes the sweep, so exactly one
+    caller goes on to summarize it.
+    """
+    with transaction.atomic():
+        sweep = VoteUpdateSweep.objects.select_for_update().filter(id=sweep_id).first()
+        if sweep is None or sweep.finished_at is not None:
+            return False
+        if outcome == SWEEP_PROPOSAL_SUCCEEDED:
+            sweep.succeeded_count += 1
+        elif outcome == SWEEP_PROPOSAL_COALESCED:
+            sweep.coalesced_count += 1
+        else:
+            sweep.failed_count += 1
+        sweep.pending_count = max(sweep.pending_count - 1, 0)
+        if sweep.pending_count == 0:
+            sweep.finished_at = timezone.now()
+        sweep.save(update_fields=['succeeded_count', 'failed_count', 'coalesced_count', 'pending_count', 'finished_at'])
+    return sweep.finished_at is not None
+
+
+def summarize_vote_update_sweep(sweep: VoteUpdateSweep) -> dict[str, Any]:
+    """Aggregate the indexing runs of a finished *sweep*, store the summary on it and log it."""
+    runs = IndexingRun.objects.filter(
+        proposal_id__in=sweep.proposal_ids,
+        started_at__gte=sweep.started_at,
+        started_at__lte=sweep.finished_at or timezone.now(),
+    )
+    totals = runs.aggregate(
+        runs=Count('id'),
+        failed_runs=Count('id', filter=Q(status=IndexingRun.STATUS_FAILED)),
+        horizon_requests=Sum('horizon_request_count'),
+        created=Sum('created_count'),
+        updated=Sum('updated_count'),
+        stale=Sum('stale_count'),
+        slowest_seconds=Max('total_seconds'),
+    )
+    finished_at = sweep.finished_at or timezone.now()
+    sweep.summary = {
+        'proposal_count': len(sweep.proposal_ids),
+        'succeeded': sweep.succeeded_count,
+        'failed': sweep.failed_count,
+        'coalesced': sweep.coalesced_count,
+        'wall_seconds': round((finished_at - sweep.started_at).total_seconds(), 3),
+        **{key: value or 0 for key, value in totals.items()},
+    }
+    sweep.save(update_fields=['summary'])
+    logger.info('Vote update sweep %s finished: %s', sweep.id, sweep.summary)
+    return sweep.summary
+
+
+def _last_run_seconds(proposal_ids: list[int]) -> dict[int, float]:
+    costs = {}
+    runs = IndexingRun.objects.filter(
+        proposal_id__in=proposal_ids,
+        status=IndexingRun.STATUS_SUCCEEDED,
+    ).order_by('proposal_id', '-started_at').distinct('proposal_id').values_list('proposal_id', 'total_seconds')
+    for proposal_id, total_seconds in runs:
+        costs[proposal_id] = total_seconds
+    return costs
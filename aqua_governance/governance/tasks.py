@@ -1,25 +1,41 @@
 import logging
 from datetime import timedelta
-from typing import Optional
+from typing import Callable, Optional
 
+from celery import chain
+from celery.exceptions import SoftTimeLimitExceeded
 from django.conf import settings
 from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
-from stellar_sdk import Server
 from stellar_sdk.soroban_rpc import GetTransactionStatus
 
 from aqua_governance.governance.db_locks import acquire_proposal_transition_lock
-from aqua_governance.governance.models import AssetToken, Proposal
+from aqua_governance.governance.models import AssetToken, IndexingRun, Proposal, VoteUpdateSweep
 from aqua_governance.governance.onchain_hooks import execute_onchain_action
 from aqua_governance.governance.onchain_hooks.soroban import get_soroban_transaction
+from aqua_governance.governance.task_logic.asset_sweep import build_issuer_routes, crawl_vote_asset_balances
 from aqua_governance.governance.task_logic.proposal_finalization import (
     update_proposal_final_results,
 )
+from aqua_governance.governance.task_logic.reindex_schedule import due_voted_proposals
+from aqua_governance.governance.task_logic.snapshot_lease import acquire_snapshot_lease, release_snapshot_lease
 from aqua_governance.governance.task_logic.vote_indexing import (
     update_proposal_votes_snapshot,
 )
+from aqua_governance.governance.task_logic.vote_sweeps import (
+    SWEEP_PROPOSAL_COALESCED,
+    SWEEP_PROPOSAL_FAILED,
+    SWEEP_PROPOSAL_SUCCEEDED,
+    SWEEP_PROPOSAL_TIMED_OUT,
+    active_vote_update_sweep,
+    finish_sweep_proposal,
+    plan_sweep_lanes,
+    start_vote_update_sweep,
+    summarize_vote_update_sweep,
+)
 from aqua_governance.taskapp import app as celery_app
+from aqua_governance.utils.horizon import get_horizon_server
 
 logger = logging.getLogger(__name__)
 
@@ -211,28 +227,164 @@ def task_check_pending_proposal_payments():
 
 @celery_app.task(ignore_result=True)
 def task_update_proposal_results(proposal_id: int, freezing_amount: bool = False):
-    task_update_votes(proposal_id, freezing_amount)
-    update_proposal_final_results(proposal_id)
+    def update_results():
+        _update_votes(proposal_id, freezing_amount)
+        update_proposal_final_results(proposal_id)
+
+    _run_single_flight(proposal_id, freezing_amount, update_results)
 
 
 @celery_app.task(ignore_result=True)
 def task_update_votes(proposal_id: Optional[int] = None, freezing_amount: bool = False):
     """
     Update votes for proposal.
+
+    Without a proposal id, dispatch a sweep over the VOTED proposals that are due on their settlement schedule.
     """
     if proposal_id is None:
-        proposals = Proposal.objects.filter(proposal_status__in=[Proposal.VOTED]).order_by('-id')
-    else:
-        proposals = Proposal.objects.filter(id=proposal_id)
+        _dispatch_vote_update_sweep()
+        return
 
-    horizon_server = Server(settings.HORIZON_URL)
+    _run_single_flight(proposal_id, freezing_amount, lambda: _update_votes(proposal_id, freezing_amount))
 
-    for proposal in proposals:
+
+def _update_votes(proposal_id: int, freezing_amount: bool, prefetched_balances: Optional[dict] = None) -> None:
+    horizon_server = get_horizon_server()
+
+    for proposal in Proposal.objects.filter(id=proposal_id):
         update_proposal_votes_snapshot(
             proposal=proposal,
             horizon_server=horizon_server,
             freezing_amount=freezing_amount,
+            prefetched_balances=prefetched_balances,
+        )
+
+
+def _run_single_flight(proposal_id: int, freezing_amount: bool, run: Callable[[], None]) -> bool:
+    """
+    Call *run* under the snapshot lease of the proposal; return ``False`` if another run holds it.
+
+    A freezing snapshot requested meanwhile is enqueued once the lease is released.
+    """
+    token = acquire_snapshot_lease(proposal_id, freezing_amount)
+    if token is None:
+        logger.info(
+            'Snapshot of proposal %s is already running; coalesced (freezing=%s).',
+            proposal_id,
+            freezing_amount,
         )
+        return False
+    try:
+        run()
+    finally:
+        if release_snapshot_lease(proposal_id, token):
+            task_update_proposal_results.delay(proposal_id, True)
+    return True
+
+
+def _dispatch_vote_update_sweep() -> None:
+    now = timezone.now()
+    active_sweep = active_vote_update_sweep(now)
+    if active_sweep is not None:
+        logger.info('Vote update sweep %s is still running; skipping this tick.', active_sweep.id)
+        return
+
+    proposal_ids = list(due_voted_proposals(now).order_by('-id').values_list('id', flat=True))
+    if not proposal_ids:
+        return
+
+    if settings.VOTE_INGESTION_ASSET_SWEEP:
+        # One crawl of the vote assets feeds every proposal, so the sweep runs in a single task.
+        sweep = start_vote_update_sweep(proposal_ids, 1)
+        task_update_votes_from_asset_sweep.delay(sweep.id)
+        return
+
+    lanes = plan_sweep_lanes(proposal_ids, settings.VOTE_UPDATE_MAX_CONCURRENT_TASKS)
+    sweep = start_vote_update_sweep(proposal_ids, len(lanes))
+    # Each lane is a chain, so at most len(lanes) proposal tasks of the sweep run at once.
+    # The sweep row counts finished proposals instead of a chord, which would need a result backend.
+    for lane in lanes:
+        chain(*(task_update_proposal_votes.si(lane_proposal_id, sweep.id) for lane_proposal_id in lane)).apply_async()
+
+
+@celery_app.task(ignore_result=True, soft_time_limit=settings.VOTE_UPDATE_TASK_SOFT_TIME_LIMIT)
+def task_update_proposal_votes(proposal_id: int, sweep_id: int):
+    """
+    Update votes for one proposal of a sweep.
+
+    Errors are logged rather than raised so the rest of the lane still runs.
+    """
+    _update_sweep_proposal(sweep_id, proposal_id)
+
+
+@celery_app.task(ignore_result=True, soft_time_limit=settings.VOTE_UPDATE_TASK_SOFT_TIME_LIMIT)
+def task_update_votes_from_asset_sweep(sweep_id: int):
+    """
+    Update every proposal of a sweep from a single crawl of the vote assets.
+
+    If the crawl fails, each proposal falls back to crawling its own claimants.
+    Each proposal's balances are dropped once it is updated.  Proposals left
+    when the time limit hits are counted as failed.
+    """
+    sweep = VoteUpdateSweep.objects.get(id=sweep_id)
+    remaining_ids = list(sweep.proposal_ids)
+    try:
+        try:
+            balances_by_proposal = crawl_vote_asset_balances(
+                get_horizon_server(),
+                build_issuer_routes(Proposal.objects.filter(id__in=remaining_ids)),
+            )
+        except SoftTimeLimitExceeded:
+            raise
+        except Exception:
+            logger.exception('Vote asset crawl for sweep %s failed; crawling per claimant instead.', sweep_id)
+            balances_by_proposal = None
+
+        while remaining_ids:
+            proposal_id = remaining_ids[0]
+            prefetched_balances = None
+            if balances_by_proposal is not None:
+                prefetched_balances = balances_by_proposal.pop(proposal_id, {})
+            outcome = _update_sweep_proposal(sweep_id, proposal_id, prefetched_balances)
+            remaining_ids.pop(0)
+            if outcome == SWEEP_PROPOSAL_TIMED_OUT:
+                raise SoftTimeLimitExceeded()
+    except SoftTimeLimitExceeded:
+        logger.error('Vote asset sweep %s hit the time limit; %s proposals left.', sweep_id, len(remaining_ids))
+        for proposal_id in remaining_ids:
+            if finish_sweep_proposal(sweep_id, SWEEP_PROPOSAL_FAILED):
+                task_summarize_vote_update_sweep.delay(sweep_id)
+
+
+def _update_sweep_proposal(sweep_id: int, proposal_id: int, prefetched_balances: Optional[dict] = None) -> str:
+    """Update one proposal of a sweep, count it and return its ``SWEEP_PROPOSAL_*`` outcome."""
+    outcome = SWEEP_PROPOSAL_FAILED
+    try:
+        ran = _run_single_flight(proposal_id, False, lambda: _update_votes(proposal_id, False, prefetched_balances))
+        outcome = SWEEP_PROPOSAL_SUCCEEDED if ran else SWEEP_PROPOSAL_COALESCED
+    except SoftTimeLimitExceeded:
+        logger.error('Vote update for proposal %s in sweep %s hit the time limit.', proposal_id, sweep_id)
+        outcome = SWEEP_PROPOSAL_TIMED_OUT
+    except Exception:
+        logger.exception('Vote update for proposal %s in sweep %s failed.', proposal_id, sweep_id)
+
+    if finish_sweep_proposal(sweep_id, outcome):
+        task_summarize_vote_update_sweep.delay(sweep_id)
+    return outcome
+
+
+@celery_app.task(ignore_result=True)
+def task_summarize_vote_update_sweep(sweep_id: int):
+    summarize_vote_update_sweep(VoteUpdateSweep.objects.get(id=sweep_id))
+
+
+@celery_app.task(ignore_result=True)
+def task_prune_indexing_runs():
+    """
+    Delete indexing runs older than INDEXING_RUN_RETENTION_DAYS.
+    """
+    cutoff = timezone.now() - timedelta(days=settings.INDEXING_RUN_RETENTION_DAYS)
+    IndexingRun.objects.filter(started_at__lt=cutoff).delete()
 
 
 @celery_app.task(ignore_result=True)
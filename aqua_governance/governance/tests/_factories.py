@@ -1,7 +1,9 @@
 import json
+from datetime import timedelta
 from typing import Optional
 from unittest.mock import Mock, patch
 
+from django.utils import timezone
 from django_quill.quill import Quill
 from stellar_sdk import Keypair
 
@@ -62,6 +64,18 @@ def _create_proposal(**overrides):
         return Proposal.objects.create(**defaults)
 
 
+def make_voting_proposal(**overrides) -> Proposal:
+    now = timezone.now()
+    defaults = {
+        'proposal_type': Proposal.PROPOSAL_TYPE_GENERAL,
+        'proposal_status': Proposal.VOTING,
+        'start_at': now - timedelta(days=1),
+        'end_at': now + timedelta(days=6),
+    }
+    defaults.update(overrides)
+    return _create_proposal(**defaults)
+
+
 def _asset_fields(
     *,
     asset_code: Optional[str],
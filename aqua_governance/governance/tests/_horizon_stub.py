@@ -0,0 +1,39 @@
+from typing import Any, Optional
+
+from aqua_governance.governance.benchmarks.stub_horizon import (  # noqa: F401
+    StubHorizonClient,
+    StubHorizonServer,
+    add_balance_creation,
+    make_create_operation,
+)
+from aqua_governance.governance.benchmarks.synthetic import (  # noqa: F401
+    GOVERNANCE_ICE_ASSET,
+    make_balance_id,
+    make_claimable_balance,
+    make_voter_account,
+)
+from aqua_governance.governance.models import Proposal
+from aqua_governance.governance.task_logic.unlock_rules import get_expected_unlock_timestamp
+
+
+def add_vote_balances(
+    server: StubHorizonServer,
+    proposal: Proposal,
+    count: int,
+    offset: int = 0,
+    issuer: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """Add *count* self-sponsored votes (one vote group each) for *proposal* to *server*."""
+    issuer = issuer or proposal.vote_for_issuer
+    unlock_timestamp = get_expected_unlock_timestamp(proposal)
+    claimable_balances = []
+    for index in range(offset + 1, offset + count + 1):
+        claimable_balance = make_claimable_balance(
+            balance_id=make_balance_id(index),
+            voter=make_voter_account(index),
+            issuer=issuer,
+            unlock_timestamp=unlock_timestamp,
+        )
+        server.add_claimable_balance(issuer, claimable_balance)
+        claimable_balances.append(claimable_balance)
+    return claimable_balances
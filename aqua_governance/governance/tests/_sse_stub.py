@@ -0,0 +1,97 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+
+class SseHorizonStub:
+    """
+    Local stand-in for Horizon's ``/accounts/{id}/effects`` event stream.
+
+    Every subscription is answered with the effects published for the account
+    after its cursor or ``Last-Event-ID`` (``now`` counts as the start), then
+    kept open and fed with effects published later.  ``close_after`` ends each connection after that
+    many events, to exercise reconnects.
+    """
+
+    def __init__(self, close_after: int = 0):
+        self.close_after = close_after
+        self.effects_by_account: dict[str, list[dict[str, Any]]] = {}
+        self.subscriptions: list[tuple[str, str]] = []
+        self._stopping = threading.Event()
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_address[1]}'
+
+    def publish(self, account: str, effect_type: str, **fields: Any) -> dict[str, Any]:
+        with self._lock:
+            self._sequence += 1
+            paging_token = f'{self._sequence:019d}-1'
+            effect = {
+                'id': paging_token,
+                'paging_token': paging_token,
+                'account': account,
+                'type': effect_type,
+                **fields,
+            }
+            self.effects_by_account.setdefault(account, []).append(effect)
+        return effect
+
+    def __enter__(self) -> 'SseHorizonStub':
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stopping.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _effects_after(self, account: str, cursor: str) -> list[dict[str, Any]]:
+        with self._lock:
+            effects = list(self.effects_by_account.get(account, []))
+        if cursor == 'now':
+            return effects
+        return [effect for effect in effects if effect['paging_token'] > cursor]
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                path = url.path.strip('/').split('/')
+                if len(path) != 3 or path[0] != 'accounts' or path[2] != 'effects':
+                    self.send_error(404)
+                    return
+                account = path[1]
+                # Like Horizon, a reconnecting client's Last-Event-ID wins over the cursor parameter.
+                cursor = self.headers.get('Last-Event-ID') or parse_qs(url.query).get('cursor', ['now'])[0]
+                stub.subscriptions.append((account, cursor))
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.end_headers()
+                self.wfile.write(b'retry: 50\ndata: "hello"\n\n')
+                self.wfile.flush()
+                sent = 0
+                while not stub._stopping.is_set():
+                    for effect in stub._effects_after(account, cursor):
+                        self.wfile.write(f'id: {effect["paging_token"]}\ndata: {json.dumps(effect)}\n\n'.encode())
+                        self.wfile.flush()
+                        cursor = effect['paging_token']
+                        sent += 1
+                        if stub.close_after and sent >= stub.close_after:
+                            return
+                    time.sleep(0.01)
+
+        return Handler
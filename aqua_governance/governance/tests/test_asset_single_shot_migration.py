@@ -28,6 +28,12 @@ class AssetSingleShotMigrationTests(TransactionTestCase):
         self.executor.migrate(self.migrate_from)
         self.apps_0027 = self.executor.loader.project_state(self.migrate_from).apps
 
+    def tearDown(self):
+        # Leave the schema at the latest migrations for the test cases that run after this one.
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+        super().tearDown()
+
     def test_forward_backfills_asset_tokens_and_proposal_fk(self):
         Proposal = self.apps_0027.get_model('governance', 'Proposal')
         now = timezone.now()
@@ -0,0 +1,103 @@
+from unittest.mock import patch
+
+from celery.exceptions import SoftTimeLimitExceeded
+from django.test import TestCase, override_settings
+
+from aqua_governance.governance.models import LogVote, Proposal, VoteUpdateSweep
+from aqua_governance.governance.tasks import task_update_votes
+from aqua_governance.governance.task_logic.asset_sweep import build_issuer_routes, crawl_vote_asset_balances
+from aqua_governance.governance.task_logic.vote_indexing import update_proposal_votes_snapshot
+from aqua_governance.governance.tests._factories import make_voting_proposal
+from aqua_governance.governance.tests._horizon_stub import (
+    StubHorizonServer,
+    add_vote_balances,
+    make_balance_id,
+    make_claimable_balance,
+    make_voter_account,
+)
+
+
+class VoteAssetSweepTests(TestCase):
+    def setUp(self):
+        self.server = StubHorizonServer()
+        self.first = make_voting_proposal()
+        self.second = make_voting_proposal()
+        add_vote_balances(self.server, self.first, 3)
+        add_vote_balances(self.server, self.first, 1, offset=10, issuer=self.first.vote_against_issuer)
+        add_vote_balances(self.server, self.second, 2, offset=20)
+        unrelated_account = make_voter_account(999)
+        self.server.add_claimable_balance(
+            unrelated_account,
+            make_claimable_balance(
+                balance_id=make_balance_id(999),
+                voter=unrelated_account,
+                issuer=unrelated_account,
+                unlock_timestamp=0,
+            ),
+        )
+
+    def test_balances_are_routed_to_their_proposal_and_issuer(self):
+        routes = build_issuer_routes([self.first, self.second])
+
+        balances_by_proposal = crawl_vote_asset_balances(self.server, routes)
+
+        self.assertEqual(routes[self.first.vote_against_issuer], (self.first.id, LogVote.VOTE_AGAINST))
+        self.assertEqual(set(balances_by_proposal), {self.first.id, self.second.id})
+        self.assertEqual(len(balances_by_proposal[self.first.id][self.first.vote_for_issuer]), 3)
+        self.assertEqual(len(balances_by_proposal[self.first.id][self.first.vote_against_issuer]), 1)
+        self.assertEqual(balances_by_proposal[self.first.id][self.first.abstain_issuer], [])
+        self.assertEqual(len(balances_by_proposal[self.second.id][self.second.vote_for_issuer]), 2)
+
+    def test_crawl_cost_does_not_grow_with_proposals(self):
+        crawl_vote_asset_balances(self.server, build_issuer_routes([self.first]))
+        single_proposal_calls = len(self.server.calls)
+        self.server.calls.clear()
+
+        crawl_vote_asset_balances(self.server, build_issuer_routes([self.first, self.second]))
+
+        self.assertEqual(len(self.server.calls), single_proposal_calls)
+        self.assertEqual(self.server.count_calls('claimable_balances'), 0)
+
+    @override_settings(VOTE_INGESTION_CHECKPOINTS_ENABLED=False)
+    def test_prefetched_snapshot_matches_claimant_crawl(self):
+        balances_by_proposal = crawl_vote_asset_balances(self.server, build_issuer_routes([self.first]))
+
+        stats = update_proposal_votes_snapshot(
+            self.first,
+            self.server,
+            prefetched_balances=balances_by_proposal[self.first.id],
+        )
+        self.assertEqual(stats['created'], 4)
+        self.assertEqual(self.server.count_calls('claimable_balances'), 0)
+
+        stats = update_proposal_votes_snapshot(self.first, self.server)
+        self.assertEqual((stats['created'], stats['updated'], stats['stale']), (0, 0, 0))
+
+    @override_settings(VOTE_INGESTION_ASSET_SWEEP=True)
+    def test_scheduled_sweep_indexes_every_due_proposal_from_one_crawl(self):
+        Proposal.objects.update(proposal_status=Proposal.VOTED)
+
+        with patch('aqua_governance.governance.tasks.get_horizon_server', return_value=self.server):
+            task_update_votes()
+
+        self.assertEqual(LogVote.objects.filter(proposal=self.first).count(), 4)
+        self.assertEqual(LogVote.objects.filter(proposal=self.second).count(), 2)
+        self.assertEqual(self.server.count_calls('claimable_balances'), 0)
+        sweep = VoteUpdateSweep.objects.get()
+        self.assertEqual((sweep.lane_count, sweep.succeeded_count, sweep.pending_count), (1, 2, 0))
+
+    @override_settings(VOTE_INGESTION_ASSET_SWEEP=True)
+    def test_time_limit_counts_the_remaining_proposals_as_failed(self):
+        Proposal.objects.update(proposal_status=Proposal.VOTED)
+
+        with patch('aqua_governance.governance.tasks.get_horizon_server', return_value=self.server), patch(
+            'aqua_governance.governance.tasks.update_proposal_votes_snapshot',
+            side_effect=SoftTimeLimitExceeded(),
+        ) as update_snapshot:
+            task_update_votes()
+
+        self.assertEqual(update_snapshot.call_count, 1)
+        sweep = VoteUpdateSweep.objects.get()
+        self.assertEqual((sweep.succeeded_count, sweep.failed_count, sweep.pending_count), (0, 2, 0))
+        self.assertIsNotNone(sweep.finished_at)
+        self.assertEqual(sweep.summary['failed'], 2)
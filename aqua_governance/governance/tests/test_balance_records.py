@@ -0,0 +1,115 @@
+import json
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from aqua_governance.governance.exceptions import ClaimableBalanceParsingError
+from aqua_governance.governance.parser import generate_vote_key_by_raw_data
+from aqua_governance.governance.task_logic.balance_records import decode_claimable_balance
+from aqua_governance.governance.task_logic.unlock_rules import has_valid_unlock_date
+from aqua_governance.governance.tests._horizon_stub import (
+    GOVERNANCE_ICE_ASSET,
+    make_balance_id,
+    make_claimable_balance,
+    make_voter_account,
+)
+
+
+VOTER = make_voter_account(1)
+SERVICE = make_voter_account(2)
+ISSUER = make_voter_account(3)
+UNLOCK_TIMESTAMP = 1_800_000_000
+
+
+class DecodeClaimableBalanceTests(SimpleTestCase):
+    def _raw_balance(self, **overrides) -> dict:
+        return make_claimable_balance(
+            balance_id=make_balance_id(1),
+            voter=VOTER,
+            issuer=ISSUER,
+            unlock_timestamp=UNLOCK_TIMESTAMP,
+            amount='12.3456789',
+            **overrides,
+        )
+
+    def test_decodes_indexer_fields(self):
+        record = decode_claimable_balance(self._raw_balance(sponsor=SERVICE))
+
+        self.assertEqual(record.id, make_balance_id(1))
+        self.assertEqual(record.amount, 123456789)
+        self.assertEqual(record.decimal_amount, Decimal('12.3456789'))
+        self.assertEqual(record.asset, GOVERNANCE_ICE_ASSET)
+        self.assertEqual(record.sponsor, SERVICE)
+        self.assertEqual(record.account_issuer, VOTER)
+        self.assertEqual(record.abs_before, ('2027-01-15T08:00:00Z',))
+        self.assertEqual(record.unlock_timestamps, (UNLOCK_TIMESTAMP,))
+        self.assertFalse(record.self_sponsored)
+        self.assertEqual(
+            record.transaction_link,
+            f'https://horizon.example/claimable_balances/{make_balance_id(1)}/transactions',
+        )
+
+    def test_vote_key_uses_raw_abs_before_strings(self):
+        record = decode_claimable_balance(self._raw_balance())
+
+        self.assertTrue(record.self_sponsored)
+        self.assertEqual(
+            generate_vote_key_by_raw_data(
+                7, 'vote_for', record.account_issuer, record.asset_code, list(record.abs_before),
+            ),
+            f"7|vote_for|{VOTER}|{GOVERNANCE_ICE_ASSET.split(':')[0]}|['2027-01-15T08:00:00Z']",
+        )
+
+    def test_epoch_disagreeing_with_abs_before_invalidates_unlock_date(self):
+        raw_balance = self._raw_balance()
+        raw_balance['claimants'][0]['predicate']['not']['abs_before_epoch'] = str(UNLOCK_TIMESTAMP + 60)
+
+        record = decode_claimable_balance(raw_balance)
+
+        self.assertEqual(record.unlock_timestamps, (None,))
+        self.assertFalse(has_valid_unlock_date(record, UNLOCK_TIMESTAMP))
+
+    def test_unlock_date_is_checked_against_expected_timestamp(self):
+        record = decode_claimable_balance(self._raw_balance())
+
+        self.assertTrue(has_valid_unlock_date(record, UNLOCK_TIMESTAMP))
+        self.assertFalse(has_valid_unlock_date(record, UNLOCK_TIMESTAMP + 3600))
+
+    def test_malformed_balance_raises_parsing_error(self):
+        raw_balance = self._raw_balance()
+        raw_balance['amount'] = 'not-a-number'
+
+        with self.assertRaises(ClaimableBalanceParsingError):
+            decode_claimable_balance(raw_balance)
+
+
+class BalanceRecordsBenchmarkTests(SimpleTestCase):
+    def test_benchmark_reports_machine_readable_results(self):
+        stdout = StringIO()
+
+        call_command('run_benchmark', 'balance_records', '--count', '20', stdout=stdout)
+
+        result = json.loads(stdout.getvalue())
+        self.assertEqual(result['count'], 20)
+        self.assertLess(result['record_bytes'], result['raw_bytes'])
+        for key in ('raw_dict_seconds', 'raw_dict_cpu_seconds', 'record_seconds', 'record_cpu_seconds'):
+            self.assertGreaterEqual(result[key], 0)
+
+    def test_unlock_validation_benchmark_reports_throughput(self):
+        stdout = StringIO()
+
+        call_command('run_benchmark', 'unlock_validation', '--count', '20', stdout=stdout)
+
+        result = json.loads(stdout.getvalue())
+        self.assertEqual(
+            set(result),
+            {
+                'benchmark',
+                'count',
+                'memoized_balances_per_second',
+                'fast_path_balances_per_second',
+                'dateutil_balances_per_second',
+            },
+        )
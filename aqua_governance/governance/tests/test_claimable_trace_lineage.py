@@ -0,0 +1,100 @@
+from django.test import TestCase
+
+from aqua_governance.governance.claimable_lineage import DatabaseLineageStore
+from aqua_governance.governance.claimable_trace import find_origin_claimable_balance_id
+from aqua_governance.governance.models import ClaimableBalanceLineage
+from aqua_governance.governance.tests._horizon_stub import (
+    StubHorizonServer,
+    add_balance_creation,
+    make_balance_id,
+    make_claimable_balance,
+    make_voter_account,
+)
+
+
+VOTER = make_voter_account(1)
+SERVICE = make_voter_account(2)
+ISSUER = make_voter_account(3)
+
+
+def _make_balance(index: int, sponsor: str) -> dict:
+    return make_claimable_balance(
+        balance_id=make_balance_id(index),
+        voter=VOTER,
+        issuer=ISSUER,
+        unlock_timestamp=1_800_000_000,
+        sponsor=sponsor,
+    )
+
+
+class ClaimableTraceLineageTests(TestCase):
+    def setUp(self):
+        self.server = StubHorizonServer()
+        self.origin = _make_balance(1, sponsor=VOTER)
+        add_balance_creation(self.server, self.origin, 'tx-origin')
+        self.chain = [self.origin]
+        for index in range(2, 5):
+            replacement = _make_balance(index, sponsor=SERVICE)
+            add_balance_creation(
+                self.server,
+                replacement,
+                f'tx-melting-{index}',
+                clawed_back_balance_id=self.chain[-1]['id'],
+            )
+            self.chain.append(replacement)
+
+    def _trace(self, balance_id: str, lineage_store=None):
+        self.server.calls.clear()
+        return find_origin_claimable_balance_id(self.server, balance_id, lineage_store=lineage_store)
+
+    def test_trace_without_store_walks_horizon(self):
+        self.assertEqual(self._trace(self.chain[-1]['id']), self.origin['id'])
+        self.assertEqual(len(self.server.calls), 7)
+        self.assertFalse(ClaimableBalanceLineage.objects.exists())
+
+    def test_trace_stores_every_step_and_origin(self):
+        self.assertEqual(self._trace(self.chain[-1]['id'], DatabaseLineageStore()), self.origin['id'])
+
+        stored = dict(ClaimableBalanceLineage.objects.values_list('balance_id', 'parent_balance_id'))
+        self.assertEqual(
+            stored,
+            {
+                self.chain[3]['id']: self.chain[2]['id'],
+                self.chain[2]['id']: self.chain[1]['id'],
+                self.chain[1]['id']: self.origin['id'],
+                self.origin['id']: None,
+            },
+        )
+        self.assertEqual(
+            set(ClaimableBalanceLineage.objects.values_list('origin_balance_id', flat=True)),
+            {self.origin['id']},
+        )
+
+    def test_repeat_trace_makes_no_horizon_calls(self):
+        self._trace(self.chain[-1]['id'], DatabaseLineageStore())
+
+        self.assertEqual(self._trace(self.chain[-1]['id'], DatabaseLineageStore()), self.origin['id'])
+        self.assertEqual(self.server.calls, [])
+
+    def test_trace_joining_known_chain_stops_at_known_balance(self):
+        self._trace(self.chain[-1]['id'], DatabaseLineageStore())
+        extension = _make_balance(10, sponsor=SERVICE)
+        add_balance_creation(self.server, extension, 'tx-melting-10', clawed_back_balance_id=self.chain[-1]['id'])
+
+        self.assertEqual(self._trace(extension['id'], DatabaseLineageStore()), self.origin['id'])
+        self.assertEqual(
+            [endpoint for endpoint, _, _ in self.server.calls],
+            ['balance_operations', 'transaction_operations'],
+        )
+        self.assertEqual(
+            ClaimableBalanceLineage.objects.get(balance_id=extension['id']).origin_balance_id,
+            self.origin['id'],
+        )
+
+    def test_failed_trace_keeps_resolved_steps_without_origin(self):
+        self.server.operations_by_balance_id.pop(self.origin['id'])
+
+        self.assertIsNone(self._trace(self.chain[-1]['id'], DatabaseLineageStore()))
+
+        self.assertEqual(ClaimableBalanceLineage.objects.count(), 3)
+        self.assertFalse(ClaimableBalanceLineage.objects.filter(origin_balance_id__isnull=False).exists())
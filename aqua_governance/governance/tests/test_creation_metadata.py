@@ -0,0 +1,63 @@
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+
+from aqua_governance.governance.models import ClaimableBalanceMetadata, LogVote
+from aqua_governance.governance.operations_cache import get_operations_cache
+from aqua_governance.governance.task_logic.vote_indexing import update_proposal_votes_snapshot
+from aqua_governance.governance.tests._factories import make_voting_proposal
+from aqua_governance.governance.tests._horizon_stub import (
+    StubHorizonServer,
+    add_balance_creation,
+    add_vote_balances,
+)
+
+
+@override_settings(CREATION_METADATA_WORKERS=4)
+class CreationMetadataTests(TestCase):
+    def setUp(self):
+        get_operations_cache().clear()
+        self.proposal = make_voting_proposal()
+        self.server = StubHorizonServer()
+        self.balances = add_vote_balances(self.server, self.proposal, 5)
+        for index, claimable_balance in enumerate(self.balances):
+            add_balance_creation(self.server, claimable_balance, f'tx-vote-{index}')
+            self.server.operations_by_balance_id[claimable_balance['id']][0]['amount'] = '150.0000000'
+
+    def tearDown(self):
+        get_operations_cache().clear()
+
+    def test_first_snapshot_persists_metadata_of_new_votes(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+
+        self.assertEqual(self.server.count_calls('balance_operations'), len(self.balances))
+        self.assertEqual(
+            set(ClaimableBalanceMetadata.objects.values_list('balance_id', flat=True)),
+            {claimable_balance['id'] for claimable_balance in self.balances},
+        )
+        self.assertEqual(
+            set(LogVote.objects.filter(proposal=self.proposal).values_list('original_amount', flat=True)),
+            {Decimal('150.0000000')},
+        )
+
+    def test_recreated_votes_reuse_stored_metadata(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        created_at = set(LogVote.objects.values_list('created_at', flat=True))
+        LogVote.objects.all().delete()
+        self.server.calls.clear()
+
+        update_proposal_votes_snapshot(self.proposal, self.server)
+
+        self.assertEqual(self.server.count_calls('balance_operations'), 0)
+        self.assertEqual(LogVote.objects.filter(proposal=self.proposal).count(), len(self.balances))
+        self.assertEqual(set(LogVote.objects.values_list('created_at', flat=True)), created_at)
+
+    def test_balance_without_create_operation_is_not_persisted(self):
+        self.server.operations_by_balance_id.pop(self.balances[0]['id'])
+
+        update_proposal_votes_snapshot(self.proposal, self.server)
+
+        self.assertFalse(ClaimableBalanceMetadata.objects.filter(balance_id=self.balances[0]['id']).exists())
+        vote = LogVote.objects.get(claimable_balance_id=self.balances[0]['id'])
+        self.assertEqual(vote.created_at, self.proposal.created_at)
+        self.assertEqual(vote.original_amount, Decimal('100.0000000'))
@@ -0,0 +1,173 @@
+import json
+
+from django.test import SimpleTestCase, override_settings
+from stellar_sdk import Server
+from stellar_sdk.client.base_sync_client import BaseSyncClient
+from stellar_sdk.client.response import Response
+from stellar_sdk.exceptions import BadResponseError, ConnectionError as HorizonConnectionError
+
+from aqua_governance.governance.checks import check_horizon_rate_limit_cache
+from aqua_governance.utils.horizon import HorizonClient, HorizonRateLimiter, get_horizon_server
+
+
+class ScriptedClient(BaseSyncClient):
+    """Answers GET requests with the queued responses or exceptions, in order."""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.requests = []
+
+    def get(self, url, params=None):
+        self.requests.append(url)
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    def post(self, url, data=None, json_data=None):
+        raise NotImplementedError
+
+    def stream(self, url, params=None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+def make_response(status_code: int, body: dict = None, headers: dict = None) -> Response:
+    return Response(status_code=status_code, text=json.dumps(body or {}), headers=headers or {}, url='')
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class HorizonClientTests(SimpleTestCase):
+    def _make_client(self, inner, **kwargs):
+        self.sleeps = []
+        return HorizonClient(client=inner, sleep=self.sleeps.append, **kwargs)
+
+    def test_rate_limited_request_waits_for_retry_after(self):
+        inner = ScriptedClient(
+            make_response(429, {'status': 429}, {'Retry-After': '7'}),
+            make_response(200, {'hash': 'a' * 64, 'successful': True}),
+        )
+        server = Server('https://horizon.test', client=self._make_client(inner))
+
+        transaction = server.transactions().transaction('a' * 64).call()
+
+        self.assertTrue(transaction['successful'])
+        self.assertEqual(len(inner.requests), 2)
+        self.assertEqual(self.sleeps, [7.0])
+
+    def test_retries_are_bounded_and_jittered(self):
+        inner = ScriptedClient(*(make_response(503, {'status': 503}) for _ in range(4)))
+        server = Server('https://horizon.test', client=self._make_client(inner, max_retries=3, backoff_seconds=1))
+
+        with self.assertRaises(BadResponseError):
+            server.transactions().transaction('a' * 64).call()
+
+        self.assertEqual(len(inner.requests), 4)
+        self.assertEqual(len(self.sleeps), 3)
+        for attempt, delay in enumerate(self.sleeps):
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, 2 ** attempt)
+
+    def test_connection_errors_are_retried_then_raised(self):
+        inner = ScriptedClient(HorizonConnectionError('reset'), make_response(200, {'id': 'ok'}))
+        client = self._make_client(inner, max_retries=1)
+
+        self.assertEqual(client.get('https://horizon.test/ledgers').status_code, 200)
+
+        inner.answers = [HorizonConnectionError('reset'), HorizonConnectionError('reset')]
+        with self.assertRaises(HorizonConnectionError):
+            client.get('https://horizon.test/ledgers')
+
+    def test_client_errors_are_not_retried(self):
+        inner = ScriptedClient(make_response(404, {'status': 404}))
+
+        self.assertEqual(self._make_client(inner).get('https://horizon.test/ledgers/1').status_code, 404)
+        self.assertEqual(self.sleeps, [])
+
+
+class HorizonRateLimiterTests(SimpleTestCase):
+    def test_requests_over_the_rate_wait_until_the_window_has_room(self):
+        clock = FakeClock(1000.25)
+        limiter = HorizonRateLimiter(2, key_prefix='test-rate-limit', clock=clock, sleep=clock.sleep)
+
+        for _ in range(3):
+            limiter.acquire()
+
+        # The two requests of second 1000 still fill the window until half of second 1001 has passed.
+        self.assertGreaterEqual(clock.now, 1001.5)
+
+    def test_burst_at_a_second_boundary_does_not_double_the_rate(self):
+        clock = FakeClock(4000.9)
+        limiter = HorizonRateLimiter(2, key_prefix='test-boundary-limit', clock=clock, sleep=clock.sleep)
+
+        limiter.acquire()
+        limiter.acquire()
+        clock.now = 4001.0
+        limiter.acquire()
+
+        self.assertGreaterEqual(clock.now, 4001.5)
+
+    def test_processes_sharing_the_cache_share_the_budget(self):
+        clock = FakeClock(2000.5)
+        first = HorizonRateLimiter(2, key_prefix='test-shared-limit', clock=clock, sleep=clock.sleep)
+        second = HorizonRateLimiter(2, key_prefix='test-shared-limit', clock=clock, sleep=clock.sleep)
+
+        first.acquire()
+        first.acquire()
+        second.acquire()
+
+        self.assertGreaterEqual(clock.now, 2001.5)
+
+    def test_zero_rate_disables_the_limiter(self):
+        clock = FakeClock(3000)
+        limiter = HorizonRateLimiter(0, key_prefix='test-disabled-limit', clock=clock, sleep=clock.sleep)
+
+        for _ in range(10):
+            limiter.acquire()
+
+        self.assertEqual(clock.sleeps, [])
+
+
+class HorizonRateLimitCacheCheckTests(SimpleTestCase):
+    @override_settings(HORIZON_RATE_LIMIT_PER_SECOND=50, HORIZON_RATE_LIMIT_CACHE='default', CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    })
+    def test_process_local_cache_is_reported(self):
+        messages = check_horizon_rate_limit_cache(None)
+
+        self.assertEqual([message.id for message in messages], ['governance.W001'])
+
+    @override_settings(HORIZON_RATE_LIMIT_PER_SECOND=50, HORIZON_RATE_LIMIT_CACHE='default', CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache', 'LOCATION': 'cache:11211'},
+    })
+    def test_shared_cache_is_accepted(self):
+        self.assertEqual(check_horizon_rate_limit_cache(None), [])
+
+    @override_settings(HORIZON_RATE_LIMIT_PER_SECOND=0)
+    def test_disabled_limiter_is_not_reported(self):
+        self.assertEqual(check_horizon_rate_limit_cache(None), [])
+
+
+class HorizonServerFactoryTests(SimpleTestCase):
+    @override_settings(HORIZON_URL='https://horizon-a.test')
+    def test_server_is_shared_per_process_and_url(self):
+        server = get_horizon_server()
+
+        self.assertIs(get_horizon_server(), server)
+        self.assertIsInstance(server._client, HorizonClient)
+        with self.settings(HORIZON_URL='https://horizon-b.test'):
+            self.assertIsNot(get_horizon_server(), server)
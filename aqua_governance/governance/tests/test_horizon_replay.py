@@ -0,0 +1,143 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from stellar_sdk import Server
+
+from aqua_governance.governance.models import ClaimableBalanceLineage, ClaimableBalanceMetadata, VoteIngestionCheckpoint
+from aqua_governance.governance.operations_cache import get_operations_cache
+from aqua_governance.governance.task_logic.unlock_rules import get_expected_unlock_timestamp
+from aqua_governance.governance.task_logic.vote_indexing import (
+    plan_proposal_votes_snapshot,
+    update_proposal_votes_snapshot,
+)
+from aqua_governance.governance.tests._factories import make_voting_proposal
+from aqua_governance.governance.tests._horizon_stub import (
+    StubHorizonClient,
+    StubHorizonServer,
+    add_balance_creation,
+    add_vote_balances,
+    make_balance_id,
+    make_claimable_balance,
+    make_voter_account,
+)
+from aqua_governance.utils.horizon_replay import ReplayMissError, make_recording_server, make_replay_server
+
+
+SERVICE = make_voter_account(1000)
+
+
+def summarize_plan(plan) -> dict:
+    return {
+        'new_votes': sorted((vote.key, vote.claimable_balance_id) for vote in plan.new_votes),
+        'updated_votes': sorted((vote.id, vote.claimable_balance_id, vote.amount) for vote in plan.updated_votes),
+        'processed_vote_ids': sorted(plan.processed_vote_ids),
+        'unchanged_count': plan.unchanged_count,
+    }
+
+
+class HorizonReplayTests(TestCase):
+    def setUp(self):
+        self._forget_horizon_data()
+        self.proposal = make_voting_proposal()
+        self.stub = StubHorizonServer()
+        originals = add_vote_balances(self.stub, self.proposal, 4)
+        for index, original in enumerate(originals):
+            add_balance_creation(self.stub, original, f'tx-vote-{index}')
+        update_proposal_votes_snapshot(self.proposal, self.stub)
+
+        # Melt half of the votes and add a new one so the plan exercises lineage tracing and creation lookups.
+        unlock_timestamp = get_expected_unlock_timestamp(self.proposal)
+        for index, original in enumerate(originals[:2], start=100):
+            self.stub.remove_claimable_balance(self.proposal.vote_for_issuer, original['id'])
+            replacement = make_claimable_balance(
+                balance_id=make_balance_id(index),
+                voter=original['sponsor'],
+                issuer=self.proposal.vote_for_issuer,
+                unlock_timestamp=unlock_timestamp,
+                amount='90.0000000',
+                sponsor=SERVICE,
+            )
+            self.stub.add_claimable_balance(self.proposal.vote_for_issuer, replacement)
+            add_balance_creation(self.stub, replacement, 'tx-melting', clawed_back_balance_id=original['id'])
+        for claimable_balance in add_vote_balances(self.stub, self.proposal, 1, offset=10):
+            add_balance_creation(self.stub, claimable_balance, 'tx-vote-new')
+
+        self._forget_horizon_data()
+        fixture_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(fixture_dir.cleanup)
+        self.fixture_path = os.path.join(fixture_dir.name, 'proposal.json.gz')
+
+    def tearDown(self):
+        get_operations_cache().clear()
+
+    def _forget_horizon_data(self):
+        ClaimableBalanceLineage.objects.all().delete()
+        ClaimableBalanceMetadata.objects.all().delete()
+        VoteIngestionCheckpoint.objects.all().delete()
+        get_operations_cache().clear()
+
+    def _fixture_metadata(self) -> dict:
+        return {
+            'proposal_id': self.proposal.id,
+            'vote_for_issuer': self.proposal.vote_for_issuer,
+            'vote_against_issuer': self.proposal.vote_against_issuer,
+            'abstain_issuer': self.proposal.abstain_issuer,
+        }
+
+    def _record(self):
+        horizon_server, recording_client = make_recording_server(
+            'https://horizon.example', client=StubHorizonClient(self.stub),
+        )
+        plan = plan_proposal_votes_snapshot(self.proposal, horizon_server, force_full_reconcile=True)
+        recording_client.save(self.fixture_path, metadata=self._fixture_metadata())
+        self._forget_horizon_data()
+        return plan, recording_client
+
+    def test_stub_client_serves_real_sdk_server(self):
+        horizon_server = Server('https://horizon.example', client=StubHorizonClient(self.stub))
+
+        direct_plan = plan_proposal_votes_snapshot(self.proposal, self.stub, force_full_reconcile=True)
+        self._forget_horizon_data()
+        sdk_plan = plan_proposal_votes_snapshot(self.proposal, horizon_server, force_full_reconcile=True)
+
+        self.assertEqual(summarize_plan(sdk_plan), summarize_plan(direct_plan))
+
+    def test_replay_reproduces_recorded_plan_without_horizon(self):
+        recorded_plan, recording_client = self._record()
+        stub_calls = len(self.stub.calls)
+
+        horizon_server, replay_client = make_replay_server(self.fixture_path)
+        replayed_plan = plan_proposal_votes_snapshot(self.proposal, horizon_server, force_full_reconcile=True)
+
+        self.assertEqual(summarize_plan(replayed_plan), summarize_plan(recorded_plan))
+        self.assertEqual(len(recorded_plan.new_votes), 1)
+        self.assertEqual(len(recorded_plan.updated_votes), 2)
+        self.assertEqual(replay_client.missed, [])
+        self.assertEqual(replay_client.metadata, self._fixture_metadata())
+        self.assertEqual(len(self.stub.calls), stub_calls)
+        self.assertGreater(replay_client.served, 0)
+        self.assertLessEqual(len(replay_client.responses), recording_client.request_count)
+
+    def test_request_missing_from_fixture_raises(self):
+        self._record()
+        horizon_server, replay_client = make_replay_server(self.fixture_path)
+
+        with self.assertRaises(ReplayMissError):
+            horizon_server.operations().for_transaction('tx-unknown').call()
+        self.assertEqual(len(replay_client.missed), 1)
+
+    def test_replay_command_reports_plan_as_json(self):
+        recorded_plan, _ = self._record()
+        stdout = StringIO()
+
+        call_command('replay_horizon_fixture', self.fixture_path, '--proposal-id', str(self.proposal.id), stdout=stdout)
+
+        result = json.loads(stdout.getvalue())
+        self.assertEqual(result['proposal_id'], self.proposal.id)
+        self.assertEqual(result['new_votes'], len(recorded_plan.new_votes))
+        self.assertEqual(result['updated_votes'], len(recorded_plan.updated_votes))
+        self.assertEqual(result['missed_requests'], 0)
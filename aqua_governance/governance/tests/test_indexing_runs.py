@@ -0,0 +1,116 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.admin.sites import AdminSite
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from aqua_governance.governance.admin import IndexingRunAdmin
+from aqua_governance.governance.models import IndexingRun
+from aqua_governance.governance.operations_cache import get_operations_cache
+from aqua_governance.governance.tasks import task_prune_indexing_runs
+from aqua_governance.governance.task_logic.unlock_rules import get_expected_unlock_timestamp
+from aqua_governance.governance.task_logic.vote_indexing import update_proposal_votes_snapshot
+from aqua_governance.governance.tests._factories import make_voting_proposal
+from aqua_governance.governance.tests._horizon_stub import (
+    StubHorizonServer,
+    add_balance_creation,
+    add_vote_balances,
+    make_balance_id,
+    make_claimable_balance,
+    make_voter_account,
+)
+
+
+SERVICE = make_voter_account(1000)
+
+
+class IndexingRunTests(TestCase):
+    def setUp(self):
+        get_operations_cache().clear()
+        self.proposal = make_voting_proposal()
+        self.server = StubHorizonServer()
+        self.originals = add_vote_balances(self.server, self.proposal, 3)
+        for index, original in enumerate(self.originals):
+            add_balance_creation(self.server, original, f'tx-vote-{index}')
+
+    def tearDown(self):
+        get_operations_cache().clear()
+
+    def test_snapshot_records_run_with_counters(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+
+        run = IndexingRun.objects.get(proposal=self.proposal)
+        self.assertEqual(run.status, IndexingRun.STATUS_SUCCEEDED)
+        self.assertFalse(run.freezing_amount)
+        self.assertEqual(run.created_count, 3)
+        self.assertEqual(run.group_counts, {'new_vote': 3})
+        self.assertEqual(run.horizon_requests['balance_operations'], 3)
+        self.assertEqual(run.horizon_request_count, sum(run.horizon_requests.values()))
+        self.assertEqual(run.horizon_request_count, len(self.server.calls))
+        self.assertEqual(run.cache_stats['creation_metadata'], {'hits': 0, 'misses': 3, 'hit_rate': 0.0})
+        for seconds in (run.fetch_seconds, run.trace_seconds, run.metadata_seconds, run.apply_seconds):
+            self.assertGreaterEqual(seconds, 0)
+        self.assertGreaterEqual(run.total_seconds, run.apply_seconds)
+
+    def test_melting_run_counts_traces_and_cache_hits(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        unlock_timestamp = get_expected_unlock_timestamp(self.proposal)
+        for index, original in enumerate(self.originals, start=100):
+            self.server.remove_claimable_balance(self.proposal.vote_for_issuer, original['id'])
+            replacement = make_claimable_balance(
+                balance_id=make_balance_id(index),
+                voter=original['sponsor'],
+                issuer=self.proposal.vote_for_issuer,
+                unlock_timestamp=unlock_timestamp,
+                amount='90.0000000',
+                sponsor=SERVICE,
+            )
+            self.server.add_claimable_balance(self.proposal.vote_for_issuer, replacement)
+            add_balance_creation(self.server, replacement, 'tx-melting', clawed_back_balance_id=original['id'])
+
+        update_proposal_votes_snapshot(self.proposal, self.server, freezing_amount=True)
+
+        run = IndexingRun.objects.filter(proposal=self.proposal).latest('started_at')
+        self.assertTrue(run.freezing_amount)
+        self.assertEqual(run.group_counts, {'melting': 3})
+        self.assertEqual(run.updated_count, 3)
+        self.assertEqual(run.horizon_requests['transaction_operations'], 1)
+        self.assertEqual(run.cache_stats['transaction_operations']['hits'], 2)
+
+    def test_failed_run_is_recorded_and_reraised(self):
+        with patch(
+            'aqua_governance.governance.task_logic.vote_indexing.apply_vote_snapshot_plan',
+            side_effect=RuntimeError('database went away'),
+        ):
+            with self.assertRaises(RuntimeError):
+                update_proposal_votes_snapshot(self.proposal, self.server)
+
+        run = IndexingRun.objects.get(proposal=self.proposal)
+        self.assertEqual(run.status, IndexingRun.STATUS_FAILED)
+        self.assertIn('database went away', run.error)
+        self.assertEqual(run.group_counts, {'new_vote': 3})
+        self.assertEqual(run.created_count, 0)
+
+    def test_admin_lists_runs_read_only(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        model_admin = IndexingRunAdmin(IndexingRun, AdminSite())
+        request = RequestFactory().get('/admin/governance/indexingrun/')
+
+        queryset, _ = model_admin.get_search_results(request, IndexingRun.objects.all(), str(self.proposal.id))
+
+        self.assertEqual(queryset.count(), 1)
+        self.assertFalse(model_admin.has_add_permission(request))
+        self.assertFalse(model_admin.has_change_permission(request))
+
+    def test_prune_deletes_runs_past_retention(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        old_run = IndexingRun.objects.filter(proposal=self.proposal).earliest('started_at')
+        IndexingRun.objects.filter(id=old_run.id).update(started_at=timezone.now() - timedelta(days=31))
+
+        with self.settings(INDEXING_RUN_RETENTION_DAYS=30):
+            task_prune_indexing_runs()
+
+        self.assertFalse(IndexingRun.objects.filter(id=old_run.id).exists())
+        self.assertEqual(IndexingRun.objects.filter(proposal=self.proposal).count(), 1)
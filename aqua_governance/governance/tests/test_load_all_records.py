@@ -0,0 +1,97 @@
+import threading
+
+from django.test import SimpleTestCase, override_settings
+
+from aqua_governance.utils.requests import load_all_records, prefetch_all_records
+
+
+class PagedRequestBuilder:
+    """Call builder serving *record_count* records in paging-token order, ``limit`` per page."""
+
+    def __init__(self, record_count: int, fail_at_cursor: str = None):
+        self.records = [{'id': index, 'paging_token': f'{index:06d}'} for index in range(1, record_count + 1)]
+        self.fail_at_cursor = fail_at_cursor
+        self.page_limit = 10
+        self.current_cursor = None
+        self.cursors = []
+        self.fetched = threading.Semaphore(0)
+
+    def limit(self, limit):
+        self.page_limit = limit
+        return self
+
+    def cursor(self, cursor):
+        self.current_cursor = cursor
+        return self
+
+    def call(self):
+        cursor = self.current_cursor
+        self.cursors.append(cursor)
+        try:
+            if cursor is not None and cursor == self.fail_at_cursor:
+                raise ConnectionError('page lost')
+            after = [record for record in self.records if cursor is None or record['paging_token'] > cursor]
+            return {'_embedded': {'records': after[:self.page_limit]}}
+        finally:
+            self.fetched.release()
+
+
+@override_settings(HORIZON_SHORT_PAGE_TERMINATION=False, HORIZON_PREFETCH_PAGES=2)
+class LoadAllRecordsTests(SimpleTestCase):
+    def test_loads_every_page_until_an_empty_one(self):
+        request_builder = PagedRequestBuilder(25)
+
+        records = list(load_all_records(request_builder, page_size=10))
+
+        self.assertEqual([record['id'] for record in records], list(range(1, 26)))
+        self.assertEqual(request_builder.cursors, [None, '000010', '000020', '000025'])
+
+    def test_short_page_termination_skips_the_empty_page(self):
+        request_builder = PagedRequestBuilder(25)
+
+        with self.settings(HORIZON_SHORT_PAGE_TERMINATION=True):
+            records = list(load_all_records(request_builder, page_size=10))
+
+        self.assertEqual(len(records), 25)
+        self.assertEqual(request_builder.cursors, [None, '000010', '000020'])
+
+    def test_prefetched_records_match_sequential_ones(self):
+        for start_cursor, stop_on_short_page in ((None, False), (None, True), ('000007', False)):
+            with self.subTest(start_cursor=start_cursor, stop_on_short_page=stop_on_short_page):
+                expected = list(load_all_records(PagedRequestBuilder(25), start_cursor, 10, stop_on_short_page))
+
+                records = list(prefetch_all_records(PagedRequestBuilder(25), start_cursor, 10, 2, stop_on_short_page))
+
+                self.assertEqual(records, expected)
+
+    def test_next_page_is_requested_while_the_current_one_is_consumed(self):
+        request_builder = PagedRequestBuilder(50)
+        records = prefetch_all_records(request_builder, page_size=10, lookahead=1)
+
+        next(records)
+
+        # The first page is being consumed: the second is fetched, the third waits for look-ahead room.
+        self.assertTrue(request_builder.fetched.acquire(timeout=5))
+        self.assertTrue(request_builder.fetched.acquire(timeout=5))
+        self.assertFalse(request_builder.fetched.acquire(timeout=0.3))
+        self.assertEqual(request_builder.cursors, [None, '000010'])
+        records.close()
+
+    def test_closing_early_stops_fetching(self):
+        request_builder = PagedRequestBuilder(1000)
+
+        records = prefetch_all_records(request_builder, page_size=10, lookahead=2)
+        next(records)
+        records.close()
+
+        self.assertLessEqual(len(request_builder.cursors), 4)
+
+    def test_fetch_errors_reach_the_consumer_after_the_pages_before_them(self):
+        request_builder = PagedRequestBuilder(25, fail_at_cursor='000010')
+        consumed = []
+
+        with self.assertRaises(ConnectionError):
+            for record in prefetch_all_records(request_builder, page_size=10):
+                consumed.append(record['id'])
+
+        self.assertEqual(consumed, list(range(1, 11)))
@@ -0,0 +1,123 @@
+import threading
+
+from django.test import SimpleTestCase
+
+from aqua_governance.governance.claimable_trace import find_origin_claimable_balance_id
+from aqua_governance.governance.operations_cache import OperationsCache, count_run_stats
+from aqua_governance.governance.tests._horizon_stub import (
+    StubHorizonServer,
+    add_balance_creation,
+    make_balance_id,
+    make_claimable_balance,
+    make_voter_account,
+)
+from aqua_governance.utils.concurrency import map_in_threads
+
+
+SERVICE = make_voter_account(100)
+ISSUER = make_voter_account(101)
+
+
+def _make_balance(index: int, voter: str, sponsor: str) -> dict:
+    return make_claimable_balance(
+        balance_id=make_balance_id(index),
+        voter=voter,
+        issuer=ISSUER,
+        unlock_timestamp=1_800_000_000,
+        sponsor=sponsor,
+    )
+
+
+class OperationsCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.server = StubHorizonServer()
+        self.origins = []
+        self.replacements = []
+        for index in range(1, 4):
+            voter = make_voter_account(index)
+            origin = _make_balance(index, voter=voter, sponsor=voter)
+            add_balance_creation(self.server, origin, f'tx-vote-{index}')
+            self.origins.append(origin)
+
+        # One melting transaction re-creates every balance of the batch.
+        for index, origin in enumerate(self.origins, start=10):
+            replacement = _make_balance(index, voter=origin['sponsor'], sponsor=SERVICE)
+            add_balance_creation(self.server, replacement, 'tx-melting', clawed_back_balance_id=origin['id'])
+            self.replacements.append(replacement)
+
+    def test_melting_batch_loads_shared_transaction_once(self):
+        cache = OperationsCache(max_size=100)
+
+        origins = [
+            find_origin_claimable_balance_id(self.server, replacement['id'], operations_cache=cache)
+            for replacement in self.replacements
+        ]
+
+        self.assertEqual(origins, [origin['id'] for origin in self.origins])
+        self.assertEqual(self.server.count_calls('transaction_operations'), 1)
+        self.assertEqual(cache.stats()['transaction_operations'], {'hits': 2, 'misses': 1})
+        self.assertEqual(cache.stats()['balance_operations'], {'hits': 0, 'misses': 6})
+
+    def test_repeat_trace_is_served_from_cache(self):
+        cache = OperationsCache(max_size=100)
+        find_origin_claimable_balance_id(self.server, self.replacements[0]['id'], operations_cache=cache)
+        self.server.calls.clear()
+
+        origin = find_origin_claimable_balance_id(self.server, self.replacements[0]['id'], operations_cache=cache)
+
+        self.assertEqual(origin, self.origins[0]['id'])
+        self.assertEqual(self.server.calls, [])
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = OperationsCache(max_size=1)
+
+        cache.balance_operations(self.server, self.origins[0]['id'], 200)
+        cache.balance_operations(self.server, self.origins[1]['id'], 200)
+        cache.balance_operations(self.server, self.origins[0]['id'], 200)
+
+        self.assertEqual(cache.stats()['balance_operations'], {'hits': 0, 'misses': 3})
+
+    def test_empty_response_is_not_cached(self):
+        cache = OperationsCache(max_size=100)
+
+        cache.balance_operations(self.server, make_balance_id(999), 200)
+        cache.balance_operations(self.server, make_balance_id(999), 200)
+
+        self.assertEqual(self.server.count_calls('balance_operations'), 2)
+
+    def test_run_stats_count_only_the_lookups_of_their_run(self):
+        cache = OperationsCache(max_size=100)
+        cache.balance_operations(self.server, self.origins[0]['id'], 200)
+        other_run_started = threading.Event()
+        first_run_done = threading.Event()
+
+        def other_run():
+            with count_run_stats():
+                other_run_started.set()
+                cache.balance_operations(self.server, self.origins[0]['id'], 200)
+                first_run_done.wait()
+
+        thread = threading.Thread(target=other_run)
+        with count_run_stats() as run_stats:
+            thread.start()
+            other_run_started.wait()
+            cache.balance_operations(self.server, self.origins[1]['id'], 200)
+            first_run_done.set()
+            thread.join()
+
+        self.assertEqual(run_stats.as_dict()['balance_operations'], {'hits': 0, 'misses': 1})
+        self.assertEqual(cache.stats()['balance_operations'], {'hits': 1, 'misses': 2})
+
+    def test_run_stats_include_lookups_of_worker_threads(self):
+        cache = OperationsCache(max_size=100)
+
+        with count_run_stats() as run_stats:
+            map_in_threads(
+                lambda replacement: find_origin_claimable_balance_id(
+                    self.server, replacement['id'], operations_cache=cache,
+                ),
+                self.replacements,
+                max_workers=3,
+            )
+
+        self.assertEqual(run_stats.as_dict(), cache.stats())
@@ -0,0 +1,108 @@
+from django.test import TestCase, override_settings
+
+from aqua_governance.governance.models import ClaimableBalanceLineage, LogVote
+from aqua_governance.governance.operations_cache import get_operations_cache
+from aqua_governance.governance.task_logic.unlock_rules import get_expected_unlock_timestamp
+from aqua_governance.governance.task_logic.vote_indexing import (
+    _resolve_origin_balance_ids,
+    update_proposal_votes_snapshot,
+)
+from aqua_governance.governance.tests._factories import make_voting_proposal
+from aqua_governance.governance.tests._horizon_stub import (
+    StubHorizonServer,
+    add_balance_creation,
+    add_vote_balances,
+    make_balance_id,
+    make_claimable_balance,
+    make_voter_account,
+)
+
+
+SERVICE = make_voter_account(1000)
+
+
+class MeltingOriginResolutionTests(TestCase):
+    def setUp(self):
+        get_operations_cache().clear()
+        self.proposal = make_voting_proposal()
+        self.server = StubHorizonServer()
+        self.originals = add_vote_balances(self.server, self.proposal, 6)
+        for index, original in enumerate(self.originals):
+            add_balance_creation(self.server, original, f'tx-vote-{index}')
+
+    def tearDown(self):
+        get_operations_cache().clear()
+
+    def _melt(self) -> list[dict]:
+        unlock_timestamp = get_expected_unlock_timestamp(self.proposal)
+        replacements = []
+        for index, original in enumerate(self.originals, start=100):
+            self.server.remove_claimable_balance(self.proposal.vote_for_issuer, original['id'])
+            replacement = make_claimable_balance(
+                balance_id=make_balance_id(index),
+                voter=original['sponsor'],
+                issuer=self.proposal.vote_for_issuer,
+                unlock_timestamp=unlock_timestamp,
+                amount='90.0000000',
+                sponsor=SERVICE,
+            )
+            self.server.add_claimable_balance(self.proposal.vote_for_issuer, replacement)
+            add_balance_creation(self.server, replacement, 'tx-melting', clawed_back_balance_id=original['id'])
+            replacements.append(replacement)
+        return replacements
+
+    def _vote_balances(self) -> dict:
+        return dict(
+            LogVote.objects.filter(proposal=self.proposal, hide=False, claimed=False)
+            .values_list('account_issuer', 'claimable_balance_id'),
+        )
+
+    def _snapshot_after_melting(self) -> dict:
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        replacements = self._melt()
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        self.assertEqual(LogVote.objects.filter(proposal=self.proposal).count(), len(self.originals))
+        return {replacement['sponsor']: replacement['id'] for replacement in replacements}
+
+    @override_settings(ORIGIN_RESOLUTION_WORKERS=4)
+    def test_concurrent_resolution_matches_melted_replacements_to_existing_votes(self):
+        self._snapshot_after_melting()
+
+        self.assertEqual(
+            self._vote_balances(),
+            {original['sponsor']: make_balance_id(index) for index, original in enumerate(self.originals, start=100)},
+        )
+        self.assertEqual(
+            set(ClaimableBalanceLineage.objects.values_list('origin_balance_id', flat=True)),
+            {original['id'] for original in self.originals},
+        )
+
+    def test_concurrent_and_sequential_resolution_agree(self):
+        with override_settings(ORIGIN_RESOLUTION_WORKERS=1):
+            self._snapshot_after_melting()
+            sequential_balances = self._vote_balances()
+
+        LogVote.objects.all().delete()
+        ClaimableBalanceLineage.objects.all().delete()
+        get_operations_cache().clear()
+        self.proposal = make_voting_proposal()
+        self.server = StubHorizonServer()
+        self.originals = add_vote_balances(self.server, self.proposal, 6)
+        for index, original in enumerate(self.originals):
+            add_balance_creation(self.server, original, f'tx-vote-{index}')
+
+        with override_settings(ORIGIN_RESOLUTION_WORKERS=4):
+            self._snapshot_after_melting()
+            concurrent_balances = self._vote_balances()
+
+        self.assertEqual(sequential_balances, concurrent_balances)
+
+    @override_settings(ORIGIN_RESOLUTION_WORKERS=4, ORIGIN_RESOLUTION_DEADLINE_SECONDS=0)
+    def test_trace_past_deadline_resolves_to_none(self):
+        replacements = self._melt()
+        origin_cache = {}
+
+        _resolve_origin_balance_ids(self.server, [replacement['id'] for replacement in replacements], origin_cache)
+
+        self.assertEqual(origin_cache, {replacement['id']: None for replacement in replacements})
+        self.assertEqual(self.server.calls, [])
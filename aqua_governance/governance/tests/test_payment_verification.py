@@ -27,7 +27,7 @@ def _memo_for_text(text: str) -> str:
 
 @override_settings(DEBUG=False)
 class PaymentVerificationTests(SimpleTestCase):
-    @patch('aqua_governance.utils.payments.Server')
+    @patch('aqua_governance.utils.payments.get_horizon_server')
     def test_check_proposal_status_returns_horizon_error_when_lookup_fails(self, mock_server):
         mock_server.return_value.transactions.return_value.transaction.return_value.call.side_effect = RuntimeError('boom')
 
@@ -36,7 +36,7 @@ class PaymentVerificationTests(SimpleTestCase):
         self.assertEqual(status, payment_statuses.HORIZON_ERROR)
 
     @patch('aqua_governance.utils.payments.check_payment', return_value=False)
-    @patch('aqua_governance.utils.payments.Server')
+    @patch('aqua_governance.utils.payments.get_horizon_server')
     def test_check_proposal_status_rejects_missing_payment(self, mock_server, mock_check_payment):
         mock_server.return_value.transactions.return_value.transaction.return_value.call.return_value = {
             'successful': True,
@@ -49,7 +49,7 @@ class PaymentVerificationTests(SimpleTestCase):
         mock_check_payment.assert_called_once_with('a' * 64, settings.PROPOSAL_COST)
 
     @patch('aqua_governance.utils.payments.check_payment')
-    @patch('aqua_governance.utils.payments.Server')
+    @patch('aqua_governance.utils.payments.get_horizon_server')
     def test_check_proposal_status_rejects_unsuccessful_transaction(self, mock_server, mock_check_payment):
         mock_server.return_value.transactions.return_value.transaction.return_value.call.return_value = {
             'successful': False,
@@ -62,7 +62,7 @@ class PaymentVerificationTests(SimpleTestCase):
         mock_check_payment.assert_not_called()
 
     @patch('aqua_governance.utils.payments.check_payment', return_value=True)
-    @patch('aqua_governance.utils.payments.Server')
+    @patch('aqua_governance.utils.payments.get_horizon_server')
     def test_check_proposal_status_rejects_bad_memo(self, mock_server, _mock_check_payment):
         mock_server.return_value.transactions.return_value.transaction.return_value.call.return_value = {
             'successful': True,
@@ -74,7 +74,7 @@ class PaymentVerificationTests(SimpleTestCase):
         self.assertEqual(status, payment_statuses.BAD_MEMO)
 
     @patch('aqua_governance.utils.payments.check_payment', return_value=True)
-    @patch('aqua_governance.utils.payments.Server')
+    @patch('aqua_governance.utils.payments.get_horizon_server')
     def test_check_proposal_status_rejects_missing_memo(self, mock_server, _mock_check_payment):
         transaction_call = mock_server.return_value.transactions.return_value.transaction.return_value.call
 
@@ -87,7 +87,7 @@ class PaymentVerificationTests(SimpleTestCase):
                 self.assertEqual(status, payment_statuses.BAD_MEMO)
 
     @patch('aqua_governance.utils.payments.check_payment', return_value=True)
-    @patch('aqua_governance.utils.payments.Server')
+    @patch('aqua_governance.utils.payments.get_horizon_server')
     def test_check_proposal_status_accepts_matching_payment_and_memo(self, mock_server, _mock_check_payment):
         text = '<p>Payment text</p>'
         mock_server.return_value.transactions.return_value.transaction.return_value.call.return_value = {
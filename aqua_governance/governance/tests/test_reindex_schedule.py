@@ -0,0 +1,111 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from aqua_governance.governance.models import LogVote, Proposal, ProposalIndexingState
+from aqua_governance.governance.tasks import task_update_votes
+from aqua_governance.governance.task_logic.reindex_schedule import due_voted_proposals, next_reindex_at
+from aqua_governance.governance.task_logic.vote_indexing import update_proposal_votes_snapshot
+from aqua_governance.governance.tests._factories import make_voting_proposal
+from aqua_governance.governance.tests._horizon_stub import StubHorizonServer, add_vote_balances
+
+
+@override_settings(
+    VOTE_REINDEX_ACTIVE_INTERVAL_SECONDS=600,
+    VOTE_REINDEX_STABLE_AFTER_SECONDS=24 * 3600,
+    VOTE_REINDEX_STABLE_INTERVAL_SECONDS=6 * 3600,
+    VOTE_REINDEX_SETTLED_AFTER_SECONDS=30 * 24 * 3600,
+)
+class NextReindexAtTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+
+    def _state(self, quiet: timedelta, unclaimed_count: int = 5) -> ProposalIndexingState:
+        return ProposalIndexingState(last_changed_at=self.now - quiet, unclaimed_count=unclaimed_count)
+
+    def test_interval_decays_with_quiet_time(self):
+        self.assertEqual(next_reindex_at(self._state(timedelta(hours=1)), self.now), self.now + timedelta(minutes=10))
+        self.assertEqual(next_reindex_at(self._state(timedelta(days=2)), self.now), self.now + timedelta(hours=6))
+        self.assertIsNone(next_reindex_at(self._state(timedelta(days=31)), self.now))
+
+    def test_fully_claimed_proposal_is_settled(self):
+        self.assertIsNone(next_reindex_at(self._state(timedelta(0), unclaimed_count=0), self.now))
+
+
+@override_settings(VOTE_INGESTION_CHECKPOINTS_ENABLED=False)
+class SnapshotActivityTests(TestCase):
+    def setUp(self):
+        self.proposal = make_voting_proposal()
+        self.server = StubHorizonServer()
+        self.balances = add_vote_balances(self.server, self.proposal, 2)
+
+    def test_snapshot_tracks_changes_and_unclaimed_votes(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        state = ProposalIndexingState.objects.get(proposal=self.proposal)
+        self.assertEqual(state.unclaimed_count, 2)
+        self.assertEqual(state.last_changed_at, state.last_indexed_at)
+        first_changed_at = state.last_changed_at
+
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        state.refresh_from_db()
+        self.assertEqual(state.last_changed_at, first_changed_at)
+        self.assertGreater(state.last_indexed_at, first_changed_at)
+        self.assertIsNotNone(state.next_index_at)
+
+    def test_last_claimed_vote_settles_proposal(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        for balance in self.balances:
+            self.server.remove_claimable_balance(self.proposal.vote_for_issuer, balance['id'])
+
+        update_proposal_votes_snapshot(self.proposal, self.server)
+
+        state = ProposalIndexingState.objects.get(proposal=self.proposal)
+        self.assertEqual(LogVote.objects.filter(proposal=self.proposal, claimed=True).count(), 2)
+        self.assertEqual(state.unclaimed_count, 0)
+        self.assertIsNone(state.next_index_at)
+
+
+class ScheduledSweepTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.new = make_voting_proposal()
+        self.due = make_voting_proposal()
+        self.waiting = make_voting_proposal()
+        self.settled = make_voting_proposal()
+        self.voting = make_voting_proposal()
+        Proposal.objects.exclude(id=self.voting.id).update(proposal_status=Proposal.VOTED)
+        for proposal, next_index_at in (
+            (self.due, self.now - timedelta(minutes=1)),
+            (self.waiting, self.now + timedelta(hours=1)),
+            (self.settled, None),
+        ):
+            ProposalIndexingState.objects.create(
+                proposal=proposal,
+                last_indexed_at=self.now,
+                last_changed_at=self.now,
+                unclaimed_count=1,
+                next_index_at=next_index_at,
+            )
+
+    def test_sweep_selects_new_and_due_voted_proposals(self):
+        self.assertEqual(
+            set(due_voted_proposals(self.now).values_list('id', flat=True)),
+            {self.new.id, self.due.id},
+        )
+
+    def test_task_without_id_indexes_only_due_proposals(self):
+        with patch('aqua_governance.governance.tasks.update_proposal_votes_snapshot') as update_snapshot:
+            task_update_votes()
+
+        self.assertEqual(
+            [call.kwargs['proposal'].id for call in update_snapshot.call_args_list],
+            [self.due.id, self.new.id],
+        )
+
+    def test_task_with_id_ignores_schedule(self):
+        with patch('aqua_governance.governance.tasks.update_proposal_votes_snapshot') as update_snapshot:
+            task_update_votes(self.settled.id)
+
+        self.assertEqual(update_snapshot.call_args.kwargs['proposal'].id, self.settled.id)
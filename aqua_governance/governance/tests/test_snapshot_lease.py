@@ -0,0 +1,117 @@
+import threading
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from aqua_governance.governance.models import ProposalSnapshotLease
+from aqua_governance.governance.tasks import task_update_proposal_results, task_update_votes
+from aqua_governance.governance.task_logic.snapshot_lease import acquire_snapshot_lease, release_snapshot_lease
+from aqua_governance.governance.tests._factories import make_voting_proposal
+
+
+class SnapshotLeaseTests(TestCase):
+    def setUp(self):
+        self.proposal = make_voting_proposal()
+
+    def test_duplicate_request_is_coalesced(self):
+        token = acquire_snapshot_lease(self.proposal.id, False)
+
+        self.assertIsNone(acquire_snapshot_lease(self.proposal.id, False))
+        self.assertFalse(release_snapshot_lease(self.proposal.id, token))
+        self.assertIsNotNone(acquire_snapshot_lease(self.proposal.id, False))
+
+    def test_freezing_request_is_handed_to_the_holder(self):
+        token = acquire_snapshot_lease(self.proposal.id, False)
+
+        self.assertIsNone(acquire_snapshot_lease(self.proposal.id, True))
+        self.assertTrue(release_snapshot_lease(self.proposal.id, token))
+        self.assertFalse(ProposalSnapshotLease.objects.get(proposal=self.proposal).freezing_requested)
+
+    def test_freezing_holder_absorbs_freezing_duplicate(self):
+        token = acquire_snapshot_lease(self.proposal.id, True)
+
+        self.assertIsNone(acquire_snapshot_lease(self.proposal.id, True))
+        self.assertFalse(release_snapshot_lease(self.proposal.id, token))
+
+    def test_expired_lease_is_taken_over(self):
+        lost_token = acquire_snapshot_lease(self.proposal.id, False)
+        ProposalSnapshotLease.objects.filter(proposal=self.proposal).update(
+            expires_at=timezone.now() - timedelta(seconds=1),
+        )
+
+        token = acquire_snapshot_lease(self.proposal.id, False)
+
+        self.assertIsNotNone(token)
+        self.assertFalse(release_snapshot_lease(self.proposal.id, lost_token))
+        self.assertEqual(ProposalSnapshotLease.objects.get(proposal=self.proposal).holder, token)
+
+
+class ConcurrentFirstLeaseTests(TransactionTestCase):
+    def test_racing_first_acquires_coalesce(self):
+        proposal = make_voting_proposal()
+        barrier = threading.Barrier(2)
+        results = []
+
+        def acquire():
+            try:
+                barrier.wait()
+                results.append(acquire_snapshot_lease(proposal.id, False))
+            except Exception as error:
+                results.append(error)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=acquire) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(result is None for result in results), [False, True])
+        self.assertEqual(ProposalSnapshotLease.objects.filter(proposal=proposal).count(), 1)
+
+
+class SingleFlightTaskTests(TestCase):
+    def setUp(self):
+        self.proposal = make_voting_proposal()
+        self.runs = []
+
+    def _overlapping_snapshot(self, incoming_freezing: bool):
+        def update_snapshot(proposal, horizon_server, freezing_amount, **kwargs):
+            self.runs.append(freezing_amount)
+            if len(self.runs) == 1:
+                # Requests that arrive while the first snapshot is still running.
+                task_update_votes(proposal.id)
+                task_update_proposal_results(proposal.id, freezing_amount=incoming_freezing)
+
+        return patch('aqua_governance.governance.tasks.update_proposal_votes_snapshot', side_effect=update_snapshot)
+
+    @patch('aqua_governance.governance.tasks.update_proposal_final_results')
+    def test_overlapping_results_update_is_coalesced(self, update_final_results):
+        with self._overlapping_snapshot(False):
+            task_update_proposal_results(self.proposal.id)
+
+        self.assertEqual(self.runs, [False])
+        update_final_results.assert_called_once_with(self.proposal.id)
+
+    @patch('aqua_governance.governance.tasks.update_proposal_final_results')
+    def test_freezing_request_runs_after_the_current_snapshot(self, update_final_results):
+        with self._overlapping_snapshot(True):
+            task_update_proposal_results(self.proposal.id)
+
+        self.assertEqual(self.runs, [False, True])
+        self.assertEqual(update_final_results.call_count, 2)
+        self.assertEqual(ProposalSnapshotLease.objects.get(proposal=self.proposal).holder, '')
+
+    def test_failed_snapshot_releases_lease(self):
+        with patch(
+            'aqua_governance.governance.tasks.update_proposal_votes_snapshot',
+            side_effect=RuntimeError('horizon is down'),
+        ):
+            with self.assertRaises(RuntimeError):
+                task_update_votes(self.proposal.id)
+
+        self.assertIsNotNone(acquire_snapshot_lease(self.proposal.id, False))
@@ -0,0 +1,45 @@
+from unittest.mock import patch
+
+from dateutil.parser import parse as date_parse
+from django.test import SimpleTestCase
+
+from aqua_governance.governance.task_logic.unlock_rules import _parse_abs_before_timestamp
+
+
+class AbsBeforeParsingTests(SimpleTestCase):
+    def test_fast_path_matches_dateutil(self):
+        for value in (
+            '2027-01-15T08:00:00Z',
+            '2027-01-15T08:00:00.400Z',
+            '2027-01-15T08:00:00.600Z',
+            '2027-01-15T10:00:00+02:00',
+            '2027-01-15T03:30:00-0430',
+            '2027-01-15 08:00:00',
+        ):
+            with self.subTest(value=value):
+                expected = date_parse(value)
+                if expected.tzinfo is None:
+                    expected = date_parse(value + 'Z')
+                self.assertEqual(_parse_abs_before_timestamp(value), round(expected.timestamp()))
+
+    def test_iso_values_do_not_use_dateutil(self):
+        with patch('aqua_governance.governance.task_logic.unlock_rules.date_parse') as dateutil_parse:
+            self.assertEqual(_parse_abs_before_timestamp('2027-01-15T08:00:00Z'), 1_800_000_000)
+
+        dateutil_parse.assert_not_called()
+
+    def test_unusual_format_falls_back_to_dateutil(self):
+        self.assertEqual(_parse_abs_before_timestamp('15 Jan 2027 08:00:00 UTC'), 1_800_000_000)
+
+    def test_invalid_values_do_not_parse(self):
+        self.assertIsNone(_parse_abs_before_timestamp('2027-13-45T08:00:00Z'))
+        self.assertIsNone(_parse_abs_before_timestamp('not a date'))
+
+    def test_memo_is_filled_and_reused(self):
+        memo = {}
+
+        _parse_abs_before_timestamp('2027-01-15T08:00:00Z', memo)
+        memo['2027-01-15T08:00:00Z'] = 42
+
+        self.assertEqual(_parse_abs_before_timestamp('2027-01-15T08:00:00Z', memo), 42)
+        self.assertEqual(_parse_abs_before_timestamp('1800000000', memo), 1_800_000_000)
@@ -0,0 +1,123 @@
+import json
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.admin.sites import AdminSite
+from django.contrib.auth import get_user_model
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+
+from aqua_governance.governance.admin import ProposalAdmin
+from aqua_governance.governance.models import IndexingRun, LogVote, Proposal
+from aqua_governance.governance.task_logic.proposal_finalization import tally_votes
+from aqua_governance.governance.task_logic.vote_diff import diff_proposal_votes_snapshot
+from aqua_governance.governance.task_logic.vote_indexing import update_proposal_votes_snapshot
+from aqua_governance.governance.tests._factories import make_voting_proposal
+from aqua_governance.governance.tests._horizon_stub import StubHorizonServer, add_vote_balances
+
+
+class VoteSnapshotDiffTests(TestCase):
+    def setUp(self):
+        self.proposal = make_voting_proposal()
+        self.server = StubHorizonServer()
+        self.balances = add_vote_balances(self.server, self.proposal, 3)
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        IndexingRun.objects.all().delete()
+
+        self.server.remove_claimable_balance(self.proposal.vote_for_issuer, self.balances[0]['id'])
+        self.balances[1]['amount'] = '40.0000000'
+        add_vote_balances(self.server, self.proposal, 1, offset=10, issuer=self.proposal.vote_against_issuer)
+
+    def _vote_rows(self) -> list[tuple]:
+        return list(LogVote.objects.order_by('id').values_list('id', 'amount', 'claimed', 'claimable_balance_id'))
+
+    def test_diff_lists_changes_without_writing_votes(self):
+        vote_rows = self._vote_rows()
+
+        diff = diff_proposal_votes_snapshot(self.proposal, self.server, force_full_reconcile=True)
+
+        self.assertEqual(self._vote_rows(), vote_rows)
+        self.assertFalse(IndexingRun.objects.exists())
+        self.assertEqual(diff['summary'], {'create': 1, 'update': 1, 'mark_claimed': 1, 'unchanged': 1})
+        [created] = diff['create']
+        self.assertEqual(created['vote_choice'], LogVote.VOTE_AGAINST)
+        self.assertEqual(created['amount'], '100.0000000')
+        updated_vote = LogVote.objects.get(claimable_balance_id=self.balances[1]['id'])
+        self.assertEqual(
+            diff['update'],
+            [{'id': updated_vote.id, 'changes': {'amount': ['100.0000000', '40.0000000']}}],
+        )
+        self.assertEqual(diff['mark_claimed'], [LogVote.objects.get(claimable_balance_id=self.balances[0]['id']).id])
+        self.assertEqual(
+            diff['tallies'][LogVote.VOTE_FOR],
+            {'current': '300.0000000', 'projected': '140.0000000', 'delta': '-160.0000000'},
+        )
+        self.assertEqual(diff['tallies'][LogVote.VOTE_AGAINST]['delta'], '100.0000000')
+        self.assertIn('claimable_balances', diff['horizon_requests'])
+
+    @override_settings(VOTE_INGESTION_CHECKPOINTS_ENABLED=False)
+    def test_projected_tallies_match_applied_snapshot(self):
+        diff = diff_proposal_votes_snapshot(self.proposal, self.server)
+
+        update_proposal_votes_snapshot(self.proposal, self.server)
+
+        applied_tally = tally_votes(self.proposal, LogVote.objects.filter(proposal=self.proposal))
+        for vote_choice, tally in diff['tallies'].items():
+            self.assertEqual(Decimal(tally['projected']), applied_tally[vote_choice])
+
+    def test_limit_cuts_lists_but_not_summary(self):
+        diff = diff_proposal_votes_snapshot(self.proposal, self.server, force_full_reconcile=True, limit=0)
+
+        self.assertEqual(diff['summary']['create'], 1)
+        self.assertEqual((diff['create'], diff['update'], diff['mark_claimed']), ([], [], []))
+
+    def test_command_prints_diff_as_json(self):
+        stdout = StringIO()
+
+        with patch(
+            'aqua_governance.governance.management.commands.diff_proposal_votes.get_horizon_server',
+            return_value=self.server,
+        ):
+            call_command('diff_proposal_votes', str(self.proposal.id), '--full-reconcile', stdout=stdout)
+
+        diff = json.loads(stdout.getvalue())
+        self.assertEqual(diff['proposal_id'], self.proposal.id)
+        self.assertEqual(diff['summary']['mark_claimed'], 1)
+
+    def _admin_request(self):
+        user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        request = RequestFactory().post('/admin/governance/proposal/')
+        request.user = user
+        request._messages = CookieStorage(request)
+        return request
+
+    def test_admin_action_downloads_diffs(self):
+        request = self._admin_request()
+        model_admin = ProposalAdmin(Proposal, AdminSite())
+
+        self.assertIn('dry_run_vote_reindex', model_admin.get_actions(request))
+        with patch('aqua_governance.governance.admin.get_horizon_server', return_value=self.server):
+            response = model_admin.dry_run_vote_reindex(request, Proposal.objects.filter(id=self.proposal.id))
+
+        self.assertEqual(response['Content-Type'], 'application/json')
+        [diff] = json.loads(response.content)
+        self.assertEqual(diff['proposal_id'], self.proposal.id)
+        self.assertEqual(LogVote.objects.filter(proposal=self.proposal).count(), 3)
+
+    @override_settings(VOTE_DIFF_ADMIN_DEADLINE_SECONDS=0)
+    def test_admin_action_stops_starting_diffs_past_the_deadline(self):
+        other = make_voting_proposal()
+        request = self._admin_request()
+
+        with patch('aqua_governance.governance.admin.get_horizon_server', return_value=self.server):
+            response = ProposalAdmin(Proposal, AdminSite()).dry_run_vote_reindex(
+                request,
+                Proposal.objects.filter(id__in=[self.proposal.id, other.id]),
+            )
+
+        [diff] = json.loads(response.content)
+        self.assertEqual(diff['proposal_id'], self.proposal.id)
+        [*_, warning] = request._messages._queued_messages
+        self.assertIn(str(other.id), warning.message)
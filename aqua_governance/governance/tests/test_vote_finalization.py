@@ -2,12 +2,15 @@ import json
 from decimal import Decimal
 
 from django.conf import settings
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django_quill.quill import Quill
 
 from aqua_governance.governance.models import LogVote, Proposal
 from aqua_governance.governance.parser import parse_vote
 from aqua_governance.governance.serializers import LogVoteSerializer
+from aqua_governance.governance.task_logic.balance_records import decode_claimable_balance
 from aqua_governance.governance.task_logic.proposal_finalization import (
     _sum_votes_for_proposal,
 )
@@ -60,7 +63,7 @@ class ParseVoteTests(TestCase):
     """Tests for parse_vote(): voted_amount freeze & non-freeze behaviour."""
 
     def _minimal_claimable_balance(self, asset='governICE:GAXSGZ2JM3LNWOO4WRGADISNMWO4HQLG4QBGUZRKH5ZHL3EQBGX73ICE', amount='500'):
-        return {
+        return decode_claimable_balance({
             'id': '0' * 72,
             'asset': asset,
             'amount': amount,
@@ -72,7 +75,7 @@ class ParseVoteTests(TestCase):
                 },
             ],
             '_links': {'transactions': {'href': 'https://horizon.stellar.org/transactions/{?cursor,limit,order}'}},
-        }
+        })
 
     def test_freezing_sets_voted_amount_to_current_amount(self):
         """When freezing_amount=True, voted_amount must equal the CB amount."""
@@ -285,6 +288,21 @@ class SumVotesForNonVOTEDProposalTests(TestCase):
         self.assertEqual(result, Decimal('200'))
 
 
+    def test_uncounted_votes_are_filtered_in_the_database(self):
+        """Hidden, claimed and non-governance rows are never loaded."""
+        proposal = _create_proposal(proposal_status=Proposal.VOTING)
+        _make_log_vote(proposal, claimable_balance_id='1' * 72, amount=Decimal('200'))
+        _make_log_vote(proposal, claimable_balance_id='2' * 72, amount=Decimal('300'), hide=True)
+
+        with CaptureQueriesContext(connection) as queries:
+            result = _sum_votes_for_proposal(proposal, LogVote.VOTE_FOR)
+
+        self.assertEqual(result, Decimal('200'))
+        self.assertEqual(len(queries), 1)
+        where = queries[0]['sql'].split(' WHERE ', 1)[1]
+        for column in ('"hide"', '"claimed"', '"asset_code" IN'):
+            self.assertIn(column, where)
+
 class LogVoteSerializerTests(TestCase):
     """Tests that LogVoteSerializer includes voted_amount and claimed."""
 
@@ -0,0 +1,50 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from aqua_governance.governance.models import ClaimableBalanceLineage, LogVote, Proposal
+
+
+class VoteIndexingBenchmarkTests(TestCase):
+    def _run(self, *counts: str) -> list[dict]:
+        stdout = StringIO()
+        call_command('run_benchmark', 'vote_indexing', '--count', *counts, stdout=stdout)
+        return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+    def test_reports_every_scenario_phase(self):
+        [result] = self._run('6')
+
+        self.assertEqual(result['count'], 6)
+        scenarios = result['scenarios']
+        self.assertEqual(set(scenarios), {'self_sponsored', 'melting', 'clawback_chains'})
+        self.assertEqual(set(scenarios['self_sponsored']), {'initial', 'steady'})
+        for phases in scenarios.values():
+            self.assertEqual(phases['initial']['created'], 6)
+            self.assertEqual(phases['steady']['unchanged'], 6)
+            for phase in phases.values():
+                self.assertGreater(phase['sql_queries'], 0)
+                self.assertGreater(phase['horizon_calls'], 0)
+                self.assertGreater(phase['peak_memory_bytes'], 0)
+                self.assertEqual(phase['stale'], 0)
+
+    def test_melting_and_chains_are_matched_to_existing_votes(self):
+        [result] = self._run('4')
+
+        melting_update = result['scenarios']['melting']['update']
+        chains_update = result['scenarios']['clawback_chains']['update']
+        self.assertEqual((melting_update['created'], melting_update['updated']), (0, 4))
+        self.assertEqual((chains_update['created'], chains_update['updated']), (0, 4))
+        self.assertGreater(
+            chains_update['horizon_calls_by_endpoint']['balance_operations'],
+            melting_update['horizon_calls_by_endpoint']['balance_operations'],
+        )
+
+    def test_runs_each_count_and_rolls_back(self):
+        results = self._run('2', '3')
+
+        self.assertEqual([result['count'] for result in results], [2, 3])
+        self.assertFalse(Proposal.objects.exists())
+        self.assertFalse(LogVote.objects.exists())
+        self.assertFalse(ClaimableBalanceLineage.objects.exists())
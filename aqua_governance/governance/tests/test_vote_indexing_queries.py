@@ -0,0 +1,51 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from aqua_governance.governance.models import LogVote, Proposal
+from aqua_governance.governance.task_logic.vote_indexing import update_proposal_votes_snapshot
+from aqua_governance.governance.tests._factories import make_voting_proposal
+from aqua_governance.governance.tests._horizon_stub import StubHorizonServer, add_vote_balances
+
+
+def _make_server(proposal: Proposal, group_count: int, offset: int = 0) -> StubHorizonServer:
+    server = StubHorizonServer()
+    add_vote_balances(server, proposal, group_count, offset=offset)
+    return server
+
+
+class VoteSnapshotQueryCountTests(TestCase):
+    def _count_snapshot_queries(self, proposal: Proposal, server: StubHorizonServer) -> int:
+        with CaptureQueriesContext(connection) as context:
+            update_proposal_votes_snapshot(proposal=proposal, horizon_server=server)
+        return len(context.captured_queries)
+
+    def test_snapshot_indexes_every_group(self):
+        proposal = make_voting_proposal()
+
+        update_proposal_votes_snapshot(proposal=proposal, horizon_server=_make_server(proposal, 5))
+
+        self.assertEqual(LogVote.objects.filter(proposal=proposal, hide=False, claimed=False).count(), 5)
+
+    def test_query_count_for_new_groups_does_not_grow_with_group_count(self):
+        small_proposal = make_voting_proposal()
+        large_proposal = make_voting_proposal()
+
+        small_queries = self._count_snapshot_queries(small_proposal, _make_server(small_proposal, 2))
+        large_queries = self._count_snapshot_queries(large_proposal, _make_server(large_proposal, 25, offset=100))
+
+        self.assertEqual(small_queries, large_queries)
+
+    def test_query_count_for_existing_groups_does_not_grow_with_group_count(self):
+        small_proposal = make_voting_proposal()
+        large_proposal = make_voting_proposal()
+        small_server = _make_server(small_proposal, 2)
+        large_server = _make_server(large_proposal, 25, offset=100)
+        update_proposal_votes_snapshot(proposal=small_proposal, horizon_server=small_server)
+        update_proposal_votes_snapshot(proposal=large_proposal, horizon_server=large_server)
+
+        small_queries = self._count_snapshot_queries(small_proposal, small_server)
+        large_queries = self._count_snapshot_queries(large_proposal, large_server)
+
+        self.assertEqual(small_queries, large_queries)
+        self.assertEqual(LogVote.objects.filter(proposal=large_proposal, hide=False, claimed=False).count(), 25)
@@ -0,0 +1,189 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from stellar_sdk import Server
+
+from aqua_governance.governance.models import IndexedClaimableBalance, LogVote, VoteIngestionCheckpoint
+from aqua_governance.governance.task_logic.balance_records import decode_claimable_balance
+from aqua_governance.governance.task_logic.unlock_rules import get_expected_unlock_timestamp
+from aqua_governance.governance.task_logic import vote_checkpoints
+from aqua_governance.governance.task_logic.vote_checkpoints import STORED_RECORD_FIELDS, _record_from_row
+from aqua_governance.governance.task_logic.vote_indexing import update_proposal_votes_snapshot
+from aqua_governance.governance.tests._factories import make_voting_proposal
+from aqua_governance.governance.tests._horizon_stub import (
+    StubHorizonClient,
+    StubHorizonServer,
+    add_vote_balances,
+    make_balance_id,
+    make_claimable_balance,
+    make_voter_account,
+)
+
+
+class VoteIngestionCheckpointTests(TestCase):
+    def setUp(self):
+        self.proposal = make_voting_proposal()
+        self.server = StubHorizonServer()
+        self.balances = add_vote_balances(self.server, self.proposal, 3)
+
+    def _vote_for_cursors(self) -> list:
+        return [
+            cursor
+            for endpoint, claimant, cursor in self.server.calls
+            if endpoint == 'claimable_balances' and claimant == self.proposal.vote_for_issuer
+        ]
+
+    def _active_balance_ids(self) -> set:
+        return set(
+            LogVote.objects.filter(proposal=self.proposal, hide=False, claimed=False)
+            .values_list('claimable_balance_id', flat=True),
+        )
+
+    def test_first_snapshot_runs_full_crawl_and_stores_checkpoint(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+
+        checkpoint = VoteIngestionCheckpoint.objects.get(
+            proposal=self.proposal,
+            claimant=self.proposal.vote_for_issuer,
+        )
+        self.assertEqual(checkpoint.paging_token, self.balances[-1]['paging_token'])
+        self.assertIsNotNone(checkpoint.last_full_reconcile_at)
+        self.assertEqual(checkpoint.balances.count(), 3)
+        self.assertEqual(self._vote_for_cursors()[0], None)
+
+    def test_routine_snapshot_fetches_only_balances_after_checkpoint(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        self.server.calls.clear()
+        new_balance = add_vote_balances(self.server, self.proposal, 1, offset=3)[0]
+
+        update_proposal_votes_snapshot(self.proposal, self.server)
+
+        self.assertEqual(self._vote_for_cursors()[0], self.balances[-1]['paging_token'])
+        self.assertEqual(
+            self._active_balance_ids(),
+            {balance['id'] for balance in self.balances} | {new_balance['id']},
+        )
+
+    def test_removed_balance_is_marked_claimed_on_full_reconcile(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        self.server.remove_claimable_balance(self.proposal.vote_for_issuer, self.balances[0]['id'])
+
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        self.assertIn(self.balances[0]['id'], self._active_balance_ids())
+
+        VoteIngestionCheckpoint.objects.filter(proposal=self.proposal).update(
+            last_full_reconcile_at=self.proposal.created_at - timedelta(days=1),
+        )
+        update_proposal_votes_snapshot(self.proposal, self.server)
+
+        self.assertEqual(self._active_balance_ids(), {balance['id'] for balance in self.balances[1:]})
+
+    def test_claimed_balance_of_ended_proposal_is_marked_claimed_without_waiting_for_reconcile(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        self.server.remove_claimable_balance(self.proposal.vote_for_issuer, self.balances[0]['id'])
+        self.server.calls.clear()
+
+        # Still VOTING until finalization picks it up, but past end_at.
+        with patch.object(vote_checkpoints.timezone, 'now', return_value=self.proposal.end_at + timedelta(minutes=1)):
+            update_proposal_votes_snapshot(self.proposal, self.server)
+
+        self.assertEqual(self._vote_for_cursors()[0], None)
+        self.assertEqual(self._active_balance_ids(), {balance['id'] for balance in self.balances[1:]})
+
+    def test_checkpoint_stores_decoded_fields_only(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        stored = IndexedClaimableBalance.objects.get(claimable_balance_id=self.balances[0]['id'])
+
+        self.assertEqual(stored.paging_token, self.balances[0]['paging_token'])
+        self.assertEqual(stored.amount, 100 * 10 ** 7)
+        self.assertTrue(stored.self_sponsored)
+        self.assertEqual(
+            _record_from_row((stored.claimable_balance_id, *(getattr(stored, name) for name in STORED_RECORD_FIELDS))),
+            decode_claimable_balance(self.balances[0]),
+        )
+
+    def test_freezing_snapshot_always_runs_full_crawl(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        self.server.calls.clear()
+
+        update_proposal_votes_snapshot(self.proposal, self.server, freezing_amount=True)
+
+        self.assertEqual(self._vote_for_cursors()[0], None)
+
+    def test_service_sponsored_balance_after_checkpoint_triggers_full_crawl(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        self.server.calls.clear()
+        self.server.add_claimable_balance(
+            self.proposal.vote_for_issuer,
+            make_claimable_balance(
+                balance_id=make_balance_id(10),
+                voter=make_voter_account(1),
+                issuer=self.proposal.vote_for_issuer,
+                unlock_timestamp=get_expected_unlock_timestamp(self.proposal),
+                sponsor=make_voter_account(99),
+            ),
+        )
+
+        update_proposal_votes_snapshot(self.proposal, self.server)
+
+        self.assertEqual(self._vote_for_cursors()[0], self.balances[-1]['paging_token'])
+        self.assertIn(None, self._vote_for_cursors()[1:])
+
+    def test_full_crawl_after_checkpoint_starts_from_a_new_sdk_builder(self):
+        # SDK call builders are modified in place by cursor(); the fallback crawl must not inherit it.
+        sdk_server = Server('https://horizon.example', client=StubHorizonClient(self.server))
+        update_proposal_votes_snapshot(self.proposal, sdk_server)
+        self.server.calls.clear()
+        sponsored_balance = make_claimable_balance(
+            balance_id=make_balance_id(10),
+            voter=make_voter_account(1),
+            issuer=self.proposal.vote_for_issuer,
+            unlock_timestamp=get_expected_unlock_timestamp(self.proposal),
+            sponsor=make_voter_account(99),
+        )
+        self.server.add_claimable_balance(self.proposal.vote_for_issuer, sponsored_balance)
+
+        update_proposal_votes_snapshot(self.proposal, sdk_server)
+
+        self.assertIn(None, self._vote_for_cursors()[1:])
+        self.assertEqual(
+            self._active_balance_ids(),
+            {balance['id'] for balance in self.balances} | {sponsored_balance['id']},
+        )
+        checkpoint = VoteIngestionCheckpoint.objects.get(
+            proposal=self.proposal,
+            claimant=self.proposal.vote_for_issuer,
+        )
+        self.assertEqual(checkpoint.balances.count(), 4)
+
+    def test_full_reconcile_writes_only_changed_balances(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        checkpoint = VoteIngestionCheckpoint.objects.get(
+            proposal=self.proposal,
+            claimant=self.proposal.vote_for_issuer,
+        )
+        stored_row_ids = dict(checkpoint.balances.values_list('claimable_balance_id', 'id'))
+        self.server.remove_claimable_balance(self.proposal.vote_for_issuer, self.balances[0]['id'])
+        new_balance = add_vote_balances(self.server, self.proposal, 1, offset=3)[0]
+
+        update_proposal_votes_snapshot(self.proposal, self.server, freezing_amount=True)
+
+        self.assertEqual(
+            dict(
+                checkpoint.balances.exclude(claimable_balance_id=new_balance['id'])
+                .values_list('claimable_balance_id', 'id'),
+            ),
+            {balance['id']: stored_row_ids[balance['id']] for balance in self.balances[1:]},
+        )
+        self.assertTrue(checkpoint.balances.filter(claimable_balance_id=new_balance['id']).exists())
+
+    @override_settings(VOTE_INGESTION_CHECKPOINTS_ENABLED=False)
+    def test_disabled_checkpoints_always_run_full_crawl(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        self.server.calls.clear()
+
+        update_proposal_votes_snapshot(self.proposal, self.server)
+
+        self.assertEqual(self._vote_for_cursors()[0], None)
+        self.assertFalse(VoteIngestionCheckpoint.objects.filter(proposal=self.proposal).exists())
@@ -0,0 +1,65 @@
+import json
+import threading
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from aqua_governance.governance.task_logic.unlock_rules import get_expected_unlock_timestamp
+from aqua_governance.governance.task_logic.vote_indexing import _build_raw_vote_groups, _build_request_factories
+from aqua_governance.governance.tests._factories import make_voting_proposal
+from aqua_governance.governance.tests._horizon_stub import StubHorizonServer, add_vote_balances
+
+
+@override_settings(VOTE_INGESTION_CHECKPOINTS_ENABLED=False)
+class ConcurrentClaimantFetchTests(TestCase):
+    def setUp(self):
+        self.proposal = make_voting_proposal()
+        self.server = StubHorizonServer()
+        add_vote_balances(self.server, self.proposal, 5, issuer=self.proposal.vote_for_issuer)
+        add_vote_balances(self.server, self.proposal, 4, offset=5, issuer=self.proposal.vote_against_issuer)
+        add_vote_balances(self.server, self.proposal, 3, offset=9, issuer=self.proposal.abstain_issuer)
+
+    def _build_groups(self):
+        return _build_raw_vote_groups(
+            proposal=self.proposal,
+            request_factories=_build_request_factories(self.proposal, self.server),
+            expected_unlock_timestamp=get_expected_unlock_timestamp(self.proposal),
+        )
+
+    def test_concurrent_fetch_keeps_group_keys_and_order(self):
+        with override_settings(VOTE_INGESTION_CONCURRENT_FETCH=False):
+            sequential_groups = self._build_groups()
+        with override_settings(VOTE_INGESTION_CONCURRENT_FETCH=True, VOTE_INGESTION_FETCH_WORKERS=3):
+            concurrent_groups = self._build_groups()
+
+        self.assertEqual(len(sequential_groups), 12)
+        self.assertEqual(list(sequential_groups.items()), list(concurrent_groups.items()))
+
+    def test_claimant_requests_are_in_flight_at_the_same_time(self):
+        # Every claimant makes the same number of requests (one page, then the empty one), so
+        # each request can wait for one from each other claimant; a sequential fetch would time out.
+        barrier = threading.Barrier(3, timeout=5)
+        self.server.request_hook = barrier.wait
+
+        with override_settings(VOTE_INGESTION_CONCURRENT_FETCH=True, VOTE_INGESTION_FETCH_WORKERS=3):
+            concurrent_groups = self._build_groups()
+
+        self.assertEqual(self.server.max_in_flight, 3)
+        self.server.request_hook = None
+        self.assertEqual(list(self._build_groups()), list(concurrent_groups))
+
+
+class ClaimantFetchBenchmarkTests(SimpleTestCase):
+    @override_settings(VOTE_INGESTION_FETCH_WORKERS=3)
+    def test_benchmark_reports_sequential_and_concurrent_wall_time(self):
+        stdout = StringIO()
+
+        call_command('run_benchmark', 'claimant_fetch', '--count', '10', stdout=stdout)
+
+        result = json.loads(stdout.getvalue())
+        self.assertEqual((result['count'], result['balances'], result['workers']), (10, 10, 3))
+        # One page and the empty one per claimant.
+        self.assertEqual(result['horizon_requests'], 6)
+        self.assertGreater(result['sequential_seconds'], 0)
+        self.assertGreater(result['concurrent_seconds'], 0)
@@ -0,0 +1,49 @@
+from importlib import import_module
+from unittest.mock import patch
+
+from django.apps import apps
+from django.contrib.admin.sites import AdminSite
+from django.test import RequestFactory, TestCase
+
+from aqua_governance.governance.admin import LogVoteAdmin
+from aqua_governance.governance.models import LogVote
+from aqua_governance.governance.parser import make_vote_key_digest
+from aqua_governance.governance.task_logic.vote_indexing import update_proposal_votes_snapshot
+from aqua_governance.governance.tests._factories import make_voting_proposal
+from aqua_governance.governance.tests._horizon_stub import StubHorizonServer, add_vote_balances
+
+
+backfill_migration = import_module('aqua_governance.governance.migrations.0033_backfill_logvote_key_digest')
+
+
+class VoteKeyDigestTests(TestCase):
+    def setUp(self):
+        self.proposal = make_voting_proposal()
+        self.server = StubHorizonServer()
+        add_vote_balances(self.server, self.proposal, 3)
+        update_proposal_votes_snapshot(self.proposal, self.server)
+
+    def test_indexed_votes_store_key_digest(self):
+        for key, key_digest in LogVote.objects.values_list('key', 'key_digest'):
+            self.assertEqual(key_digest, make_vote_key_digest(key))
+            self.assertEqual(len(key_digest), 32)
+
+    def test_backfill_fills_missing_digests_in_chunks(self):
+        LogVote.objects.update(key_digest=None)
+
+        with patch.object(backfill_migration, 'BACKFILL_CHUNK_SIZE', 2):
+            backfill_migration.backfill_logvote_key_digest(apps, None)
+
+        for key, key_digest in LogVote.objects.values_list('key', 'key_digest'):
+            self.assertEqual(key_digest, make_vote_key_digest(key))
+
+    def test_admin_search_by_full_key_uses_digest(self):
+        vote = LogVote.objects.order_by('id').first()
+        model_admin = LogVoteAdmin(LogVote, AdminSite())
+        request = RequestFactory().get('/admin/governance/logvote/', {'q': vote.key})
+
+        queryset, may_have_duplicates = model_admin.get_search_results(request, LogVote.objects.all(), vote.key)
+
+        self.assertEqual(list(queryset), [vote])
+        self.assertFalse(may_have_duplicates)
+        self.assertIn('key_digest', str(queryset.query))
@@ -0,0 +1,56 @@
+from django.test import TestCase, override_settings
+
+from aqua_governance.governance.models import LogVote
+from aqua_governance.governance.task_logic.vote_indexing import (
+    apply_vote_snapshot_plan,
+    plan_proposal_votes_snapshot,
+    update_proposal_votes_snapshot,
+)
+from aqua_governance.governance.tests._factories import make_voting_proposal
+from aqua_governance.governance.tests._horizon_stub import StubHorizonServer, add_vote_balances
+
+
+class VoteSnapshotPlanTests(TestCase):
+    def setUp(self):
+        self.proposal = make_voting_proposal()
+        self.server = StubHorizonServer()
+        self.balances = add_vote_balances(self.server, self.proposal, 4)
+
+    def test_planning_does_not_write_votes(self):
+        plan = plan_proposal_votes_snapshot(self.proposal, self.server)
+
+        self.assertEqual(len(plan.new_votes), len(self.balances))
+        self.assertFalse(LogVote.objects.exists())
+
+        stats = apply_vote_snapshot_plan(plan)
+
+        self.assertEqual(stats['created'], len(self.balances))
+        self.assertGreaterEqual(stats['transaction_seconds'], 0)
+        self.assertEqual(LogVote.objects.filter(proposal=self.proposal).count(), len(self.balances))
+
+    def test_apply_skips_votes_created_by_concurrent_run(self):
+        first_plan = plan_proposal_votes_snapshot(self.proposal, self.server)
+        second_plan = plan_proposal_votes_snapshot(self.proposal, self.server)
+        apply_vote_snapshot_plan(first_plan)
+
+        stats = apply_vote_snapshot_plan(second_plan)
+
+        self.assertEqual(stats['created'], 0)
+        self.assertEqual(LogVote.objects.filter(proposal=self.proposal).count(), len(self.balances))
+
+    @override_settings(VOTE_INGESTION_CHECKPOINTS_ENABLED=False)
+    def test_apply_skips_votes_hidden_since_planning(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        self.server.remove_claimable_balance(self.proposal.vote_for_issuer, self.balances[0]['id'])
+        self.balances[1]['amount'] = '90.0000000'
+        plan = plan_proposal_votes_snapshot(self.proposal, self.server)
+        hidden_vote = LogVote.objects.get(claimable_balance_id=self.balances[0]['id'])
+        LogVote.objects.filter(proposal=self.proposal).update(hide=True)
+
+        stats = apply_vote_snapshot_plan(plan)
+
+        self.assertNotIn(hidden_vote.id, plan.processed_vote_ids)
+        self.assertEqual(len(plan.updated_votes), 1)
+        self.assertEqual(stats['updated'], 0)
+        self.assertEqual(stats['stale'], 0)
+        self.assertFalse(LogVote.objects.filter(claimed=True).exists())
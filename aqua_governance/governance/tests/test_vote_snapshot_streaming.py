@@ -0,0 +1,140 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from aqua_governance.governance.models import LogVote
+from aqua_governance.governance.operations_cache import get_operations_cache
+from aqua_governance.governance.task_logic import vote_indexing
+from aqua_governance.governance.task_logic.unlock_rules import get_expected_unlock_timestamp
+from aqua_governance.governance.task_logic.vote_indexing import (
+    plan_proposal_votes_snapshot,
+    update_proposal_votes_snapshot,
+)
+from aqua_governance.governance.tests._factories import make_voting_proposal
+from aqua_governance.governance.tests._horizon_stub import (
+    StubHorizonServer,
+    add_balance_creation,
+    add_vote_balances,
+    make_balance_id,
+    make_claimable_balance,
+    make_voter_account,
+)
+
+
+SERVICE = make_voter_account(1000)
+
+
+def _plan_summary(plan) -> dict:
+    return {
+        'new': sorted((vote.claimable_balance_id, vote.vote_choice, vote.amount) for vote in plan.new_votes),
+        'updated': sorted((vote.id, vote.claimable_balance_id, vote.amount) for vote in plan.updated_votes),
+        'processed': plan.processed_vote_ids,
+        'max_vote_id': plan.max_vote_id,
+        'unchanged': plan.unchanged_count,
+    }
+
+
+@override_settings(VOTE_INGESTION_CHECKPOINTS_ENABLED=False, VOTE_SNAPSHOT_GROUP_BATCH_SIZE=2)
+class StreamingVoteSnapshotTests(TestCase):
+    def setUp(self):
+        get_operations_cache().clear()
+        self.proposal = make_voting_proposal()
+        self.server = StubHorizonServer()
+        self.for_balances = add_vote_balances(self.server, self.proposal, 5)
+        add_vote_balances(self.server, self.proposal, 3, offset=10, issuer=self.proposal.vote_against_issuer)
+        for index, balance in enumerate(self.for_balances):
+            add_balance_creation(self.server, balance, f'tx-vote-{index}')
+
+    def tearDown(self):
+        get_operations_cache().clear()
+
+    def _melt_for_votes(self, count: int) -> None:
+        unlock_timestamp = get_expected_unlock_timestamp(self.proposal)
+        for index, original in enumerate(self.for_balances[:count], start=100):
+            self.server.remove_claimable_balance(self.proposal.vote_for_issuer, original['id'])
+            replacement = make_claimable_balance(
+                balance_id=make_balance_id(index),
+                voter=original['sponsor'],
+                issuer=self.proposal.vote_for_issuer,
+                unlock_timestamp=unlock_timestamp,
+                amount='90.0000000',
+                sponsor=SERVICE,
+            )
+            self.server.add_claimable_balance(self.proposal.vote_for_issuer, replacement)
+            add_balance_creation(self.server, replacement, 'tx-melting', clawed_back_balance_id=original['id'])
+
+    def _assert_same_plan(self, **kwargs):
+        with self.settings(VOTE_SNAPSHOT_STREAMING=False):
+            expected = _plan_summary(plan_proposal_votes_snapshot(self.proposal, self.server, **kwargs))
+        with self.settings(VOTE_SNAPSHOT_STREAMING=True):
+            streamed = _plan_summary(plan_proposal_votes_snapshot(self.proposal, self.server, **kwargs))
+        self.assertEqual(streamed, expected)
+
+    def test_streaming_plan_matches_full_plan(self):
+        self._assert_same_plan()
+
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        self._melt_for_votes(2)
+        self.server.remove_claimable_balance(self.proposal.vote_for_issuer, self.for_balances[4]['id'])
+
+        self._assert_same_plan(freezing_amount=True)
+
+    def test_batches_are_bounded_by_batch_size(self):
+        batch_sizes = []
+        plan_vote_groups = vote_indexing._plan_vote_groups
+
+        def record_batch(**kwargs):
+            batch_sizes.append(len(kwargs['raw_vote_groups']))
+            return plan_vote_groups(**kwargs)
+
+        with self.settings(VOTE_SNAPSHOT_STREAMING=True):
+            with patch.object(vote_indexing, '_plan_vote_groups', side_effect=record_batch):
+                update_proposal_votes_snapshot(self.proposal, self.server)
+
+        self.assertEqual(batch_sizes, [2, 2, 1, 2, 1])
+        self.assertEqual(LogVote.objects.filter(proposal=self.proposal).count(), 8)
+
+    def test_batches_are_spooled_until_the_snapshot_is_applied(self):
+        stored_before_batch = []
+        plan_vote_groups = vote_indexing._plan_vote_groups
+
+        def record_stored_votes(**kwargs):
+            stored_before_batch.append(LogVote.objects.filter(proposal=self.proposal).count())
+            self.assertEqual((kwargs['plan'].new_votes, kwargs['plan'].updated_votes), ([], []))
+            return plan_vote_groups(**kwargs)
+
+        with self.settings(VOTE_SNAPSHOT_STREAMING=True):
+            with patch.object(vote_indexing, '_plan_vote_groups', side_effect=record_stored_votes):
+                stats = update_proposal_votes_snapshot(self.proposal, self.server)
+
+        self.assertEqual(stored_before_batch, [0, 0, 0, 0, 0])
+        self.assertEqual(stats['created'], 8)
+        self.assertEqual(LogVote.objects.filter(proposal=self.proposal).count(), 8)
+
+    def test_spooled_plan_matches_held_plan(self):
+        with self.settings(VOTE_SNAPSHOT_STREAMING=True):
+            held = plan_proposal_votes_snapshot(self.proposal, self.server)
+            spooled = plan_proposal_votes_snapshot(self.proposal, self.server, spool_changes=True)
+
+        self.assertEqual(spooled.new_votes, [])
+        self.assertEqual(spooled.spool.batch_count, 5)
+        self.assertEqual(
+            sorted(vote.claimable_balance_id for new_votes, _ in spooled.iter_changes() for vote in new_votes),
+            sorted(vote.claimable_balance_id for vote in held.new_votes),
+        )
+        spooled.spool.close()
+
+    @override_settings(VOTE_SNAPSHOT_STREAMING=True)
+    def test_streaming_snapshot_applies_melting_and_claims(self):
+        update_proposal_votes_snapshot(self.proposal, self.server)
+        self._melt_for_votes(2)
+        self.server.remove_claimable_balance(self.proposal.vote_for_issuer, self.for_balances[4]['id'])
+
+        stats = update_proposal_votes_snapshot(self.proposal, self.server)
+
+        self.assertEqual((stats['created'], stats['updated'], stats['stale']), (0, 2, 1))
+        self.assertEqual(
+            LogVote.objects.filter(proposal=self.proposal, claimable_balance_id=make_balance_id(100)).count(),
+            1,
+        )
+        self.assertTrue(LogVote.objects.get(claimable_balance_id=self.for_balances[4]['id']).claimed)
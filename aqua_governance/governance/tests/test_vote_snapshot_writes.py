@@ -0,0 +1,86 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from aqua_governance.governance.models import LogVote
+from aqua_governance.governance.task_logic.vote_indexing import (
+    apply_vote_snapshot_plan,
+    plan_proposal_votes_snapshot,
+    update_proposal_votes_snapshot,
+)
+from aqua_governance.governance.tests._factories import make_voting_proposal
+from aqua_governance.governance.tests._horizon_stub import StubHorizonServer, add_vote_balances
+
+
+@override_settings(VOTE_INGESTION_CHECKPOINTS_ENABLED=False)
+class ChangeDetectingWriteTests(TestCase):
+    def setUp(self):
+        self.proposal = make_voting_proposal()
+        self.server = StubHorizonServer()
+        self.balances = add_vote_balances(self.server, self.proposal, 5)
+        update_proposal_votes_snapshot(self.proposal, self.server)
+
+    def test_steady_state_run_writes_nothing(self):
+        with CaptureQueriesContext(connection) as context:
+            stats = update_proposal_votes_snapshot(self.proposal, self.server)
+
+        self.assertEqual(
+            {key: stats[key] for key in ('created', 'updated', 'unchanged', 'stale')},
+            {'created': 0, 'updated': 0, 'unchanged': 5, 'stale': 0},
+        )
+        self.assertFalse(
+            [
+                query for query in context.captured_queries
+                if query['sql'].startswith('UPDATE "governance_logvote"') and 'SET claimed = true' not in query['sql']
+            ],
+        )
+
+    def test_only_changed_votes_are_written(self):
+        self.balances[0]['amount'] = '80.0000000'
+        self.server.remove_claimable_balance(self.proposal.vote_for_issuer, self.balances[1]['id'])
+
+        stats = update_proposal_votes_snapshot(self.proposal, self.server)
+
+        self.assertEqual(
+            {key: stats[key] for key in ('created', 'updated', 'unchanged', 'stale')},
+            {'created': 0, 'updated': 1, 'unchanged': 3, 'stale': 1},
+        )
+        self.assertEqual(str(LogVote.objects.get(claimable_balance_id=self.balances[0]['id']).amount), '80.0000000')
+
+
+@override_settings(VOTE_INGESTION_CHECKPOINTS_ENABLED=False, VOTE_SNAPSHOT_STAGING_CHUNK_SIZE=2)
+class StaleVoteMarkingTests(TestCase):
+    def setUp(self):
+        self.proposal = make_voting_proposal()
+        self.server = StubHorizonServer()
+        self.balances = add_vote_balances(self.server, self.proposal, 7)
+        update_proposal_votes_snapshot(self.proposal, self.server)
+
+    def test_unprocessed_votes_are_marked_claimed_in_one_update(self):
+        for claimable_balance in self.balances[:3]:
+            self.server.remove_claimable_balance(self.proposal.vote_for_issuer, claimable_balance['id'])
+
+        with CaptureQueriesContext(connection) as context:
+            stats = update_proposal_votes_snapshot(self.proposal, self.server)
+
+        self.assertEqual(stats['stale'], 3)
+        self.assertEqual(
+            set(LogVote.objects.filter(claimed=True).values_list('claimable_balance_id', flat=True)),
+            {claimable_balance['id'] for claimable_balance in self.balances[:3]},
+        )
+        self.assertEqual(len([query for query in context.captured_queries if 'SET claimed' in query['sql']]), 1)
+
+    def test_votes_created_after_planning_are_not_stale(self):
+        plan = plan_proposal_votes_snapshot(self.proposal, self.server)
+        late_balances = add_vote_balances(self.server, self.proposal, 2, offset=100)
+        update_proposal_votes_snapshot(self.proposal, self.server)
+
+        stats = apply_vote_snapshot_plan(plan)
+
+        self.assertEqual(stats['stale'], 0)
+        self.assertFalse(
+            LogVote.objects.filter(
+                claimable_balance_id__in=[claimable_balance['id'] for claimable_balance in late_balances],
+                claimed=True,
+            ).exists(),
+        )
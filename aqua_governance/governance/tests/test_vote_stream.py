@@ -0,0 +1,75 @@
+import threading
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from stellar_sdk import Server
+
+from aqua_governance.governance.models import LogVote, Proposal
+from aqua_governance.governance.tasks import task_update_proposal_results
+from aqua_governance.governance.task_logic.vote_indexing import update_proposal_votes_snapshot
+from aqua_governance.governance.tests._factories import make_voting_proposal
+from aqua_governance.governance.tests._horizon_stub import StubHorizonServer, add_vote_balances
+from aqua_governance.governance.tests._sse_stub import SseHorizonStub
+from aqua_governance.governance.vote_stream import run_vote_stream
+
+
+@override_settings(
+    VOTE_INGESTION_CHECKPOINTS_ENABLED=False,
+    VOTE_STREAM_DEBOUNCE_SECONDS=0.2,
+    VOTE_STREAM_RECONNECT_SECONDS=0.05,
+    VOTE_STREAM_REFRESH_SECONDS=60,
+)
+class VoteStreamTests(TestCase):
+    def setUp(self):
+        self.proposal = make_voting_proposal()
+        self.discussion = make_voting_proposal(proposal_status=Proposal.DISCUSSION)
+        self.horizon = StubHorizonServer()
+        self.updates = []
+
+    def _update_proposal(self, proposal_id: int) -> None:
+        self.updates.append(proposal_id)
+        update_proposal_votes_snapshot(Proposal.objects.get(id=proposal_id), self.horizon)
+
+    def _run_stream(self, stub: SseHorizonStub, seconds: float = 1.0) -> None:
+        stop = threading.Event()
+        timer = threading.Timer(seconds, stop.set)
+        timer.start()
+        try:
+            run_vote_stream(Server(stub.url), self._update_proposal, stop)
+        finally:
+            timer.cancel()
+
+    def test_vote_effects_update_their_proposal_once_per_burst(self):
+        [balance] = add_vote_balances(self.horizon, self.proposal, 1)
+        with SseHorizonStub() as stub:
+            stub.publish(self.proposal.vote_for_issuer, 'claimable_balance_claimant_created', balance_id=balance['id'])
+            stub.publish(self.proposal.vote_for_issuer, 'claimable_balance_created', balance_id=balance['id'])
+            stub.publish(self.proposal.vote_for_issuer, 'account_credited')
+            stub.publish(self.discussion.vote_for_issuer, 'claimable_balance_claimant_created')
+
+            self._run_stream(stub)
+
+        self.assertEqual(self.updates, [self.proposal.id])
+        self.assertEqual(LogVote.objects.get(proposal=self.proposal).claimable_balance_id, balance['id'])
+        subscribed_accounts = {account for account, _ in stub.subscriptions}
+        self.assertIn(self.proposal.vote_against_issuer, subscribed_accounts)
+        self.assertNotIn(self.discussion.vote_for_issuer, subscribed_accounts)
+
+    def test_dropped_stream_resumes_from_last_effect(self):
+        with SseHorizonStub(close_after=1) as stub:
+            first = stub.publish(self.proposal.vote_against_issuer, 'claimable_balance_claimant_created')
+            stub.publish(self.proposal.vote_against_issuer, 'claimable_balance_claimant_created')
+
+            self._run_stream(stub)
+
+        self.assertIn((self.proposal.vote_against_issuer, first['paging_token']), stub.subscriptions)
+        self.assertEqual(set(self.updates), {self.proposal.id})
+
+
+class StreamVotesCommandTests(TestCase):
+    def test_updates_are_enqueued_not_run_in_the_stream_loop(self):
+        with patch('aqua_governance.governance.management.commands.stream_votes.run_vote_stream') as run_stream:
+            call_command('stream_votes')
+
+        self.assertEqual(run_stream.call_args.kwargs['update_proposal'], task_update_proposal_results.delay)
@@ -0,0 +1,112 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from celery.exceptions import SoftTimeLimitExceeded
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from aqua_governance.governance.models import IndexingRun, Proposal, VoteUpdateSweep
+from aqua_governance.governance.task_logic.snapshot_lease import acquire_snapshot_lease
+from aqua_governance.governance.tasks import task_update_votes
+from aqua_governance.governance.task_logic.vote_sweeps import plan_sweep_lanes
+from aqua_governance.governance.tests._factories import make_voting_proposal
+
+
+def _record_run(proposal: Proposal, total_seconds: float) -> None:
+    now = timezone.now()
+    IndexingRun.objects.create(
+        proposal=proposal,
+        started_at=now - timedelta(hours=1),
+        finished_at=now - timedelta(hours=1),
+        status=IndexingRun.STATUS_SUCCEEDED,
+        total_seconds=total_seconds,
+    )
+
+
+class PlanSweepLanesTests(TestCase):
+    def test_lanes_are_capped_and_balanced_by_last_run_cost(self):
+        proposals = [make_voting_proposal() for _ in range(5)]
+        for proposal, seconds in zip(proposals, (100, 10, 10, 10, 50)):
+            _record_run(proposal, seconds)
+
+        lanes = plan_sweep_lanes([proposal.id for proposal in proposals], 2)
+
+        self.assertEqual(lanes, [
+            [proposals[0].id],
+            [proposals[4].id, proposals[1].id, proposals[2].id, proposals[3].id],
+        ])
+
+    def test_fewer_proposals_than_lanes(self):
+        proposal = make_voting_proposal()
+
+        self.assertEqual(plan_sweep_lanes([proposal.id], 4), [[proposal.id]])
+
+
+@override_settings(VOTE_UPDATE_MAX_CONCURRENT_TASKS=2)
+class VoteUpdateSweepTests(TestCase):
+    def setUp(self):
+        self.proposals = [make_voting_proposal() for _ in range(3)]
+        Proposal.objects.update(proposal_status=Proposal.VOTED)
+
+    def test_sweep_updates_every_due_proposal_and_summarizes(self):
+        with patch('aqua_governance.governance.tasks.update_proposal_votes_snapshot') as update_snapshot:
+            task_update_votes()
+
+        self.assertEqual(
+            sorted(call.kwargs['proposal'].id for call in update_snapshot.call_args_list),
+            sorted(proposal.id for proposal in self.proposals),
+        )
+        sweep = VoteUpdateSweep.objects.get()
+        self.assertEqual(sweep.lane_count, 2)
+        self.assertEqual((sweep.pending_count, sweep.succeeded_count, sweep.failed_count), (0, 3, 0))
+        self.assertIsNotNone(sweep.finished_at)
+        self.assertEqual(sweep.summary['proposal_count'], 3)
+        self.assertEqual(sweep.summary['succeeded'], 3)
+
+    def test_failed_proposal_does_not_stop_its_lane(self):
+        failing_id = self.proposals[-1].id
+
+        def update_snapshot(proposal, **kwargs):
+            if proposal.id == failing_id:
+                raise SoftTimeLimitExceeded()
+
+        with patch(
+            'aqua_governance.governance.tasks.update_proposal_votes_snapshot',
+            side_effect=update_snapshot,
+        ) as update_snapshot_mock:
+            task_update_votes()
+
+        self.assertEqual(update_snapshot_mock.call_count, 3)
+        sweep = VoteUpdateSweep.objects.get()
+        self.assertEqual((sweep.succeeded_count, sweep.failed_count), (2, 1))
+        self.assertEqual(sweep.summary['failed'], 1)
+
+    def test_proposal_with_running_snapshot_is_counted_as_coalesced(self):
+        acquire_snapshot_lease(self.proposals[0].id, False)
+
+        with patch('aqua_governance.governance.tasks.update_proposal_votes_snapshot') as update_snapshot:
+            task_update_votes()
+
+        self.assertEqual(update_snapshot.call_count, 2)
+        sweep = VoteUpdateSweep.objects.get()
+        self.assertEqual((sweep.succeeded_count, sweep.coalesced_count, sweep.failed_count), (2, 1, 0))
+        self.assertEqual(sweep.summary['coalesced'], 1)
+
+    def test_running_sweep_blocks_new_dispatch_until_timeout(self):
+        running = VoteUpdateSweep.objects.create(
+            started_at=timezone.now(),
+            proposal_ids=[self.proposals[0].id],
+            lane_count=1,
+            pending_count=1,
+        )
+
+        with patch('aqua_governance.governance.tasks.update_proposal_votes_snapshot') as update_snapshot:
+            task_update_votes()
+            self.assertFalse(update_snapshot.called)
+
+            VoteUpdateSweep.objects.filter(id=running.id).update(started_at=timezone.now() - timedelta(hours=2))
+            with self.settings(VOTE_UPDATE_SWEEP_TIMEOUT_SECONDS=3600):
+                task_update_votes()
+
+        self.assertEqual(update_snapshot.call_count, 3)
+        self.assertEqual(VoteUpdateSweep.objects.exclude(id=running.id).get().pending_count, 0)
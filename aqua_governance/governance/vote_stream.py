@@ -0,0 +1,129 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+from stellar_sdk import Server
+
+from aqua_governance.governance.models import Proposal
+from aqua_governance.governance.task_logic.asset_sweep import build_issuer_routes
+
+
+logger = logging.getLogger()
+
+# Effects Horizon reports on a vote issuer account.  While a proposal is voting
+# its votes cannot be claimed yet, so the only changes are new balances: new
+# votes and the service's clawback/re-create replacements when ICE melts.
+VOTE_EFFECT_TYPES = frozenset({
+    'claimable_balance_created',
+    'claimable_balance_claimant_created',
+    'claimable_balance_claimed',
+    'claimable_balance_clawed_back',
+})
+
+
+def stream_issuer_effects(
+    horizon_server: Server,
+    issuer: str,
+    events: queue.Queue,
+    stop: threading.Event,
+    cursor: str = 'now',
+) -> None:
+    """
+    Put ``(issuer, effect)`` on *events* for every vote effect streamed for *issuer*, until *stop* is set.
+
+    Reconnects from the last seen paging token after
+    ``VOTE_STREAM_RECONNECT_SECONDS`` when the stream fails.  Runs in its own
+    thread and must not touch the database.
+    """
+    while not stop.is_set():
+        try:
+            for effect in horizon_server.effects().for_account(issuer).cursor(cursor).stream():
+                if stop.is_set():
+                    return
+                cursor = effect.get('paging_token') or cursor
+                if effect.get('type') in VOTE_EFFECT_TYPES:
+                    events.put((issuer, effect))
+        except Exception:
+            logger.warning('Effect stream of %s failed at cursor %s; reconnecting.', issuer, cursor, exc_info=True)
+        stop.wait(settings.VOTE_STREAM_RECONNECT_SECONDS)
+
+
+def run_vote_stream(
+    horizon_server: Server,
+    update_proposal: Callable[[int], Any],
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """
+    Follow the effects on the voting proposals' issuer accounts and call *update_proposal* for each proposal touched.
+
+    *update_proposal* should only enqueue the update: it is called from the
+    loop that drains the streams.  Effects arriving within
+    ``VOTE_STREAM_DEBOUNCE_SECONDS`` of each other are coalesced into one
+    update per proposal.  The set of voting proposals is re-read every
+    ``VOTE_STREAM_REFRESH_SECONDS``; streams of issuers that are no longer
+    voting are stopped.  Effects missed while the worker was down are
+    not replayed: the periodic snapshot of ``task_update_active_proposals``
+    stays the reconciliation path.
+    """
+    stop = stop if stop is not None else threading.Event()
+    events: queue.Queue = queue.Queue()
+    streams: dict[str, threading.Event] = {}
+    routes: dict[str, tuple[int, str]] = {}
+    pending: dict[int, float] = {}
+    next_refresh_at = 0.0
+    try:
+        while not stop.is_set():
+            if time.monotonic() >= next_refresh_at:
+                if not connection.in_atomic_block:
+                    # Long-running process: drop connections past CONN_MAX_AGE or broken in between.
+                    close_old_connections()
+                routes = _refresh_streams(horizon_server, events, streams)
+                next_refresh_at = time.monotonic() + settings.VOTE_STREAM_REFRESH_SECONDS
+
+            try:
+                issuer, effect = events.get(timeout=settings.VOTE_STREAM_DEBOUNCE_SECONDS)
+            except queue.Empty:
+                pass
+            else:
+                route = routes.get(issuer)
+                if route is not None:
+                    logger.info('Proposal %s: %s effect %s', route[0], effect['type'], effect.get('id'))
+                    pending.setdefault(route[0], time.monotonic())
+
+            due_before = time.monotonic() - settings.VOTE_STREAM_DEBOUNCE_SECONDS
+            for proposal_id in [proposal_id for proposal_id, seen_at in pending.items() if seen_at <= due_before]:
+                del pending[proposal_id]
+                try:
+                    update_proposal(proposal_id)
+                except Exception:
+                    logger.exception('Streamed vote update of proposal %s failed.', proposal_id)
+    finally:
+        for stream_stop in streams.values():
+            stream_stop.set()
+
+
+def _refresh_streams(
+    horizon_server: Server,
+    events: queue.Queue,
+    streams: dict[str, threading.Event],
+) -> dict[str, tuple[int, str]]:
+    now = timezone.now()
+    routes = build_issuer_routes(
+        Proposal.objects.filter(proposal_status=Proposal.VOTING, start_at__lte=now, end_at__gte=now),
+    )
+    for issuer in set(streams) - set(routes):
+        streams.pop(issuer).set()
+    for issuer in set(routes) - set(streams):
+        streams[issuer] = threading.Event()
+        threading.Thread(
+            target=stream_issuer_effects,
+            args=(horizon_server, issuer, events, streams[issuer]),
+            name=f'vote-stream-{issuer[:8]}',
+            daemon=True,
+        ).start()
+    return routes
@@ -48,6 +48,11 @@ def setup_periodic_tasks(sender, **kwargs):
                 "schedule": crontab(minute="*/10"),
                 "args": (),
             },
+            "aqua_governance.governance.tasks.task_prune_indexing_runs": {
+                "task": "aqua_governance.governance.tasks.task_prune_indexing_runs",
+                "schedule": crontab(minute="30", hour="3"),
+                "args": (),
+            },
             "aqua_governance.governance.tasks.task_poll_submitted_onchain_executions": {
                 "task": "aqua_governance.governance.tasks.task_poll_submitted_onchain_executions",
                 "schedule": crontab(minute="*/1"),
@@ -0,0 +1,42 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, TypeVar
+
+from django.db import connections
+
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def map_in_threads(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int,
+    close_db_connections: bool = False,
+) -> list[R]:
+    """Apply *func* to *items* in a bounded thread pool and return results in input order.
+
+    Meant for network-bound work.  Django gives every thread its own database
+    connection, outside the caller's transaction, so *func* must not write
+    through the ORM.  Pass ``close_db_connections`` when *func* reads from the
+    database so worker connections are not leaked.
+
+    Every call runs in a copy of the caller's context, so context variables
+    set by the caller (such as per-run counters) are seen by the workers.
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    def _call(context: contextvars.Context, item: T) -> R:
+        try:
+            return context.run(func, item)
+        finally:
+            if close_db_connections:
+                connections.close_all()
+
+    # One copy per call: a context cannot be entered by two threads at once.
+    contexts = [contextvars.copy_context() for _ in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(_call, contexts, items))
@@ -0,0 +1,190 @@
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Generator, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from stellar_sdk import Server
+from stellar_sdk.client.base_sync_client import BaseSyncClient
+from stellar_sdk.client.requests_client import RequestsClient
+from stellar_sdk.client.response import Response
+from stellar_sdk.exceptions import ConnectionError as HorizonConnectionError
+
+
+logger = logging.getLogger()
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class HorizonRateLimiter:
+    """
+    Sliding one-second window limiting requests to ``rate`` per second.
+
+    Requests are counted per second in the ``HORIZON_RATE_LIMIT_CACHE`` cache;
+    the count of the previous second is weighted by the part of it still
+    inside the window ending now, so a burst just before a second boundary
+    is not followed by a second full burst just after it.
+
+    The budget is shared by every process configured with the same shared
+    cache whose ``incr`` is atomic (Memcached, see ``CACHE_URL``).  With the
+    default local-memory cache it is per process; ``governance.W001`` warns
+    about that.
+    """
+
+    def __init__(
+        self,
+        rate: int,
+        cache_alias: str = 'default',
+        key_prefix: str = 'horizon-rate-limit',
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.cache_alias = cache_alias
+        self.key_prefix = key_prefix
+        self._clock = clock
+        self._sleep = sleep
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        if self.rate <= 0:
+            return
+        cache = caches[self.cache_alias]
+        while True:
+            now = self._clock()
+            second = int(now)
+            elapsed = now - second
+            key = f'{self.key_prefix}:{second}'
+            cache.add(key, 0, timeout=3)
+            try:
+                taken = cache.incr(key)
+            except ValueError:
+                # The counter expired between add and incr.
+                continue
+            previous = cache.get(f'{self.key_prefix}:{second - 1}', 0)
+            if previous * (1 - elapsed) + taken <= self.rate:
+                return
+            # Over the budget: give the slot back and wait until the window has room again.
+            try:
+                cache.decr(key)
+            except ValueError:
+                pass
+            # The jitter keeps waiting workers from all firing at once.
+            self._sleep(self._seconds_until_room(elapsed, previous, taken - 1) + random.uniform(0, 0.05))
+
+    def _seconds_until_room(self, elapsed: float, previous: int, current: int) -> float:
+        if current + 1 > self.rate or not previous:
+            return 1 - elapsed
+        # previous * (1 - t) + current + 1 <= rate, solved for the window position t.
+        return max(1 - (self.rate - current - 1) / previous - elapsed, 0)
+
+
+class HorizonClient(BaseSyncClient):
+    """
+    HTTP client for ``stellar_sdk.Server`` with connection pooling, a rate limiter and bounded retries.
+
+    GET requests are retried on connection errors and on 429/5xx responses up
+    to ``max_retries`` times, waiting for the ``Retry-After`` Horizon sends or
+    else an exponential backoff with full jitter.  The last response is
+    returned as is, so the call builder raises its usual errors.
+    """
+
+    def __init__(
+        self,
+        client: Optional[BaseSyncClient] = None,
+        rate_limiter: Optional[HorizonRateLimiter] = None,
+        max_retries: int = 3,
+        backoff_seconds: float = 0.5,
+        max_backoff_seconds: float = 30,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._client = client or RequestsClient(num_retries=0)
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._sleep = sleep
+
+    def get(self, url: str, params: Optional[dict[str, str]] = None) -> Response:
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                response = self._client.get(url, params)
+            except HorizonConnectionError:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning('Horizon request %s failed; retrying in %.1fs.', url, delay, exc_info=True)
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    return response
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                logger.warning('Horizon answered %s to %s; retrying in %.1fs.', response.status_code, url, delay)
+            self._sleep(delay)
+            attempt += 1
+
+    def post(self, url: str, data: Optional[dict[str, str]] = None, json_data: Optional[dict[str, Any]] = None):
+        # Submissions are not idempotent: rate limited, but never retried.
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return self._client.post(url, data, json_data)
+
+    def stream(self, url: str, params: Optional[dict[str, str]] = None) -> Generator[dict[str, Any], None, None]:
+        return self._client.stream(url, params)
+
+    def close(self):
+        self._client.close()
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff_seconds, self.backoff_seconds * 2 ** attempt))
+
+    def _retry_after(self, response: Response) -> Optional[float]:
+        headers = {name.lower(): value for name, value in (response.headers or {}).items()}
+        try:
+            delay = float(headers['retry-after'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        return min(max(delay, 0), self.max_backoff_seconds)
+
+
+_servers: dict[tuple[int, str], Server] = {}
+_servers_lock = threading.Lock()
+
+
+def get_horizon_server() -> Server:
+    """
+    Return this process' shared ``Server`` for ``HORIZON_URL``.
+
+    One is kept per process id, so forked workers never share the pooled
+    connections of their parent.
+    """
+    key = (os.getpid(), settings.HORIZON_URL)
+    with _servers_lock:
+        server = _servers.get(key)
+        if server is None:
+            server = _servers[key] = Server(settings.HORIZON_URL, client=make_horizon_client())
+    return server
+
+
+def make_horizon_client() -> HorizonClient:
+    return HorizonClient(
+        client=RequestsClient(
+            pool_size=settings.HORIZON_POOL_SIZE,
+            num_retries=0,
+            request_timeout=settings.HORIZON_REQUEST_TIMEOUT_SECONDS,
+        ),
+        rate_limiter=HorizonRateLimiter(
+            settings.HORIZON_RATE_LIMIT_PER_SECOND,
+            cache_alias=settings.HORIZON_RATE_LIMIT_CACHE,
+        ),
+        max_retries=settings.HORIZON_MAX_RETRIES,
+        backoff_seconds=settings.HORIZON_RETRY_BACKOFF_SECONDS,
+        max_backoff_seconds=settings.HORIZON_RETRY_MAX_BACKOFF_SECONDS,
+    )
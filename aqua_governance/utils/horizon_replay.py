@@ -0,0 +1,118 @@
+import gzip
+import json
+import threading
+from typing import Any, Generator, Optional
+from urllib.parse import urlencode, urlsplit
+
+from stellar_sdk import Server
+from stellar_sdk.client.base_sync_client import BaseSyncClient
+from stellar_sdk.client.requests_client import RequestsClient
+from stellar_sdk.client.response import Response
+
+
+FIXTURE_FORMAT_VERSION = 1
+REPLAY_HORIZON_URL = 'https://horizon.replay'
+
+
+class ReplayMissError(LookupError):
+    """The replayed run asked Horizon for something the fixture does not contain."""
+
+
+def request_key(url: str, params: Optional[dict[str, Any]] = None) -> str:
+    """Identify a GET request independently of the Horizon host it was sent to."""
+    query = urlencode(sorted((params or {}).items()))
+    path = urlsplit(url).path
+    return f'{path}?{query}' if query else path
+
+
+class RecordingClient(BaseSyncClient):
+    """
+    HTTP client for ``stellar_sdk.Server`` that keeps every GET response it passes through.
+
+    Wraps the client that actually talks to Horizon; ``save`` writes the
+    responses as a gzip-compressed fixture for ``ReplayClient``.
+    """
+
+    def __init__(self, client: Optional[BaseSyncClient] = None):
+        self._client = client or RequestsClient()
+        self._responses: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: Optional[dict[str, str]] = None) -> Response:
+        response = self._client.get(url, params)
+        with self._lock:
+            self._responses[request_key(url, params)] = {'status_code': response.status_code, 'text': response.text}
+        return response
+
+    def post(self, url: str, data: Optional[dict[str, str]] = None, json_data: Optional[dict[str, Any]] = None):
+        return self._client.post(url, data, json_data)
+
+    def stream(self, url: str, params: Optional[dict[str, str]] = None) -> Generator[dict[str, Any], None, None]:
+        return self._client.stream(url, params)
+
+    def close(self):
+        self._client.close()
+
+    @property
+    def request_count(self) -> int:
+        return len(self._responses)
+
+    def save(self, path: str, metadata: Optional[dict[str, Any]] = None) -> None:
+        with self._lock:
+            fixture = {
+                'format': FIXTURE_FORMAT_VERSION,
+                'metadata': metadata or {},
+                'responses': dict(sorted(self._responses.items())),
+            }
+        with gzip.open(path, 'wt', encoding='utf-8') as fixture_file:
+            json.dump(fixture, fixture_file)
+
+
+class ReplayClient(BaseSyncClient):
+    """HTTP client for ``stellar_sdk.Server`` that serves the responses of a recorded fixture."""
+
+    def __init__(self, responses: dict[str, dict[str, Any]], metadata: Optional[dict[str, Any]] = None):
+        self.responses = responses
+        self.metadata = metadata or {}
+        self.served = 0
+        self.missed: list[str] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> 'ReplayClient':
+        with gzip.open(path, 'rt', encoding='utf-8') as fixture_file:
+            fixture = json.load(fixture_file)
+        if fixture.get('format') != FIXTURE_FORMAT_VERSION:
+            raise ValueError(f'Unsupported Horizon fixture format: {fixture.get("format")}')
+        return cls(fixture['responses'], fixture.get('metadata'))
+
+    def get(self, url: str, params: Optional[dict[str, str]] = None) -> Response:
+        key = request_key(url, params)
+        recorded = self.responses.get(key)
+        with self._lock:
+            if recorded is None:
+                self.missed.append(key)
+            else:
+                self.served += 1
+        if recorded is None:
+            raise ReplayMissError(key)
+        return Response(recorded['status_code'], recorded['text'], {}, url)
+
+    def post(self, url: str, data: Optional[dict[str, str]] = None, json_data: Optional[dict[str, Any]] = None):
+        raise ReplayMissError(f'POST {request_key(url)}')
+
+    def stream(self, url: str, params: Optional[dict[str, str]] = None) -> Generator[dict[str, Any], None, None]:
+        raise ReplayMissError(f'stream {request_key(url, params)}')
+
+    def close(self):
+        pass
+
+
+def make_recording_server(horizon_url: str, client: Optional[BaseSyncClient] = None) -> tuple[Server, RecordingClient]:
+    recording_client = RecordingClient(client)
+    return Server(horizon_url, client=recording_client), recording_client
+
+
+def make_replay_server(path: str) -> tuple[Server, ReplayClient]:
+    replay_client = ReplayClient.load(path)
+    return Server(REPLAY_HORIZON_URL, client=replay_client), replay_client
@@ -4,9 +4,10 @@ import os
 
 from django.conf import settings
 
-from stellar_sdk import Server, Payment, HashMemo, TransactionEnvelope
+from stellar_sdk import Payment, HashMemo, TransactionEnvelope
 
 from aqua_governance.governance import payment_statuses
+from aqua_governance.utils.horizon import get_horizon_server
 from aqua_governance.utils.requests import load_all_records
 
 
@@ -22,7 +23,7 @@ def check_payment(tx_hash, payment_amount=settings.PROPOSAL_COST):
         return True
 
     try:
-        horizon_server = Server(settings.HORIZON_URL)
+        horizon_server = get_horizon_server()
         for operation in load_all_records(horizon_server.operations().for_transaction(tx_hash)):
             operation_type = operation.get('type', None)
 
@@ -53,7 +54,7 @@ def check_proposal_status(transaction_hash, text, payment_amount=settings.PROPOS
     if is_dev_payment_bypass_enabled():
         return payment_statuses.FINE
 
-    horizon_server = Server(settings.HORIZON_URL)
+    horizon_server = get_horizon_server()
     try:
         transaction_info = horizon_server.transactions().transaction(transaction_hash).call()
     except Exception:
@@ -1,4 +1,14 @@
-def load_all_records(request_builder, start_cursor=None, page_size=200):
+import queue
+import threading
+from typing import Optional
+
+from django.conf import settings
+
+
+def load_all_records(request_builder, start_cursor=None, page_size=200, stop_on_short_page: Optional[bool] = None):
+    if stop_on_short_page is None:
+        stop_on_short_page = settings.HORIZON_SHORT_PAGE_TERMINATION
+
     base_request_builder = request_builder.limit(page_size)
     cursor = start_cursor
     while True:
@@ -17,6 +27,74 @@ def load_all_records(request_builder, start_cursor=None, page_size=200):
         if len(records) == 0:
             break
 
-        # TODO: Roll back after the patch is released. https://github.com/stellar/go/pull/5032
-        # if len(records) < page_size:
-        #     break
+        # Horizon could return short pages before the end: https://github.com/stellar/go/pull/5032
+        if stop_on_short_page and len(records) < page_size:
+            break
+
+
+def prefetch_all_records(
+    request_builder,
+    start_cursor=None,
+    page_size=200,
+    lookahead: Optional[int] = None,
+    stop_on_short_page: Optional[bool] = None,
+):
+    """
+    Like ``load_all_records``, but request the next pages in a background thread while the current one is consumed.
+
+    At most *lookahead* pages (``HORIZON_PREFETCH_PAGES`` by default) are held
+    ahead of the consumer.  The fetching thread only talks to Horizon, never to
+    the database.  Errors are raised to the consumer once it reaches the page
+    that failed; closing the generator early stops the fetching.
+    """
+    if lookahead is None:
+        lookahead = settings.HORIZON_PREFETCH_PAGES
+    if lookahead <= 0:
+        yield from load_all_records(request_builder, start_cursor, page_size, stop_on_short_page)
+        return
+    if stop_on_short_page is None:
+        stop_on_short_page = settings.HORIZON_SHORT_PAGE_TERMINATION
+
+    # A slot is taken before a page is requested and given back once the consumer starts on a page.
+    slots = threading.Semaphore(lookahead)
+    pages: queue.Queue = queue.Queue()
+    stop = threading.Event()
+
+    def _take_slot() -> bool:
+        while not stop.is_set():
+            if slots.acquire(timeout=0.1):
+                return True
+        return False
+
+    def _fetch_pages():
+        base_request_builder = request_builder.limit(page_size)
+        cursor = start_cursor
+        try:
+            while _take_slot():
+                response = (base_request_builder.cursor(cursor) if cursor else base_request_builder).call()
+                records = response['_embedded']['records']
+                if not records:
+                    break
+                pages.put(records)
+                cursor = records[-1]['paging_token']
+                if stop_on_short_page and len(records) < page_size:
+                    break
+        except Exception as exc:
+            pages.put(exc)
+        finally:
+            pages.put(None)
+
+    fetcher = threading.Thread(target=_fetch_pages, name='horizon-prefetch', daemon=True)
+    fetcher.start()
+    try:
+        while True:
+            page = pages.get()
+            slots.release()
+            if page is None:
+                break
+            if isinstance(page, Exception):
+                raise page
+            yield from page
+    finally:
+        stop.set()
+        fetcher.join()
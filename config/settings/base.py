@@ -234,6 +234,67 @@ ASSET_QUEUE_GAP_SECONDS = env.int('ASSET_QUEUE_GAP_SECONDS', default=1)
 HORIZON_URL = env('HORIZON_URL', default='https://horizon.stellar.org')
 NETWORK_PASSPHRASE = env('NETWORK_PASSPHRASE', default=Network.public_network().network_passphrase)
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# --------------------------------------------------------------------------
+
+# The Horizon rate limiter keeps its counters here. Point CACHE_URL at a cache shared by every
+# web and Celery process, with an atomic incr (e.g. pymemcache://host:11211), for one Horizon budget;
+# the local-memory default gives each process its own.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
+
+# Horizon client
+# --------------------------------------------------------------------------
+HORIZON_POOL_SIZE = env.int('HORIZON_POOL_SIZE', default=10)
+HORIZON_REQUEST_TIMEOUT_SECONDS = env.int('HORIZON_REQUEST_TIMEOUT_SECONDS', default=20)
+HORIZON_MAX_RETRIES = env.int('HORIZON_MAX_RETRIES', default=3)
+HORIZON_RETRY_BACKOFF_SECONDS = env.float('HORIZON_RETRY_BACKOFF_SECONDS', default=0.5)
+HORIZON_RETRY_MAX_BACKOFF_SECONDS = env.float('HORIZON_RETRY_MAX_BACKOFF_SECONDS', default=30)
+# Requests per second over a sliding one-second window, across every process sharing
+# HORIZON_RATE_LIMIT_CACHE (see CACHES); 0 disables the limiter.
+HORIZON_RATE_LIMIT_PER_SECOND = env.int('HORIZON_RATE_LIMIT_PER_SECOND', default=50)
+HORIZON_RATE_LIMIT_CACHE = env('HORIZON_RATE_LIMIT_CACHE', default='default')
+# Pages prefetch_all_records requests ahead of the consumer; 0 fetches page by page.
+HORIZON_PREFETCH_PAGES = env.int('HORIZON_PREFETCH_PAGES', default=2)
+# End pagination on the first page shorter than the limit instead of requesting an empty one.
+# Enable once Horizon ships https://github.com/stellar/go/pull/5032.
+HORIZON_SHORT_PAGE_TERMINATION = env.bool('HORIZON_SHORT_PAGE_TERMINATION', default=False)
+
+# Vote indexing
+# --------------------------------------------------------------------------
+VOTE_INGESTION_CHECKPOINTS_ENABLED = env.bool('VOTE_INGESTION_CHECKPOINTS_ENABLED', default=True)
+VOTE_INGESTION_FULL_RECONCILE_SECONDS = env.int('VOTE_INGESTION_FULL_RECONCILE_SECONDS', default=3600)
+VOTE_INGESTION_CONCURRENT_FETCH = env.bool('VOTE_INGESTION_CONCURRENT_FETCH', default=False)
+VOTE_INGESTION_FETCH_WORKERS = env.int('VOTE_INGESTION_FETCH_WORKERS', default=3)
+VOTE_INGESTION_ASSET_SWEEP = env.bool('VOTE_INGESTION_ASSET_SWEEP', default=False)
+VOTE_STREAM_DEBOUNCE_SECONDS = env.float('VOTE_STREAM_DEBOUNCE_SECONDS', default=2)
+VOTE_STREAM_REFRESH_SECONDS = env.float('VOTE_STREAM_REFRESH_SECONDS', default=60)
+VOTE_STREAM_RECONNECT_SECONDS = env.float('VOTE_STREAM_RECONNECT_SECONDS', default=5)
+HORIZON_OPERATIONS_CACHE_SIZE = env.int('HORIZON_OPERATIONS_CACHE_SIZE', default=2000)
+ORIGIN_RESOLUTION_WORKERS = env.int('ORIGIN_RESOLUTION_WORKERS', default=4)
+ORIGIN_RESOLUTION_DEADLINE_SECONDS = env.float('ORIGIN_RESOLUTION_DEADLINE_SECONDS', default=120)
+CREATION_METADATA_WORKERS = env.int('CREATION_METADATA_WORKERS', default=4)
+VOTE_SNAPSHOT_STAGING_CHUNK_SIZE = env.int('VOTE_SNAPSHOT_STAGING_CHUNK_SIZE', default=5000)
+VOTE_SNAPSHOT_STREAMING = env.bool('VOTE_SNAPSHOT_STREAMING', default=False)
+VOTE_SNAPSHOT_GROUP_BATCH_SIZE = env.int('VOTE_SNAPSHOT_GROUP_BATCH_SIZE', default=500)
+INDEXING_RUN_RETENTION_DAYS = env.int('INDEXING_RUN_RETENTION_DAYS', default=30)
+VOTE_DIFF_ADMIN_LIMIT = env.int('VOTE_DIFF_ADMIN_LIMIT', default=1000)
+VOTE_DIFF_ADMIN_DEADLINE_SECONDS = env.float('VOTE_DIFF_ADMIN_DEADLINE_SECONDS', default=60)
+# Settled VOTED proposals are re-indexed less and less often: every ACTIVE_INTERVAL while votes keep
+# changing, every STABLE_INTERVAL once nothing changed for STABLE_AFTER, and never once every vote is
+# claimed or nothing changed for SETTLED_AFTER.
+VOTE_REINDEX_ACTIVE_INTERVAL_SECONDS = env.int('VOTE_REINDEX_ACTIVE_INTERVAL_SECONDS', default=600)
+VOTE_REINDEX_STABLE_AFTER_SECONDS = env.int('VOTE_REINDEX_STABLE_AFTER_SECONDS', default=24 * 3600)
+VOTE_REINDEX_STABLE_INTERVAL_SECONDS = env.int('VOTE_REINDEX_STABLE_INTERVAL_SECONDS', default=6 * 3600)
+VOTE_REINDEX_SETTLED_AFTER_SECONDS = env.int('VOTE_REINDEX_SETTLED_AFTER_SECONDS', default=30 * 24 * 3600)
+VOTE_UPDATE_MAX_CONCURRENT_TASKS = env.int('VOTE_UPDATE_MAX_CONCURRENT_TASKS', default=4)
+VOTE_UPDATE_TASK_SOFT_TIME_LIMIT = env.int('VOTE_UPDATE_TASK_SOFT_TIME_LIMIT', default=1800)
+VOTE_UPDATE_SWEEP_TIMEOUT_SECONDS = env.int('VOTE_UPDATE_SWEEP_TIMEOUT_SECONDS', default=3600)
+VOTE_SNAPSHOT_LEASE_SECONDS = env.int('VOTE_SNAPSHOT_LEASE_SECONDS', default=3600)
+
 # Soroban / onchain hooks
 # --------------------------------------------------------------------------
 SOROBAN_RPC_URL = env('SOROBAN_RPC_URL', default='')